@@ -0,0 +1,111 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Time opening BA2s with BA2Archive, on synthetic archives with file records and name tables.
+
+Phases:
+	open       Map each archive and parse its header, as when counting archives.
+	records    Parse every file record and total the packed and unpacked sizes.
+	names      Decode every name in the name table.
+
+Archives alternate between GNRL and DX10, and are written under a temp folder unless --root is given.
+Only headers, records, and names are written. File data is left out, as it's never read.
+
+Usage: python benchmarks/bench_ba2.py [--archives 500] [--files 2000] [--root DIR]
+"""
+
+import argparse
+import shutil
+import struct
+import sys
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from ba2_archive import ARCHIVE_HEADER, DX10_CHUNK, DX10_RECORD, GNRL_RECORD, BA2Archive
+
+CHUNKS_PER_TEXTURE = 3
+
+
+def write_archive(path: Path, archive_format: bytes, names: list[str]) -> int:
+	"""Write a BA2 with a record and name for each file. Returns the total unpacked size."""
+	records: list[bytes] = []
+	total_size = 0
+	for n in range(len(names)):
+		size = 1000 + n
+		total_size += size * (CHUNKS_PER_TEXTURE if archive_format == b"DX10" else 1)
+		if archive_format == b"GNRL":
+			records.append(GNRL_RECORD.pack(n, b"nif\0", 0, 0, 0, size // 2, size, 0xBAADF00D))
+		else:
+			records.append(DX10_RECORD.pack(n, b"dds\0", 0, 0, CHUNKS_PER_TEXTURE, DX10_RECORD.size, 512, 512, 10, 98, 0, 8))
+			records.extend(DX10_CHUNK.pack(0, size // 2, size, mip, mip, 0xBAADF00D) for mip in range(CHUNKS_PER_TEXTURE))
+
+	name_table_offset = ARCHIVE_HEADER.size + sum(map(len, records))
+	header = ARCHIVE_HEADER.pack(b"BTDX", 8, archive_format, len(names), name_table_offset)
+	name_table = b"".join(struct.pack("<H", len(encoded)) + encoded for encoded in (name.encode("cp1252") for name in names))
+	path.write_bytes(header + b"".join(records) + name_table)
+	return total_size
+
+
+def measure(name: str, paths: list[Path], run: Callable[[BA2Archive], int]) -> int:
+	start = perf_counter()
+	total = 0
+	for path in paths:
+		with BA2Archive(path) as archive:
+			total += run(archive)
+	elapsed = perf_counter() - start
+	print(f"  {name:<8} {elapsed:8.3f}s  {elapsed / len(paths) * 1000:8.3f} ms/archive")
+	return total
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--archives", type=int, default=500)
+	parser.add_argument("--files", type=int, default=2000, help="Files in each archive")
+	parser.add_argument("--root", type=Path, help="Write archives here instead of a temp folder")
+	args = parser.parse_args()
+
+	root: Path = args.root or Path(tempfile.mkdtemp(prefix="cmt-bench-ba2-"))
+	root.mkdir(parents=True, exist_ok=True)
+	try:
+		paths: list[Path] = []
+		expected_size = 0
+		for archive_num in range(args.archives):
+			archive_format = b"DX10" if archive_num % 2 else b"GNRL"
+			path = root / f"Archive {archive_num:04} - {'Textures' if archive_format == b'DX10' else 'Main'}.ba2"
+			names = [f"meshes\\Archive{archive_num:04}\\File{n:06}.nif" for n in range(args.files)]
+			expected_size += write_archive(path, archive_format, names)
+			paths.append(path)
+
+		print(f"{args.archives:,} archives with {args.files:,} files each")
+		file_count = measure("open", paths, lambda archive: archive.file_count)
+		unpacked_size = measure("records", paths, lambda archive: archive.unpacked_size)
+		name_count = measure("names", paths, lambda archive: sum(1 for _ in archive.iter_names()))
+		if not file_count == name_count == args.archives * args.files or unpacked_size != expected_size:
+			print("Archive contents don't match what was written.")
+			sys.exit(1)
+	finally:
+		if args.root is None:
+			shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,137 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Memory used by the staged mod file index on a synthetic MO2 staging folder.
+
+Compares the previous dict[Path, tuple[str, Path]] index with ModFiles.
+The staging folder is generated in memory, so nothing is written to disk.
+
+Usage: python benchmarks/bench_mod_files.py [--files 1000000] [--mods 2000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from collections.abc import Callable, Generator
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from scan_settings import ModFiles
+
+STAGE_PATH = Path("C:/Modding/MO2/mods") if os.name == "nt" else Path("/modding/mo2/mods")
+FOLDERS = (
+	"meshes/Armor/{mod}",
+	"meshes/Weapons/{mod}/Parts",
+	"textures/Armor/{mod}",
+	"textures/Weapons/{mod}/Parts",
+	"materials/Armor/{mod}",
+	"sound/fx/{mod}",
+	"scripts/{mod}",
+	"meshes/Shared",
+	"textures/Shared",
+)
+SUFFIXES = (".nif", ".nif", ".dds", ".dds", ".dds", ".bgsm", ".xwm", ".pex", ".nif")
+
+type Listing = Generator[tuple[Path, Path, list[str], list[str]]]
+"""mod path, folder path, subfolders, files"""
+
+
+def synthetic_stage(total_files: int, mod_count: int) -> Listing:
+	"""Yield folder listings as build_mod_file_list() would see them when walking each mod."""
+	files_per_mod = max(1, total_files // mod_count)
+	for mod_num in range(mod_count):
+		mod = f"Mod Number {mod_num:05} - Some Longer Name"
+		mod_path = STAGE_PATH / mod
+		yield mod_path, mod_path, ["meshes", "textures"], [f"{mod}.esp", f"{mod} - Main.ba2"]
+		for folder_num, folder in enumerate(FOLDERS):
+			folder_path = mod_path / folder.format(mod=mod)
+			suffix = SUFFIXES[folder_num]
+			yield (
+				mod_path,
+				folder_path,
+				[],
+				[f"Asset_{mod_num}_{n:06}{suffix}" for n in range(folder_num, files_per_mod, len(FOLDERS))],
+			)
+
+
+def build_legacy(listing: Listing) -> tuple[dict[Path, tuple[str, Path]], dict[Path, tuple[str, Path]]]:
+	folders: dict[Path, tuple[str, Path]] = {}
+	files: dict[Path, tuple[str, Path]] = {}
+	for mod_path, root, _, names in listing:
+		mod_name = mod_path.name
+		root_relative = root.relative_to(mod_path)
+		if root is not mod_path:
+			folders[root_relative] = (mod_name, root)
+		for name in names:
+			files[root_relative / name] = (mod_name, root / name)
+	return folders, files
+
+
+def build_compact(listing: Listing) -> ModFiles:
+	mod_files = ModFiles()
+	mod_index = -1
+	last_mod_path = None
+	for mod_path, root, _, names in listing:
+		if mod_path is not last_mod_path:
+			mod_index = mod_files.add_mod(mod_path)
+			last_mod_path = mod_path
+		if root is mod_path:
+			key_prefix = ""
+		else:
+			root_key = os.path.normcase(root.relative_to(mod_path))
+			mod_files.folders.add(root_key, mod_index)
+			key_prefix = f"{root_key}{os.sep}"
+		for name in names:
+			mod_files.files.add(key_prefix + os.path.normcase(name), mod_index)
+	return mod_files
+
+
+def measure(name: str, build: Callable[[Listing], object], args: argparse.Namespace) -> None:
+	gc.collect()
+	start = perf_counter()
+	index = build(synthetic_stage(args.files, args.mods))
+	elapsed = perf_counter() - start
+	del index
+
+	gc.collect()
+	tracemalloc.start()
+	index = build(synthetic_stage(args.files, args.mods))
+	retained, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del index
+
+	print(f"{name:<8} build {elapsed:6.2f}s  retained {retained / 1024**2:8.1f} MiB  peak {peak / 1024**2:8.1f} MiB")
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--files", type=int, default=1_000_000)
+	parser.add_argument("--mods", type=int, default=2000)
+	args = parser.parse_args()
+
+	print(f"Synthetic staging folder: {args.files:,} files in {args.mods:,} mods")
+	measure("Legacy", build_legacy, args)
+	measure("ModFiles", build_compact, args)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,339 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Time each phase of the Overview and Scanner on synthetic installs of increasing size.
+
+Phases:
+	get_info_modules      Read the header of each enabled module on a thread pool.
+	get_info_archives     Read the header of each enabled archive on a thread pool.
+	..._serial            The same, reading one header at a time as before.
+	..._cached            The same, reusing header_cache.json from the previous run.
+	check_masters         Resolve the masters of each enabled module against the load order.
+	gather                Gather every Overview section, as on first load.
+	refresh               Refresh Overview when nothing changed, as the Scanner does before each scan.
+	build_mod_file_list   List every file in MO2's staging folder.
+	scan                  Full scan with all options, starting without scan_cache.json.
+	rescan                Full scan again, reusing scan_cache.json.
+
+Each install is then checked for files only in the real Data folder going missing from a profile's view
+of Data when launched from MO2, in folders a staged mod also provides, and for folders only the staged mods
+provide showing up in the view of a profile without mods. Data must only be listed in folders with real content.
+Overview must also find the same modules and archives in an install without the staged mods linked into Data,
+as headless scans see it. The script exits with an error if any of these fail.
+
+Installs are generated with synthetic_install.py, under a temp folder unless --root is given.
+Existing installs under --root are reused, since generating 1M files takes a while.
+Peak RAM is measured with tracemalloc in a second run of each phase, so it doesn't slow the timed run.
+
+Runs on Linux through linux_shim.py. On Windows, your real Documents and AppData folders are used,
+so Overview counts depend on your own INIs and plugins.txt.
+
+Usage: python benchmarks/bench_scanner.py [--sizes 10000 100000 1000000] [--root DIR] [--json results.json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import linux_shim  # Must be imported before anything from src.
+
+# isort: split
+
+from packaging.version import Version
+from synthetic_install import SyntheticInstall, generate
+
+from app_settings import AppSettings
+from game_info import GameInfo
+from header_cache import HeaderCache
+from mod_manager_info import ModManagerInfo
+from module_records import get_race_subgraph_count
+from overview_info import HEADER_READ_WORKERS, OverviewInfo
+from scan_cache import SCAN_CACHE_PATH, ScanCache
+from scan_settings import ScanSetting, ScanSettings
+from scanner import DataScanner, ScanUpdate
+from stage_index import ProfileView, StageIndex, get_stage_paths
+from utils import walk_parallel
+
+if TYPE_CHECKING:
+	from helpers import ProblemInfo, SimpleProblemInfo
+
+type PhaseResult = dict[str, str | int | float | None]
+
+
+def measure(name: str, run: Callable[[], int], setup: Callable[[], None], *, trace: bool) -> PhaseResult:
+	"""Time run() and optionally measure its peak memory in a second run. run() returns the number of files handled."""
+	setup()
+	gc.collect()
+	start = perf_counter()
+	file_count = run()
+	elapsed = perf_counter() - start
+
+	peak = None
+	if trace:
+		setup()
+		gc.collect()
+		tracemalloc.start()
+		run()
+		peak = tracemalloc.get_traced_memory()[1] / 1024**2
+		tracemalloc.stop()
+
+	result: PhaseResult = {
+		"phase": name,
+		"seconds": round(elapsed, 3),
+		"files": file_count,
+		"files_per_second": round(file_count / elapsed) if elapsed else None,
+		"peak_mib": round(peak, 1) if peak is not None else None,
+	}
+	print(
+		f"  {name:<24} {elapsed:8.2f}s  {file_count:>9,} files  {result['files_per_second'] or 0:>10,}/s"
+		f"  {f'{peak:8.1f} MiB' if peak is not None else ''}",
+	)
+	return result
+
+
+def bench_install(install: SyntheticInstall, settings: AppSettings, *, trace: bool) -> list[PhaseResult]:
+	linux_shim.set_environment_root(install.environment_root)
+	manager = ModManagerInfo("Mod Organizer", install.mo2_path / "ModOrganizer.exe", Version("2.5.2"))
+	manager.read_mo2_ini(install.mo2_ini_path)
+	# Data has the files each mod wins, as if launched from MO2.
+	manager.vfs_active = True
+	game = GameInfo(None, None, manager=manager, game_path=install.game_path)
+	problems: list[ProblemInfo | SimpleProblemInfo] = []
+	overview = OverviewInfo(game, problems)
+	overview.get_info_binaries()
+
+	enabled = dict.fromkeys(ScanSetting, True)
+	scan_settings = ScanSettings(settings, enabled, manager, using_stage=True, remember=False)
+	queue_progress: queue.Queue[ScanUpdate] = queue.Queue()
+	results: list[PhaseResult] = []
+
+	def no_setup() -> None:
+		pass
+
+	def run_modules() -> int:
+		overview.get_info_modules()
+		return len(game.modules_enabled)
+
+	def run_archives() -> int:
+		overview.get_info_archives()
+		return len(game.archives_enabled)
+
+	def use_serial() -> None:
+		overview.header_workers = 1
+		overview.header_cache = HeaderCache(enabled=False)
+
+	def use_parallel() -> None:
+		overview.header_workers = HEADER_READ_WORKERS
+		overview.header_cache = HeaderCache(enabled=False)
+
+	def use_cache() -> None:
+		overview.header_workers = HEADER_READ_WORKERS
+		overview.header_cache = HeaderCache()
+		overview.get_info_modules()
+		overview.get_info_archives()
+		overview.header_cache.save()
+
+	def run_masters() -> int:
+		overview.check_masters()
+		return len(game.module_headers)
+
+	results.extend((
+		measure("get_info_modules_serial", run_modules, use_serial, trace=trace),
+		measure("get_info_modules", run_modules, use_parallel, trace=trace),
+		measure("get_info_modules_cached", run_modules, use_cache, trace=trace),
+		measure("check_masters", run_masters, no_setup, trace=trace),
+		measure("get_info_archives_serial", run_archives, use_serial, trace=trace),
+		measure("get_info_archives", run_archives, use_parallel, trace=trace),
+		measure("get_info_archives_cached", run_archives, use_cache, trace=trace),
+	))
+
+	def run_mod_file_list() -> int:
+		scan_settings.use_cache = False
+		scanner = DataScanner(game, problems, scan_settings, queue_progress)
+		mod_files = scanner.build_mod_file_list(ScanCache(scan_settings, game, install.data_path))
+		return len(mod_files.files)
+
+	def run_gather() -> int:
+		overview.gather()
+		return len(game.modules_enabled) + len(game.archives_enabled)
+
+	def run_refresh() -> int:
+		overview.refresh()
+		return len(game.modules_enabled) + len(game.archives_enabled)
+
+	results.extend((
+		measure("gather", run_gather, use_cache, trace=trace),
+		measure("refresh", run_refresh, no_setup, trace=trace),
+	))
+
+	results.append(measure("build_mod_file_list", run_mod_file_list, no_setup, trace=trace))
+
+	def run_scan() -> int:
+		scan_settings.use_cache = True
+		scanner = DataScanner(game, problems, scan_settings, queue_progress)
+		scanner.run()
+		while not queue_progress.empty():
+			queue_progress.get_nowait()
+		return scanner.stats.files
+
+	def clear_cache() -> None:
+		SCAN_CACHE_PATH.unlink(missing_ok=True)
+
+	results.extend((
+		measure("scan", run_scan, clear_cache, trace=trace),
+		measure("rescan", run_scan, no_setup, trace=trace),
+	))
+	check_profile_view(install, scan_settings, game)
+	return results
+
+
+def check_profile_view(install: SyntheticInstall, scan_settings: ScanSettings, game: GameInfo) -> None:
+	"""Exit if the profile views of Data are wrong when launched from MO2.
+
+	A file only in the real Data folder must be found in a folder a mod also provides, and a profile with
+	no mods enabled must not see the folders that only the mods of the profile shown by the VFS provide.
+	Data must only be listed once per folder, and only in folders with real content.
+	"""
+	data_only_path = install.data_path / "scripts" / "Data Only.pex"
+	data_only_path.write_bytes(b"")
+	try:
+		scan_cache = ScanCache(scan_settings, game, install.data_path)
+		stage_paths = get_stage_paths(scan_settings.manager)
+		stage_index = StageIndex(scan_settings, scan_cache, threading.Event(), keep_listings=True)
+		stage_index.add(stage_paths)
+		# Data has every staged file, as the VFS shows them, so all of them are hidden.
+		hidden = stage_index.get_mod_files(stage_paths)
+		view = ProfileView(stage_index, "Default", stage_paths, install.data_path, scan_cache.data.list_dir, hidden)
+		found = any(
+			path == data_only_path.parent and data_only_path.name in files
+			for path, _, files in walk_parallel(install.data_path, scan_settings.walk_workers, view.list_dir)
+		)
+		data_listed: list[Path] = []
+
+		def data_lister(path: Path) -> tuple[list[str], list[str]] | None:
+			data_listed.append(path)
+			return scan_cache.data.list_dir(path)
+
+		real_folders = {install.data_path, data_only_path.parent}
+		empty_view = ProfileView(stage_index, "Empty", [], install.data_path, data_lister, hidden)
+		empty_folders = [
+			path
+			for path, _, _ in walk_parallel(install.data_path, scan_settings.walk_workers, empty_view.list_dir)
+			if path not in real_folders
+		]
+	finally:
+		data_only_path.unlink()
+	if not found:
+		print(f"{data_only_path} is missing from the profile's view of Data.")
+		sys.exit(1)
+	if empty_folders:
+		print(f"{empty_folders[0]} is in the view of Data of a profile without mods, but only mods provide it.")
+		sys.exit(1)
+	extra_listed = [path for path in data_listed if path != install.data_path and path.parent not in real_folders]
+	if extra_listed or len(set(data_listed)) != len(data_listed):
+		print(f"Data was listed outside of folders with real content or more than once: {extra_listed[:5]}")
+		sys.exit(1)
+
+
+def check_staged_overview(root: Path) -> None:
+	"""Exit if Overview differs between Data seen through MO2's VFS and Data without it, as headless scans see it.
+
+	Both installs have the same mods, but only the first has them linked into Data.
+	"""
+	gathered: list[tuple[dict[str, int], list[tuple[str, str]], int]] = []
+	for name, vfs_active in (("overview-vfs", True), ("overview-staged", False)):
+		install = SyntheticInstall(root / name)
+		if not install.exists():
+			install = generate(install.root, 2_000, link_data=vfs_active)
+		os.chdir(install.root)
+		linux_shim.set_environment_root(install.environment_root)
+		manager = ModManagerInfo("Mod Organizer", install.mo2_path / "ModOrganizer.exe", Version("2.5.2"))
+		manager.read_mo2_ini(install.mo2_ini_path)
+		manager.vfs_active = vfs_active
+		game = GameInfo(None, None, manager=manager, game_path=install.game_path)
+		problems: list[ProblemInfo | SimpleProblemInfo] = []
+		overview = OverviewInfo(game, problems)
+		overview.gather()
+		gathered.append((
+			{count: overview.get_count(count)[0] for count in ("GNRL", "DX10", "Full", "Light")},
+			sorted((str(problem.type), str(problem.relative_path)) for problem in problems),
+			sum(get_race_subgraph_count(module_path) or 0 for module_path in game.modules_enabled),
+		))
+
+	if gathered[0] != gathered[1]:
+		print(f"Overview differs without MO2's VFS.\nVFS:    {gathered[0]}\nStaged: {gathered[1]}")
+		sys.exit(1)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Files in Data")
+	parser.add_argument("--root", type=Path, help="Keep generated installs here to reuse them")
+	parser.add_argument("--workers", type=int, help="Override scanner_walk_workers")
+	parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc runs")
+	parser.add_argument("--json", type=Path, help="Also write results to this file")
+	args = parser.parse_args()
+
+	root: Path = args.root or Path(tempfile.mkdtemp(prefix="cmt-bench-"))
+	root = root.resolve()
+	cwd = Path.cwd()
+	all_results: dict[str, list[PhaseResult]] = {}
+	try:
+		for size in args.sizes:
+			install_root = root / f"install-{size}"
+			install = SyntheticInstall(install_root)
+			if install.exists():
+				install.count_files()
+			else:
+				start = perf_counter()
+				install = generate(install_root, size)
+				print(f"Generated {install_root} in {perf_counter() - start:.1f}s")
+
+			print(f"{install.data_file_count:,} files in Data, {install.staged_file_count:,} staged")
+			# settings.json and scan_cache.json are relative to the working folder.
+			os.chdir(install_root)
+			settings = AppSettings()
+			if args.workers:
+				settings.dict["scanner_walk_workers"] = args.workers
+			all_results[str(size)] = bench_install(install, settings, trace=not args.no_memory)
+			os.chdir(cwd)
+		check_staged_overview(root)
+	finally:
+		os.chdir(cwd)
+		if args.root is None:
+			shutil.rmtree(root, ignore_errors=True)
+
+	if args.json:
+		args.json.write_text(json.dumps(all_results, indent=2), "utf-8")
+
+
+if __name__ == "__main__":
+	main()
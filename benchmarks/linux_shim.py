@@ -0,0 +1,93 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+r"""Stand-ins for the Windows-only modules used by src, so benchmarks can run on Linux.
+
+Import this before anything from src. It does nothing on Windows.
+
+- winreg: every key is missing, so registry lookups return None.
+- win32api: file versions can't be read, so binaries use their CRC or show as Unknown.
+- ctypes.windll: SHGetFolderPathW returns a folder under the root set with set_environment_root(),
+  named after the CSIDL (Documents, AppDataLocal, ...). Other calls do nothing.
+
+Paths built with backslashes such as "My Games\Fallout4" become a single folder name on Linux,
+so synthetic installs must create them with the same strings to be found.
+"""
+
+import ctypes
+import sys
+import types
+from pathlib import Path
+
+_environment_root = Path()
+
+
+def set_environment_root(path: Path) -> None:
+	"""Folder containing the stand-in Documents and AppData folders."""
+	global _environment_root  # noqa: PLW0603
+	_environment_root = path
+
+
+def _raise_os_error(*_args: object, **_kwargs: object) -> None:
+	raise OSError
+
+
+class _Shell32:
+	@staticmethod
+	def SHGetFolderPathW(_hwnd: object, csidl: int, _token: object, _flags: int, buf: ctypes.Array[ctypes.c_wchar]) -> int:  # noqa: N802
+		from enums import CSIDL  # noqa: PLC0415
+
+		buf.value = str(_environment_root / CSIDL(csidl).name)
+		return 0
+
+
+class _NoOp:
+	def __getattr__(self, _name: str) -> "_NoOp":
+		return self
+
+	def __call__(self, *_args: object, **_kwargs: object) -> int:
+		return 0
+
+
+class _WinDLL(_NoOp):
+	shell32 = _Shell32()
+
+
+def install() -> None:
+	if sys.platform == "win32":
+		return
+
+	winreg = types.ModuleType("winreg")
+	winreg.HKEY_CURRENT_USER = 1  # type: ignore[attr-defined]
+	winreg.HKEY_LOCAL_MACHINE = 2  # type: ignore[attr-defined]
+	winreg.REG_SZ = 1  # type: ignore[attr-defined]
+	winreg.REG_QWORD = 11  # type: ignore[attr-defined]
+	winreg.OpenKey = _raise_os_error  # type: ignore[attr-defined]
+	winreg.QueryValueEx = _raise_os_error  # type: ignore[attr-defined]
+	sys.modules.setdefault("winreg", winreg)
+
+	win32api = types.ModuleType("win32api")
+	win32api.GetFileVersionInfo = _raise_os_error  # type: ignore[attr-defined]
+	sys.modules.setdefault("win32api", win32api)
+
+	ctypes.windll = _WinDLL()  # type: ignore[attr-defined]
+	ctypes.WinDLL = _raise_os_error  # type: ignore[attr-defined]
+	sys.getwindowsversion = lambda: types.SimpleNamespace(build=0, major=0, minor=0)  # type: ignore[attr-defined]
+
+
+install()
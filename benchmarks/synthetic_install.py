@@ -0,0 +1,268 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+r"""Generates a modded Fallout 4 install on disk for benchmarks.
+
+Layout under the root folder:
+
+	game/                Fallout4.exe, Fallout4.ccc, and Data/
+	mo2/                 ModOrganizer.ini, mods/, overwrite/, and profiles/Default/modlist.txt
+	env/Documents/       My Games\Fallout4\Fallout4.ini
+	env/AppDataLocal/    Fallout4\plugins.txt
+
+There is no VFS outside of Windows, so Data holds hard links to the files each mod wins,
+which is what the scanner sees when launched from MO2. With link_data=False, Data only has
+the base game, like the real Data folder of an MO2 install as headless scans see it.
+Modules and archives have valid TES4/BTDX headers, and some modules have RACE records with SADD subrecords.
+Modules list Fallout4.esm and sometimes the previous mod as masters.
+A small share of files are problems the scanner reports: junk files, wrong formats,
+loose previs, a junk fomod folder, an F4SE script override, and badly named archives.
+
+The env folders are only used on Linux, through linux_shim.set_environment_root().
+"""
+
+import os
+import random
+import struct
+from functools import cache
+from pathlib import Path
+
+# Linux is case-sensitive, so names are cased the way src looks for them.
+GAME_MASTERS = (
+	"fallout4.esm",
+	"dlcrobot.esm",
+	"dlcworkshop01.esm",
+	"dlccoast.esm",
+	"dlcworkshop02.esm",
+	"dlcworkshop03.esm",
+	"dlcnukaworld.esm",
+)
+GAME_ARCHIVES = {
+	"sResourceIndexFileList": ("Fallout4 - Textures1.ba2", "Fallout4 - Textures2.ba2"),
+	"sResourceStartUpArchiveList": ("Fallout4 - Startup.ba2", "Fallout4 - Shaders.ba2", "Fallout4 - Interface.ba2"),
+	"sResourceArchiveList": ("Fallout4 - Voices.ba2", "Fallout4 - Meshes.ba2", "Fallout4 - MeshesExtra.ba2"),
+	"sResourceArchiveList2": ("Fallout4 - Animations.ba2",),
+}
+CC_MODULES = ("ccBGSFO4001-PipBoy(Black).esl", "ccBGSFO4003-PipBoy(Camo01).esl")
+
+ASSET_FOLDERS = (
+	# Weighted by how often each appears in a typical setup.
+	("meshes/{mod}/Part{part:03}", ".nif", 30),
+	("textures/{mod}/Part{part:03}", ".dds", 35),
+	("materials/{mod}", ".bgsm", 10),
+	("sound/fx/{mod}", ".xwm", 8),
+	("scripts/{mod}", ".pex", 5),
+	("meshes/Shared", ".nif", 5),
+)
+PROBLEM_FILES = (
+	"textures/{mod}/Part{part:03}/Problem{n}.png",
+	"textures/{mod}/Part{part:03}/Problem{n}.tga",
+	"sound/fx/{mod}/Problem{n}.wav",
+	"meshes/{mod}/Part{part:03}/Problem{n}.obj",
+	"meshes/{mod}/Part{part:03}/Problem{n}.nif.bak",
+	"textures/{mod}/Part{part:03}/thumbs.db",
+	"vis/{mod}/Problem{n}.uvd",
+	"meshes/precombined/{mod}_Problem{n}.nif",
+)
+FILES_PER_FOLDER = 50
+MODULE_FLAG_LIGHT = 0x200
+
+
+def _subrecord(sig: bytes, data: bytes) -> bytes:
+	return sig + struct.pack("<H", len(data)) + data
+
+
+def _record(sig: bytes, data: bytes, flags: int = 0, form_id: int = 0x800) -> bytes:
+	return sig + struct.pack("<IIIIHH", len(data), flags, form_id, 0, 131, 0) + data
+
+
+def module_bytes(*, light: bool = False, sadd_count: int = 0, masters: tuple[str, ...] = ()) -> bytes:
+	"""A module with a TES4 header and, if sadd_count is set, a RACE group with that many SADD subrecords."""
+	header_data = _subrecord(b"HEDR", struct.pack("<fII", 1.0, 1, 0x801))
+	for master in masters:
+		header_data += _subrecord(b"MAST", master.encode() + b"\0") + _subrecord(b"DATA", bytes(8))
+	header = _record(b"TES4", header_data, MODULE_FLAG_LIGHT if light else 0)
+	if not sadd_count:
+		return header
+
+	race = _record(b"RACE", b"".join(_subrecord(b"SADD", struct.pack("<I", i)) for i in range(sadd_count)))
+	group = b"GRUP" + struct.pack("<I4sIHHHH", 24 + len(race), b"RACE", 0, 0, 0, 131, 0) + race
+	return header + group
+
+
+def archive_bytes(archive_format: bytes, version: int) -> bytes:
+	"""An empty BTDX archive: magic, version, format, file count, and name table offset."""
+	return b"BTDX" + struct.pack("<I4sIQ", version, archive_format, 0, 24)
+
+
+class SyntheticInstall:
+	def __init__(self, root: Path) -> None:
+		self.root = root
+		self.game_path = root / "game"
+		self.data_path = self.game_path / "Data"
+		self.mo2_path = root / "mo2"
+		self.mo2_ini_path = self.mo2_path / "ModOrganizer.ini"
+		self.stage_path = self.mo2_path / "mods"
+		self.overwrite_path = self.mo2_path / "overwrite"
+		self.environment_root = root / "env"
+		self.staged_file_count = 0
+		"""Files in the staging folder, including those that lose conflicts."""
+		self.data_file_count = 0
+
+	def exists(self) -> bool:
+		return self.mo2_ini_path.is_file()
+
+	def count_files(self) -> None:
+		"""Set file counts for an install generated by a previous run."""
+		self.staged_file_count = sum(len(files) for _, _, files in os.walk(self.mo2_path / "mods"))
+		self.staged_file_count += sum(len(files) for _, _, files in os.walk(self.overwrite_path))
+		self.data_file_count = sum(len(files) for _, _, files in os.walk(self.data_path))
+
+
+@cache
+def _make_dirs(path: Path) -> None:
+	path.mkdir(parents=True, exist_ok=True)
+
+
+def _write(path: Path, content: bytes = b"") -> None:
+	_make_dirs(path.parent)
+	path.write_bytes(content)
+
+
+def _mod_files(mod_num: int, mod: str, file_count: int, problem_rate: float, rnd: random.Random) -> dict[str, bytes]:
+	"""Relative path and content of each file in a staged mod."""
+	files: dict[str, bytes] = {
+		f"{mod}.esp": module_bytes(
+			light=mod_num % 3 == 0,
+			sadd_count=5 if mod_num % 10 == 0 else 0,
+			# Every 5th mod needs the one before it, which every 10th mod doesn't have enabled.
+			masters=("Fallout4.esm", f"Synthetic Mod {mod_num - 1:05}.esp")
+			if mod_num % 5 == 0 and mod_num
+			else ("Fallout4.esm",),
+		),
+		f"{mod} - main.ba2": archive_bytes(b"GNRL", 8 if mod_num % 2 else 1),
+	}
+	if mod_num % 4 == 0:
+		files[f"{mod} - textures.ba2"] = archive_bytes(b"DX10", 8 if mod_num % 2 else 1)
+	if mod_num % 50 == 7:
+		files[f"{mod} - Extra.ba2"] = archive_bytes(b"GNRL", 8)
+	if mod_num == 0:
+		files["scripts/Actor.pex"] = b""
+	if mod_num == 5:
+		files["fomod/info.xml"] = b""
+
+	folders = [folder for folder, _, weight in ASSET_FOLDERS for _ in range(weight)]
+	suffixes = {folder: suffix for folder, suffix, _ in ASSET_FOLDERS}
+	counters = dict.fromkeys(suffixes, 0)
+	for n in range(file_count - len(files)):
+		if rnd.random() < problem_rate:
+			problem = rnd.choice(PROBLEM_FILES)
+			files[problem.format(mod=mod, part=n % 7, n=n)] = b""
+			continue
+
+		folder = rnd.choice(folders)
+		number = counters[folder]
+		counters[folder] += 1
+		folder_path = folder.format(mod=mod, part=number // FILES_PER_FOLDER)
+		if folder == "meshes/Shared":
+			# Shared names conflict with the same file in other mods.
+			files[f"{folder_path}/Shared{rnd.randrange(max(1, file_count // 10)):06}.nif"] = b""
+		else:
+			files[f"{folder_path}/{mod}_{number:06}{suffixes[folder]}"] = b""
+	return files
+
+
+def generate(
+	root: Path,
+	file_count: int,
+	*,
+	mod_count: int | None = None,
+	problem_rate: float = 0.01,
+	seed: int = 0,
+	link_data: bool = True,
+) -> SyntheticInstall:
+	"""Generate an install with about file_count files in Data.
+
+	mod_count defaults to one mod per 500 files, at least 10.
+	problem_rate is the share of asset files that are a problem for the scanner.
+	link_data hard links the files each mod wins into Data. Otherwise they're only in the staging folder.
+	"""
+	install = SyntheticInstall(root)
+	rnd = random.Random(seed)
+	mod_count = mod_count or max(10, file_count // 500)
+	files_per_mod = max(10, file_count // mod_count)
+	mods = [f"Synthetic Mod {mod_num:05}" for mod_num in range(mod_count)]
+
+	# Base game
+	_write(install.game_path / "Fallout4.exe")
+	_write(install.game_path / "Fallout4.ccc", "\n".join(CC_MODULES).encode())
+	for master in GAME_MASTERS:
+		_write(install.data_path / master, module_bytes(sadd_count=20 if master == "fallout4.esm" else 0))
+	for cc_module in CC_MODULES:
+		_write(install.data_path / cc_module, module_bytes(light=True))
+	for archives in GAME_ARCHIVES.values():
+		for archive in archives:
+			_write(install.data_path / archive, archive_bytes(b"DX10" if "Textures" in archive else b"GNRL", 1))
+
+	# Staged mods. Later mods win conflicts, then overwrite.
+	winners: dict[str, Path] = {}
+	for mod_num, mod in enumerate(mods):
+		mod_path = install.stage_path / mod
+		for relative_path, content in _mod_files(mod_num, mod, files_per_mod, problem_rate, rnd).items():
+			file_path = mod_path / relative_path
+			_write(file_path, content)
+			winners[relative_path] = file_path
+			install.staged_file_count += 1
+
+	for relative_path in ("meshes/Shared/Shared000001.nif", "materials/Overwrite/Generated.bgsm"):
+		file_path = install.overwrite_path / relative_path
+		_write(file_path)
+		winners[relative_path] = file_path
+		install.staged_file_count += 1
+
+	if link_data:
+		for relative_path, file_path in winners.items():
+			data_file_path = install.data_path / relative_path
+			_make_dirs(data_file_path.parent)
+			os.link(file_path, data_file_path)
+	install.data_file_count = sum(len(files) for _, _, files in os.walk(install.data_path))
+
+	# MO2
+	profile_path = install.mo2_path / "profiles" / "Default"
+	modlist = ["*DLC: Automatron", "-Disabled Mod", *(f"+{mod}" for mod in reversed(mods))]
+	_write(profile_path / "modlist.txt", "\n".join(modlist).encode())
+	_write(
+		install.mo2_ini_path,
+		(
+			"[General]\n"
+			"gameName=Fallout 4\n"
+			f"gamePath=@ByteArray({install.game_path})\n"
+			"selected_profile=@ByteArray(Default)\n"
+			"[Settings]\n"
+		).encode(),
+	)
+
+	# Game INIs and plugins.txt. Backslashes match the paths used by GameInfo and OverviewInfo.
+	ini_lines = ["[General]", "sLanguage=en", "[Archive]"]
+	ini_lines.extend(f"{setting}={', '.join(archives)}" for setting, archives in GAME_ARCHIVES.items())
+	_write(install.environment_root / "Documents" / "My Games\\Fallout4" / "Fallout4.ini", "\n".join(ini_lines).encode())
+	plugins = [f"*{mod}.esp" if mod_num % 10 != 9 else f"{mod}.esp" for mod_num, mod in enumerate(mods)]
+	_write(install.environment_root / "AppDataLocal" / "Fallout4\\plugins.txt", "\n".join(plugins).encode())
+	# Used by headless scans, where there's no VFS to redirect the game's plugins.txt to the profile's.
+	_write(profile_path / "plugins.txt", "\n".join(plugins).encode())
+	return install
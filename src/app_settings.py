@@ -50,6 +50,10 @@ class AppSettingsDict(TypedDict):
 	scanner_JunkFiles: bool
 	scanner_ProblemOverrides: bool
 	scanner_RaceSubgraphs: bool
+	scanner_walk_workers: int
+	scanner_cache: bool
+	scanner_read_stage: bool
+	overview_auto_refresh: bool
 	downgrader_keep_backups: bool
 	downgrader_delete_deltas: bool
 
@@ -64,6 +68,10 @@ class AppSettingsDict(TypedDict):
 	"scanner_JunkFiles": True,
 	"scanner_ProblemOverrides": True,
 	"scanner_RaceSubgraphs": True,
+	"scanner_walk_workers": 8,
+	"scanner_cache": True,
+	"scanner_read_stage": False,
+	"overview_auto_refresh": False,
 	"downgrader_keep_backups": True,
 	"downgrader_delete_deltas": True,
 }
@@ -0,0 +1,232 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import mmap
+import struct
+from collections.abc import Iterator
+from functools import cached_property
+from pathlib import Path
+from types import TracebackType
+from typing import Any, NamedTuple, Self
+
+from enums import Magic
+
+ARCHIVE_HEADER = struct.Struct("<4sI4sIQ")
+"""BTDX, version, format, file count, name table offset."""
+ARCHIVE_HEADER_EXTRA = {2: 8, 3: 12}
+"""Bytes after the header in Starfield's versions, which otherwise use the same layout."""
+GNRL_RECORD = struct.Struct("<I4sIIQIII")
+"""Name hash, extension, folder hash, flags, data offset, packed size, unpacked size, padding."""
+DX10_RECORD = struct.Struct("<I4sIBBHHHBBBB")
+"""Name hash, extension, folder hash, unknown, chunk count, chunk header size, height, width, mips, DXGI format, flags, tile mode."""
+DX10_CHUNK = struct.Struct("<QIIHHI")
+"""Data offset, packed size, unpacked size, first mip, last mip, padding."""
+NAME_LENGTH = struct.Struct("<H")
+
+
+class BA2Chunk(NamedTuple):
+	offset: int
+	packed_size: int
+	"""0 if the chunk is stored uncompressed."""
+	unpacked_size: int
+
+
+class BA2Texture(NamedTuple):
+	height: int
+	width: int
+	mip_count: int
+	dxgi_format: int
+	cubemap: bool
+
+
+class BA2Entry(NamedTuple):
+	name_hash: int
+	extension: str
+	folder_hash: int
+	chunks: tuple[BA2Chunk, ...]
+	"""A single chunk for GNRL entries. DX10 entries have a chunk per range of mips."""
+	texture: BA2Texture | None
+	"""Only set for DX10 entries."""
+
+	@property
+	def packed_size(self) -> int:
+		"""Bytes stored in the archive, whether compressed or not."""
+		return sum(chunk.packed_size or chunk.unpacked_size for chunk in self.chunks)
+
+	@property
+	def unpacked_size(self) -> int:
+		return sum(chunk.unpacked_size for chunk in self.chunks)
+
+
+class BA2Archive:
+	"""Reads the header, file records, and name table of a BA2 without reading any file data.
+
+	The archive is memory-mapped, so only the pages that are parsed are read from disk.
+	Records are parsed on first use, and names are only decoded while iterating them.
+	Raises ValueError if the file isn't a BA2, and OSError if it can't be opened.
+	"""
+
+	def __init__(self, path: Path) -> None:
+		self.path = path
+		with path.open("rb") as f:
+			try:
+				self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+			except ValueError:
+				# Empty files can't be mapped.
+				msg = f"Not a BA2: {path.name}"
+				raise ValueError(msg) from None
+
+		try:
+			self.version, self.format, self.file_count, self.name_table_offset = self._read_header()
+		except:
+			self._data.close()
+			raise
+		self.records_offset = ARCHIVE_HEADER.size + ARCHIVE_HEADER_EXTRA.get(self.version, 0)
+
+	def _read_header(self) -> tuple[int, str, int, int]:
+		"""Version, format (GNRL or DX10), file count, and name table offset."""
+		if len(self._data) < ARCHIVE_HEADER.size:
+			msg = f"Not a BA2: {self.path.name}"
+			raise ValueError(msg)
+
+		magic, version, archive_format, file_count, name_table_offset = ARCHIVE_HEADER.unpack_from(self._data)
+		if magic != Magic.BTDX:
+			msg = f"Not a BA2: {self.path.name}"
+			raise ValueError(msg)
+		if archive_format not in {Magic.GNRL, Magic.DX10}:
+			msg = f"Unknown BA2 format in {self.path.name}: {archive_format!r}"
+			raise ValueError(msg)
+		return version, archive_format.decode("ascii"), file_count, name_table_offset
+
+	def __enter__(self) -> Self:
+		return self
+
+	def __exit__(
+		self,
+		exc_type: type[BaseException] | None,
+		exc_value: BaseException | None,
+		traceback: TracebackType | None,
+	) -> None:
+		self.close()
+
+	def close(self) -> None:
+		self._data.close()
+
+	def _truncated(self) -> ValueError:
+		return ValueError(f"File records of {self.path.name} are truncated")
+
+	def _iter_gnrl_records(self) -> Iterator[tuple[Any, ...]]:
+		end = self.records_offset + GNRL_RECORD.size * self.file_count
+		if end > len(self._data):
+			raise self._truncated()
+		return GNRL_RECORD.iter_unpack(self._data[self.records_offset : end])
+
+	def _iter_dx10_records(self) -> Iterator[tuple[tuple[Any, ...], Iterator[tuple[Any, ...]]]]:
+		"""Each DX10 record with an iterator over its chunks."""
+		data = self._data
+		offset = self.records_offset
+		for _ in range(self.file_count):
+			chunks_offset = offset + DX10_RECORD.size
+			if chunks_offset > len(data):
+				raise self._truncated()
+			record = DX10_RECORD.unpack_from(data, offset)
+			offset = chunks_offset + DX10_CHUNK.size * record[4]
+			if offset > len(data):
+				raise self._truncated()
+			yield record, DX10_CHUNK.iter_unpack(data[chunks_offset:offset])
+
+	@cached_property
+	def entries(self) -> list[BA2Entry]:
+		"""Record of each file, in the same order as the names."""
+		if self.format == "GNRL":
+			return [
+				BA2Entry(
+					name_hash,
+					extension.rstrip(b"\0").decode("ascii", "replace"),
+					folder_hash,
+					(BA2Chunk(offset, packed_size, unpacked_size),),
+					None,
+				)
+				for name_hash, extension, folder_hash, _, offset, packed_size, unpacked_size, _ in self._iter_gnrl_records()
+			]
+
+		return [
+			BA2Entry(
+				name_hash,
+				extension.rstrip(b"\0").decode("ascii", "replace"),
+				folder_hash,
+				tuple(BA2Chunk(offset, packed_size, unpacked_size) for offset, packed_size, unpacked_size, *_ in chunks),
+				BA2Texture(height, width, mip_count, dxgi_format, bool(flags & 1)),
+			)
+			for (
+				(name_hash, extension, folder_hash, _, _, _, height, width, mip_count, dxgi_format, flags, _),
+				chunks,
+			) in self._iter_dx10_records()
+		]
+
+	@cached_property
+	def _sizes(self) -> tuple[int, int]:
+		"""Packed and unpacked size of all file data, read straight from the records without creating entries."""
+		if "entries" in self.__dict__:
+			return (
+				sum(entry.packed_size for entry in self.entries),
+				sum(entry.unpacked_size for entry in self.entries),
+			)
+
+		if self.format == "GNRL":
+			chunk_sizes = ((packed_size, unpacked_size) for *_, packed_size, unpacked_size, _ in self._iter_gnrl_records())
+		else:
+			chunk_sizes = (
+				(packed_size, unpacked_size)
+				for _, chunks in self._iter_dx10_records()
+				for _, packed_size, unpacked_size, *_ in chunks
+			)
+
+		packed_total = 0
+		unpacked_total = 0
+		for packed_size, unpacked_size in chunk_sizes:
+			packed_total += packed_size or unpacked_size
+			unpacked_total += unpacked_size
+		return packed_total, unpacked_total
+
+	@property
+	def packed_size(self) -> int:
+		"""Bytes of file data stored in the archive, whether compressed or not."""
+		return self._sizes[0]
+
+	@property
+	def unpacked_size(self) -> int:
+		"""Bytes of file data once extracted."""
+		return self._sizes[1]
+
+	def iter_names(self) -> Iterator[str]:
+		"""Path of each file relative to Data, in the same order as entries. Decoded one at a time."""
+		data = self._data
+		if not self.name_table_offset:
+			return
+
+		offset = self.name_table_offset
+		for _ in range(self.file_count):
+			if offset + NAME_LENGTH.size > len(data):
+				msg = f"Name table of {self.path.name} is truncated"
+				raise ValueError(msg)
+			(length,) = NAME_LENGTH.unpack_from(data, offset)
+			offset += NAME_LENGTH.size
+			yield data[offset : offset + length].decode("cp1252", "replace")
+			offset += length
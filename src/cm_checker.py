@@ -70,6 +70,10 @@ def get_image(self, relative_path: str) -> PhotoImage:
 	def on_close(self) -> None:
 		if self.processing_data:
 			return
+
+		scanner_tab = self.tabs[Tab.Scanner]
+		if isinstance(scanner_tab, tabs.ScannerTab):
+			scanner_tab.cancel_scan(wait=True)
 		sys.stderr = sys.__stderr__
 		self.root.destroy()
 
@@ -213,3 +217,7 @@ def on_tab_changed(self, event: "Event[ttk.Notebook]") -> None:
 	def refresh_tab(self, tab: Tab) -> None:
 		logger.debug("Refresh Tab : %s", tab)
 		self.tabs[tab].refresh()
+
+	def is_scanning(self) -> bool:
+		scanner_tab = self.tabs[Tab.Scanner]
+		return isinstance(scanner_tab, tabs.ScannerTab) and scanner_tab.scanner is not None
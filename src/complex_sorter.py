@@ -0,0 +1,92 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import logging
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from utils import decode_text
+
+if TYPE_CHECKING:
+	from scan_stats import ScanStats
+
+logger = logging.getLogger(__name__)
+
+OUTDATED_FIELD_PATTERNS = (
+	'FindNode OBTS(FindNode "Addon Index"',
+	"FindNode OBTS(FindNode 'Addon Index'",
+)
+"""xEdit 4.1.5g renamed 'Addon Index' to 'Parent Combination Index'."""
+
+_RAW_MARKERS = tuple("Addon Index".encode(encoding) for encoding in ("ascii", "utf-16-le", "utf-16-be"))
+"""INIs without these bytes can't contain an outdated field, so they're never decoded."""
+
+_results: dict[Path, tuple[int, int, bool]] = {}
+"""Size, mtime, and result of each INI checked this session."""
+_results_lock = threading.Lock()
+
+
+def _has_outdated_line(ini_bytes: bytes) -> bool:
+	ini_text, _ = decode_text(ini_bytes)
+	return any(
+		not ini_line.startswith(";") and any(pattern in ini_line for pattern in OUTDATED_FIELD_PATTERNS)
+		for ini_line in ini_text.splitlines()
+	)
+
+
+def uses_outdated_field(ini_path: Path, stats: "ScanStats | None" = None) -> bool:
+	"""Whether a Complex Sorter INI uses 'Addon Index' outside of comments. Results are cached by path, size, and mtime."""
+	try:
+		stat = ini_path.stat()
+		with _results_lock:
+			cached = _results.get(ini_path)
+		if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+			return cached[2]
+
+		ini_bytes = ini_path.read_bytes()
+	except OSError:
+		return False
+
+	if stats is not None:
+		stats.add_bytes_read(len(ini_bytes))
+
+	try:
+		found = any(marker in ini_bytes for marker in _RAW_MARKERS) and _has_outdated_line(ini_bytes)
+	except (UnicodeDecodeError, LookupError):
+		logger.warning("Complex Sorter : Failed to decode %s", ini_path, exc_info=True)
+		found = False
+
+	with _results_lock:
+		_results[ini_path] = (stat.st_size, stat.st_mtime_ns, found)
+	return found
+
+
+def find_outdated_inis(ini_paths: Iterable[Path], max_workers: int, stats: "ScanStats | None" = None) -> list[Path]:
+	"""Check INIs on a thread pool. Returns those using the outdated field, in the order given."""
+	ini_paths = list(dict.fromkeys(ini_paths))
+	with ThreadPoolExecutor(max_workers, thread_name_prefix="complex_sorter") as executor:
+		return [
+			ini_path
+			for ini_path, found in zip(ini_paths, executor.map(uses_outdated_field, ini_paths, repeat(stats)), strict=True)
+			if found
+		]
@@ -47,6 +47,14 @@ class Magic(bytes, Enum):
 	DX10 = b"DX10"
 	TES4 = b"TES4"
 	HEDR = b"HEDR"
+	MAST = b"MAST"
+	ONAM = b"ONAM"
+	CNAM = b"CNAM"
+	SNAM = b"SNAM"
+	GRUP = b"GRUP"
+	RACE = b"RACE"
+	SADD = b"SADD"
+	XXXX = b"XXXX"
 	DDS = b"DDS "
 
 
@@ -72,9 +80,14 @@ class ArchiveVersion(IntEnum):
 
 
 class ModuleFlag(IntFlag):
+	Master = 0x0001
 	Light = 0x0200
 
 
+class RecordFlag(IntFlag):
+	Compressed = 0x00040000
+
+
 class ProblemType(StrEnum):
 	JunkFile = "Junk File"
 	UnexpectedFormat = "Unexpected Format"
@@ -83,6 +96,9 @@ class ProblemType(StrEnum):
 	AnimTextDataFolder = "Loose AnimTextData"
 	InvalidArchive = "Invalid Archive"
 	InvalidModule = "Invalid Module"
+	MissingMaster = "Missing Master"
+	MasterOrder = "Master Load Order"
+	CircularMasters = "Circular Masters"
 	InvalidArchiveName = "Invalid Archive Name"
 	F4SEOverride = "F4SE Script Override"
 	FileNotFound = "File Not Found"
@@ -104,6 +120,9 @@ class SolutionType(StrEnum):
 		"Verify files with Steam or reinstall the game.\nIf you downgraded the game you will need to do so again afterward."
 	)
 	UnknownFormat = "If this file type is expected here, please report it."
+	EnableMaster = "Install and enable the missing masters, or disable this module."
+	SortMasters = "Sort your load order so masters load before the modules that use them.\nLOOT or MO2's Sort button can do this."
+	BrokenMasters = "Modules can't be masters of each other. One of these modules is broken and should be redownloaded or reported to its author."
 	ComplexSorterFix = "IF you are using xEdit v4.1.5g+, all references to 'Addon Index' in this file should be updated to 'Parent Combination Index'."
 
 
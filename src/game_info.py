@@ -38,10 +38,22 @@
 if TYPE_CHECKING:
 	from helpers import FileInfo
 	from mod_manager_info import ModManagerInfo
+	from module_records import ModuleHeader
 
 
 class GameInfo:
-	def __init__(self, install_type_sv: StringVar, game_path_sv: StringVar) -> None:
+	def __init__(
+		self,
+		install_type_sv: StringVar | None,
+		game_path_sv: StringVar | None,
+		*,
+		manager: "ModManagerInfo | None" = None,
+		game_path: Path | None = None,
+	) -> None:
+		"""The StringVars are None when running headless.
+
+		If game_path is given, the manager is used as-is instead of detecting it and its INI.
+		"""
 		self._install_type_sv = install_type_sv
 		self._game_path_sv = game_path_sv
 		self.name: Literal["Fallout4"]
@@ -59,6 +71,8 @@ def __init__(self, install_type_sv: StringVar, game_path_sv: StringVar) -> None:
 		self.modules_hedr_95: set[Path] = set()
 		self.modules_hedr_unknown: dict[Path, float] = {}
 		self.modules_enabled: list[Path] = []
+		self.module_headers: dict[Path, ModuleHeader] = {}
+		"""TES4 records of the enabled modules that could be read."""
 		self.file_info: dict[str, FileInfo] = {}
 		self.address_library: Path | None = None
 		self.ckfixes_found = False
@@ -71,18 +85,28 @@ def __init__(self, install_type_sv: StringVar, game_path_sv: StringVar) -> None:
 		self.module_count_full = 0
 		self.module_count_light = 0
 		self.module_count_v1 = 0
-		self.manager: ModManagerInfo | None = find_mod_manager()
-		self.find_path()
+		if game_path is None:
+			self.manager: ModManagerInfo | None = find_mod_manager()
+			self.find_path()
+		else:
+			self.manager = manager
+			self.game_path = game_path
 		self.load_game_inis()
 
-	def load_game_inis(self) -> None:
+	@staticmethod
+	def get_ini_paths() -> list[Path]:
 		docs_path = get_environment_path(CSIDL.Documents) / "My Games\\Fallout4"
-		for name in ("Fallout4.ini", "Fallout4Prefs.ini", "Fallout4Custom.ini"):
-			ini_path = docs_path / name
+		return [docs_path / name for name in ("Fallout4.ini", "Fallout4Prefs.ini", "Fallout4Custom.ini")]
+
+	def load_game_inis(self) -> None:
+		"""Read the game INIs, replacing any settings read before."""
+		self.game_settings.clear()
+		self.game_prefs.clear()
+		for ini_path in self.get_ini_paths():
 			if not is_file(ini_path):
 				continue
 			section = "NO-SECTION"
-			ini_dict = self.game_prefs if name == "Fallout4Prefs.ini" else self.game_settings
+			ini_dict = self.game_prefs if ini_path.name == "Fallout4Prefs.ini" else self.game_settings
 			for line in ini_path.read_text(encoding="utf-8").splitlines():
 				if line.startswith("[") and line.endswith("]"):
 					section = line[1:-1].lower()
@@ -117,6 +141,7 @@ def reset_modules(self) -> None:
 		self.modules_hedr_95.clear()
 		self.modules_hedr_unknown.clear()
 		self.modules_enabled.clear()
+		self.module_headers.clear()
 		self.modules_unreadable.clear()
 
 	def reset_archives(self) -> None:
@@ -136,7 +161,8 @@ def game_path(self) -> Path:
 	@game_path.setter
 	def game_path(self, value: Path) -> None:
 		self._game_path = value
-		self._game_path_sv.set(str(value))
+		if self._game_path_sv is not None:
+			self._game_path_sv.set(str(value))
 
 		data_path = value / "Data"
 		if is_dir(data_path):
@@ -162,7 +188,8 @@ def install_type(self) -> InstallType:
 	@install_type.setter
 	def install_type(self, value: InstallType) -> None:
 		self._install_type = value
-		self._install_type_sv.set(str(value))
+		if self._install_type_sv is not None:
+			self._install_type_sv.set(str(value))
 
 	def find_path(self) -> None:
 		if self.manager is not None:
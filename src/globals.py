@@ -244,6 +244,8 @@ class BaseGameFile(TypedDict):
 TOOLTIP_GAME_PATH = "Click to open folder"
 TOOLTIP_LOCATION = "Click to open location"
 TOOLTIP_REFRESH = "Refresh"
+TOOLTIP_AUTO_REFRESH = """Refresh automatically when plugins.txt, Fallout4.ccc, the game INIs, or files in Data are added or removed.
+Only the modified times of these are checked every few seconds."""
 
 TOOLTIP_ADDRESS_LIBRARY_MISSING = "Address Library is required for many F4SE mods."
 
@@ -299,6 +301,12 @@ class BaseGameFile(TypedDict):
 Base Game Count: 37
 Warning Threshold: {RACE_SUBGRAPH_THRESHOLD}"""
 
+TOOLTIP_SCAN_READ_STAGE = """Build Data from MO2's staging folder instead of reading it through MO2's VFS.
+Faster on large setups, and avoids VFS issues such as with MO2 2.5.2 on Windows 11 24H2."""
+TOOLTIP_SCAN_ALL_PROFILES = """Scan every MO2 profile instead of only the selected one.
+Each mod is read once and results list the profiles they were found in."""
+TOOLTIP_SCAN_RESULTS_FILTER = """Show only results with every word in their path, mod, or problem type.
+For example: "armor dds" or "junk file"."""
 TOOLTIP_SCAN_DDS = "Check dimensions and formats of DDS files for issues."
 TOOLTIP_SCAN_BA2 = "Scan inside BA2 archives.\nNote: Checks may be limited for compressed archives."
 TOOLTIP_SCAN_CONFLICTS = "Detect conflicting mods and mod settings."
@@ -0,0 +1,188 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import json
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TypedDict
+
+from enums import Magic
+from module_records import ModuleHeader, read_module_header
+from utils import is_file, read_head
+
+logger = logging.getLogger(__name__)
+
+HEADER_CACHE_PATH = Path("header_cache.json")
+HEADER_CACHE_VERSION = 2
+ARCHIVE_HEADER_SIZE = 12
+"""BTDX magic, version, and archive format."""
+
+
+class ArchiveHeader(TypedDict):
+	btdx: bool
+	"""Whether the archive starts with the BTDX magic."""
+	version: int
+	format: str
+
+
+class CachedHeader[H](TypedDict):
+	size: int
+	mtime: int
+	header: H
+
+
+class HeaderCacheDict(TypedDict):
+	version: int
+	modules: dict[str, CachedHeader[ModuleHeader]]
+	archives: dict[str, CachedHeader[ArchiveHeader]]
+
+
+def read_archive_header(archive_path: Path) -> ArchiveHeader | None:
+	head = read_head(archive_path, ARCHIVE_HEADER_SIZE)
+	if head is None:
+		return None
+	return parse_archive_header(head)
+
+
+def parse_archive_header(head: bytes) -> ArchiveHeader:
+	if len(head) != ARCHIVE_HEADER_SIZE or head[:4] != Magic.BTDX:
+		return {"btdx": False, "version": 0, "format": ""}
+	return {"btdx": True, "version": head[4], "format": head[8:].decode("latin-1")}
+
+
+class HeaderCache:
+	"""On-disk cache of the module and archive headers read by Overview, saved next to settings.json.
+
+	Headers are only read again for files whose size or mtime changed. The cache is kept between
+	refreshes, and entries for files that no longer exist are pruned when it's saved.
+	"""
+
+	def __init__(self, *, enabled: bool = True) -> None:
+		self.enabled = enabled
+		self.modules: dict[str, CachedHeader[ModuleHeader]] = {}
+		self.archives: dict[str, CachedHeader[ArchiveHeader]] = {}
+		self.used: set[str] = set()
+		"""Paths requested since the cache was loaded. Others are checked for removal on save."""
+		self.changed = False
+		self.hits = 0
+
+		if self.enabled and is_file(HEADER_CACHE_PATH):
+			try:
+				cache_content: HeaderCacheDict = json.loads(HEADER_CACHE_PATH.read_text("utf-8"))
+				if not isinstance(cache_content, dict):  # type: ignore[reportUnnecessaryIsInstance]
+					raise ValueError  # noqa: TRY004
+			except:
+				logger.exception("Header Cache : Failed to load %s. It will be rebuilt.", HEADER_CACHE_PATH.name)
+			else:
+				if cache_content.get("version") != HEADER_CACHE_VERSION:
+					logger.info("Header Cache : Version changed. It will be rebuilt.")
+				else:
+					self.modules = cache_content.get("modules", {})
+					self.archives = cache_content.get("archives", {})
+
+	def get_modules(self, paths: list[Path], max_workers: int) -> list[ModuleHeader | None]:
+		"""Header of each module in the same order as paths, or None if it can't be read."""
+		return self._get_headers(paths, max_workers, self.modules, read_module_header)
+
+	def get_archives(self, paths: list[Path], max_workers: int) -> list[ArchiveHeader | None]:
+		"""Header of each archive in the same order as paths, or None if it can't be read."""
+		return self._get_headers(paths, max_workers, self.archives, read_archive_header)
+
+	def _get_headers[H](
+		self,
+		paths: list[Path],
+		max_workers: int,
+		entries: dict[str, CachedHeader[H]],
+		read_header: Callable[[Path], H | None],
+	) -> list[H | None]:
+		def read(path: Path) -> CachedHeader[H] | None:
+			try:
+				stat = path.stat()
+			except OSError:
+				return None
+
+			old_entry = entries.get(str(path)) if self.enabled else None
+			if old_entry is not None and old_entry["size"] == stat.st_size and old_entry["mtime"] == stat.st_mtime_ns:
+				return old_entry
+
+			try:
+				header = read_header(path)
+			except OSError:
+				return None
+			if header is None:
+				return None
+			return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "header": header}
+
+		if max_workers <= 1 or len(paths) <= 1:
+			new_entries = [read(path) for path in paths]
+		else:
+			with ThreadPoolExecutor(min(max_workers, len(paths)), thread_name_prefix="header") as executor:
+				new_entries = list(executor.map(read, paths))
+
+		if not self.enabled:
+			return [entry["header"] if entry else None for entry in new_entries]
+
+		headers: list[H | None] = []
+		for path, entry in zip(paths, new_entries, strict=True):
+			key = str(path)
+			self.used.add(key)
+			if entry is None:
+				if entries.pop(key, None) is not None:
+					self.changed = True
+				headers.append(None)
+				continue
+
+			if entries.get(key) is entry:
+				self.hits += 1
+			else:
+				entries[key] = entry
+				self.changed = True
+			headers.append(entry["header"])
+		return headers
+
+	def save(self) -> None:
+		"""Write the cache if anything changed, first removing files that no longer exist."""
+		if not self.enabled:
+			return
+
+		for entries in (self.modules, self.archives):
+			removed = [key for key in entries if key not in self.used and not is_file(Path(key))]
+			for key in removed:
+				del entries[key]
+			self.changed = self.changed or bool(removed)
+
+		logger.info("Header Cache : %s headers reused", self.hits)
+		self.hits = 0
+		if not self.changed:
+			return
+
+		cache_content: HeaderCacheDict = {
+			"version": HEADER_CACHE_VERSION,
+			"modules": self.modules,
+			"archives": self.archives,
+		}
+		try:
+			with HEADER_CACHE_PATH.open("w", encoding="utf-8") as f:
+				json.dump(cache_content, f, separators=(",", ":"))
+		except:
+			logger.exception("Header Cache : Failed to save %s", HEADER_CACHE_PATH.name)
+		else:
+			self.changed = False
@@ -0,0 +1,255 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import argparse
+import json
+import logging
+import queue
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from packaging.version import Version
+
+from game_info import GameInfo
+from globals import APP_TITLE, APP_VERSION
+from helpers import ProblemInfo, SimpleProblemInfo
+from mod_manager_info import ModManagerInfo
+from overview_info import CountName, OverviewInfo
+from scan_settings import ScanSetting, ScanSettings
+from scanner import DataScanner, ScanUpdate
+from utils import get_file_version, is_dir, is_file, is_fo4_dir
+
+if TYPE_CHECKING:
+	from app_settings import AppSettings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JSON_PATH = Path("scan-results.json")
+"""Used when there's no console to write to, such as the windowed EXE."""
+
+COUNT_NAMES: tuple[CountName, ...] = ("GNRL", "DX10", "TotalBA2s", "Full", "Light", "TotalModules")
+
+
+def build_parser() -> argparse.ArgumentParser:
+	parser = argparse.ArgumentParser(prog="cm-toolkit", description=f"{APP_TITLE} v{APP_VERSION}")
+	subparsers = parser.add_subparsers(dest="command", required=True)
+
+	parser_scan = subparsers.add_parser(
+		"scan",
+		help="Gather Overview info and run the Scanner without the GUI, then write the results as JSON.",
+	)
+	parser_scan.add_argument(
+		"--mo2-ini",
+		type=Path,
+		help="ModOrganizer.ini of the MO2 instance to scan. Without this, only Data is scanned.",
+	)
+	parser_scan.add_argument(
+		"--profile",
+		help="MO2 profile to scan. Defaults to the profile selected in the INI.",
+	)
+	parser_scan.add_argument(
+		"--game-path",
+		type=Path,
+		help="Fallout 4 install folder. Defaults to gamePath in the MO2 INI, then the current folder.",
+	)
+	parser_scan.add_argument(
+		"--json",
+		type=Path,
+		help=f"Write results to this file instead of the console. Defaults to {DEFAULT_JSON_PATH} if there is no console.",
+	)
+	parser_scan.add_argument(
+		"--checks",
+		nargs="+",
+		choices=[setting.name for setting in ScanSetting],
+		help="Scanner options to enable. Defaults to those enabled in settings.json.",
+	)
+	parser_scan.add_argument(
+		"--read-stage",
+		action="store_true",
+		default=None,
+		help="Build Data from the MO2 staging folder instead of MO2's VFS. Always on with --mo2-ini unless --no-stage is used.",
+	)
+	parser_scan.add_argument(
+		"--all-profiles",
+		action="store_true",
+		help="Scan every profile of the MO2 instance in one pass. Each problem lists the profiles it was found in.",
+	)
+	parser_scan.add_argument(
+		"--no-stage",
+		action="store_true",
+		help="Scan Data only, even if MO2 is used. Results won't list the mod providing each file.",
+	)
+	return parser
+
+
+def get_manager(parser: argparse.ArgumentParser, args: argparse.Namespace) -> ModManagerInfo | None:
+	ini_path: Path | None = args.mo2_ini
+	if ini_path is None:
+		if args.profile or args.all_profiles:
+			parser.error("--profile and --all-profiles require --mo2-ini")
+		return None
+
+	if not is_file(ini_path):
+		parser.error(f"File doesn't exist: {ini_path}")
+
+	exe_path = ini_path.parent / "ModOrganizer.exe"
+	ver = get_file_version(exe_path) if is_file(exe_path) else None
+	manager = ModManagerInfo(
+		"Mod Organizer",
+		exe_path,
+		Version(".".join(str(n) for n in ver[:3])) if ver else Version("0.0.0"),
+	)
+	try:
+		manager.read_mo2_ini(ini_path)
+	except ValueError as e:
+		parser.error(str(e))
+
+	if args.profile:
+		if manager.profiles_path is None or not is_dir(manager.profiles_path / args.profile):
+			parser.error(f"Profile not found: {args.profile}")
+		manager.selected_profile = args.profile
+	return manager
+
+
+def problem_to_dict(problem: ProblemInfo | SimpleProblemInfo) -> dict[str, Any]:
+	return {
+		"type": str(problem.type),
+		"path": str(problem.path),
+		"relative_path": str(problem.relative_path),
+		"mod": problem.mod,
+		"summary": problem.summary,
+		"solution": None if problem.solution is None else str(problem.solution),
+		"file_list": [[value, str(path)] for value, path in problem.file_list] if problem.file_list else None,
+		"extra_data": problem.extra_data,
+		"profiles": problem.profiles,
+	}
+
+
+def run_scan(parser: argparse.ArgumentParser, args: argparse.Namespace, settings: "AppSettings") -> int:
+	time_start = perf_counter()
+	manager = get_manager(parser, args)
+
+	game_path: Path = args.game_path or (manager.game_path if manager else None) or Path.cwd()
+	if not is_fo4_dir(game_path):
+		parser.error(f"Fallout 4 not found in: {game_path}")
+
+	logger.info("Headless : Scanning %s (Profile: %s)", game_path, manager.selected_profile if manager else None)
+	# Overview reads the profile's plugins.txt, as MO2's VFS isn't there to redirect the game's.
+	game = GameInfo(None, None, manager=manager, game_path=game_path)
+	overview_problems: list[ProblemInfo | SimpleProblemInfo] = []
+	overview = OverviewInfo(game, overview_problems)
+	overview.gather()
+	time_overview = perf_counter() - time_start
+
+	if args.checks is None:
+		enabled = {setting: bool(settings.dict[f"scanner_{setting.name}"]) for setting in ScanSetting}
+	else:
+		enabled = {setting: setting.name in args.checks for setting in ScanSetting}
+	using_stage = manager is not None and not args.no_stage
+	if (args.all_profiles or args.read_stage) and not using_stage:
+		parser.error("--all-profiles and --read-stage require --mo2-ini and can't be used with --no-stage")
+	read_stage = args.read_stage
+	if using_stage and manager is not None:
+		# Headless scans don't run in MO2's VFS, so Data only has the profile's mods if built from the staging folder.
+		if not (manager.stage_path and manager.profiles_path and manager.overwrite_path and manager.selected_profile):
+			parser.error(
+				"The MO2 INI is missing the mods, overwrite, or profiles folder, or no profile is selected.\n"
+				"Use --profile to pick one, or --no-stage to scan Data only.",
+			)
+		read_stage = True
+	scan_settings = ScanSettings(
+		settings,
+		enabled,
+		manager,
+		using_stage=using_stage,
+		read_stage=read_stage,
+		all_profiles=args.all_profiles,
+		remember=False,
+	)
+
+	time_scan_start = perf_counter()
+	queue_progress: queue.Queue[ScanUpdate] = queue.Queue()
+	scanner = DataScanner(game, overview_problems, scan_settings, queue_progress)
+	scanner.run()
+	time_scan = perf_counter() - time_scan_start
+
+	problems: list[ProblemInfo | SimpleProblemInfo] = []
+	while not queue_progress.empty():
+		update = queue_progress.get_nowait()
+		if isinstance(update, list):
+			problems.extend(update)
+
+	time_total = perf_counter() - time_start
+	results = {
+		"app_version": APP_VERSION,
+		"game_path": str(game.game_path),
+		"data_path": str(game.data_path) if game.data_path else None,
+		"install_type": str(game.install_type),
+		"mod_manager": manager.name if manager else None,
+		"profile": manager.selected_profile if manager else None,
+		"read_stage": scan_settings.read_stage,
+		"all_profiles": scan_settings.all_profiles,
+		"using_stage": using_stage,
+		"checks": [setting.name for setting in ScanSetting if scan_settings[setting]],
+		"warnings": overview.warnings,
+		"counts": {name: dict(zip(("count", "limit"), overview.get_count(name), strict=True)) for name in COUNT_NAMES},
+		"stats": {
+			"overview_seconds": round(time_overview, 3),
+			"scan_seconds": round(time_scan, 3),
+			"total_seconds": round(time_total, 3),
+			"scan_steps": {step: round(seconds, 3) for step, seconds in scanner.stats.phases.items()},
+			"folders": scanner.stats.folders,
+			"folders_reused": scanner.stats.folders_reused,
+			"files": scanner.stats.files,
+			"files_checked": scanner.stats.files_checked,
+			"files_per_second": round(scanner.stats.files / time_scan) if time_scan else None,
+			"bytes_read": scanner.stats.bytes_read,
+			"rules": {r["name"]: {"problems": r["hits"], "seconds": round(r["seconds"], 3)} for r in scanner.stats.rules},
+			"problems": dict(scanner.stats.problems),
+		},
+		"problems": [problem_to_dict(problem) for problem in problems],
+	}
+	logger.info(
+		"Headless : %s problems, %s files in %.3fs (total %.3fs)",
+		len(problems),
+		scanner.stats.files,
+		time_scan,
+		time_total,
+	)
+
+	json_path: Path | None = args.json
+	if json_path is None and sys.stdout is None:
+		json_path = DEFAULT_JSON_PATH
+
+	if json_path is None:
+		json.dump(results, sys.stdout, indent=2)
+		sys.stdout.write("\n")
+	else:
+		json_path.write_text(json.dumps(results, indent=2), "utf-8")
+	return 0
+
+
+def run_headless(argv: list[str], settings: "AppSettings") -> int:
+	"""Entry point for command-line use. Returns the exit code."""
+	parser = build_parser()
+	args = parser.parse_args(argv)
+	# argparse rejects unknown commands, and scan is the only one so far.
+	return run_scan(parser, args, settings)
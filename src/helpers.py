@@ -138,6 +138,9 @@ def __init__(self) -> None:
 	@abstractmethod
 	def refresh_tab(self, tab: Tab) -> None: ...
 
+	@abstractmethod
+	def is_scanning(self) -> bool: ...
+
 	@abstractmethod
 	def get_image(self, relative_path: str) -> PhotoImage: ...
 
@@ -249,6 +252,8 @@ def __init__(
 		self.file_list = file_list
 		self.extra_data = extra_data
 		self.autofix_result: AutoFixResult | None = None
+		self.profiles: list[str] | None = None
+		"""MO2 profiles this problem was found in, when scanning all profiles."""
 
 
 class SimpleProblemInfo:
@@ -272,6 +277,7 @@ def __init__(
 		self.file_list = file_list
 		self.extra_data = extra_data
 		self.autofix_result: AutoFixResult | None = None
+		self.profiles: list[str] | None = None
 
 
 class StdErr:
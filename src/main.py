@@ -25,6 +25,7 @@
 from app_settings import AppSettings
 from cm_checker import CMChecker
 from globals import APP_TITLE, APP_VERSION
+from headless import run_headless
 from helpers import StdErr
 from utils import get_asset_path, load_font, set_theme
 
@@ -42,6 +43,10 @@
 settings = AppSettings()
 logger.setLevel(settings.dict["log_level"])
 
+# Other arguments are ignored, such as those set on an MO2 executable or a file dropped on the EXE.
+if len(sys.argv) > 1 and sys.argv[1] == "scan":
+	sys.exit(run_headless(sys.argv[1:], settings))
+
 load_font(str(get_asset_path("fonts/CascadiaMono.ttf")))
 root = Tk()
 root.wm_withdraw()
@@ -0,0 +1,134 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import logging
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from enums import ModuleFlag
+
+if TYPE_CHECKING:
+	from module_records import ModuleHeader
+
+logger = logging.getLogger(__name__)
+
+
+def is_master(module_path: Path, header: "ModuleHeader | None") -> bool:
+	"""Whether the game loads a module before all regular modules, whatever its place in plugins.txt."""
+	return module_path.suffix.lower() in {".esm", ".esl"} or (header is not None and bool(header["flags"] & ModuleFlag.Master))
+
+
+class MasterGraph:
+	"""Masters of each enabled module, resolved against the load order.
+
+	Modules are numbered by their place in the load order the game uses, which is the order
+	of modules_enabled with masters moved ahead of regular modules. Edges point from a module
+	to each of its enabled masters.
+	"""
+
+	def __init__(self, modules_enabled: list[Path], module_headers: "dict[Path, ModuleHeader]") -> None:
+		start = perf_counter()
+		self.load_order = sorted(
+			dict.fromkeys(modules_enabled),
+			key=lambda module_path: not is_master(module_path, module_headers.get(module_path)),
+		)
+		self.index: dict[str, int] = {}
+		"""Place of each module in load_order by lowercase name."""
+		for i, module_path in enumerate(self.load_order):
+			self.index.setdefault(module_path.name.lower(), i)
+
+		self.masters: list[list[int]] = []
+		"""Enabled masters of each module."""
+		self.missing: dict[int, list[str]] = {}
+		"""Masters that aren't enabled, by module."""
+		for i, module_path in enumerate(self.load_order):
+			header = module_headers.get(module_path)
+			masters: list[int] = []
+			for master in header["masters"] if header else ():
+				master_index = self.index.get(master.lower())
+				if master_index is None:
+					self.missing.setdefault(i, []).append(master)
+				else:
+					masters.append(master_index)
+			self.masters.append(masters)
+
+		self.cycles = self._find_cycles()
+		"""Groups of modules that are masters of each other, in load order."""
+		in_cycle = {i: n for n, cycle in enumerate(self.cycles) for i in cycle}
+		self.late: dict[int, list[int]] = {}
+		"""Masters loaded after the module that needs them, by module. Masters in the same cycle are left out."""
+		for i, masters in enumerate(self.masters):
+			cycle = in_cycle.get(i)
+			late = [m for m in masters if m > i and (cycle is None or in_cycle.get(m) != cycle)]
+			if late:
+				self.late[i] = late
+
+		logger.debug("Masters : Resolved %s modules in %.3fs", len(self.load_order), perf_counter() - start)
+
+	def _find_cycles(self) -> list[list[int]]:
+		"""Strongly connected components of more than one module, or of a module that lists itself.
+
+		Tarjan's algorithm with an explicit stack, since master chains can be longer than the recursion limit.
+		"""
+		masters = self.masters
+		order = [-1] * len(masters)
+		low = [0] * len(masters)
+		on_stack = [False] * len(masters)
+		stack: list[int] = []
+		cycles: list[list[int]] = []
+		counter = 0
+
+		for root in range(len(masters)):
+			if order[root] != -1:
+				continue
+
+			work = [(root, 0)]
+			while work:
+				node, edge = work.pop()
+				if edge == 0:
+					order[node] = low[node] = counter
+					counter += 1
+					stack.append(node)
+					on_stack[node] = True
+
+				node_masters = masters[node]
+				while edge < len(node_masters):
+					master = node_masters[edge]
+					edge += 1
+					if order[master] == -1:
+						work.extend(((node, edge), (master, 0)))
+						break
+					if on_stack[master]:
+						low[node] = min(low[node], order[master])
+				else:
+					if low[node] == order[node]:
+						component: list[int] = []
+						while True:
+							member = stack.pop()
+							on_stack[member] = False
+							component.append(member)
+							if member == node:
+								break
+						if len(component) > 1 or node in node_masters:
+							cycles.append(sorted(component))
+					if work:
+						parent = work[-1][0]
+						low[parent] = min(low[parent], low[node])
+		return sorted(cycles)
@@ -82,6 +82,8 @@ def __init__(self, name: Literal["Mod Organizer", "Vortex"], path: Path, version
 		self.overwrite_path: Path | None = None
 		self.profiles_path: Path | None = None
 		self.selected_profile: str | None = None
+		self.vfs_active = False
+		"""The app was launched from MO2, so Data is seen through MO2's VFS for the selected profile."""
 
 		self.skip_file_suffixes: tuple[str, ...]
 		"""These are always lowercase."""
@@ -0,0 +1,231 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import logging
+import struct
+import threading
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
+
+from enums import Magic, RecordFlag
+from globals import GAME_MASTERS
+from utils import get_crc32
+
+if TYPE_CHECKING:
+	from scan_stats import ScanStats
+
+logger = logging.getLogger(__name__)
+
+RECORD_HEADER = struct.Struct("<4sII")
+"""Type, data size, flags. Records and groups both have 24-byte headers."""
+GROUP_HEADER = struct.Struct("<4sI4sI")
+"""GRUP, group size including this header, label, group type."""
+SUBRECORD_HEADER = struct.Struct("<4sH")
+HEDR_DATA = struct.Struct("<4sIi")
+"""Version as float bytes, record count, next object ID."""
+HEADER_SIZE = 24
+GROUP_TYPE_TOP = 0
+
+_master_counts: dict[tuple[str, int, str], int] = {}
+"""Race subgraph counts for base game masters by name, size, and CRC of the first chunk."""
+_master_counts_lock = threading.Lock()
+
+
+class ModuleHeader(TypedDict):
+	"""Contents of a module's TES4 record."""
+
+	tes4: bool
+	"""Whether the module starts with a complete TES4 record. Everything else is empty if not."""
+	hedr: str | None
+	"""HEDR version as hex, or None if there's no HEDR subrecord."""
+	flags: int
+	"""ModuleFlag values of the TES4 record."""
+	record_count: int
+	next_object_id: int
+	masters: list[str]
+	"""MAST file names, in the order the module expects them to load."""
+	overrides: list[int]
+	"""ONAM form IDs of overridden records. Only written by the CK for masters."""
+	author: str
+	"""CNAM"""
+	description: str
+	"""SNAM"""
+
+
+def _iter_subrecords(data: bytes) -> Iterator[tuple[bytes, int, int]]:
+	"""Type, data offset, and data size of each subrecord in a record's data.
+
+	Raises ValueError if a subrecord runs past the end of the data.
+	"""
+	offset = 0
+	next_size = None
+	while offset + SUBRECORD_HEADER.size <= len(data):
+		field_type, size = SUBRECORD_HEADER.unpack_from(data, offset)
+		offset += SUBRECORD_HEADER.size
+		if next_size is not None:
+			# Size of a field over 64KB is stored in a preceding XXXX field.
+			size = next_size
+			next_size = None
+		if offset + size > len(data) or (field_type == Magic.XXXX and size < 4):
+			msg = f"Truncated {field_type!r} subrecord at {offset - SUBRECORD_HEADER.size}"
+			raise ValueError(msg)
+		if field_type == Magic.XXXX:
+			(next_size,) = struct.unpack_from("<I", data, offset)
+		else:
+			yield field_type, offset, size
+		offset += size
+
+
+def _count_subrecords(data: bytes, subrecord_type: bytes) -> int:
+	return sum(1 for field_type, _, _ in _iter_subrecords(data) if field_type == subrecord_type)
+
+
+def _decode_zstring(data: bytes) -> str:
+	return data.split(b"\0", 1)[0].decode("cp1252", "replace")
+
+
+def read_module_header(module_path: Path) -> ModuleHeader:
+	"""Parse the TES4 record at the start of a module. Nothing past it is read.
+
+	tes4 is False if the record is cut short, including any of its subrecords.
+	"""
+	header: ModuleHeader = {
+		"tes4": False,
+		"hedr": None,
+		"flags": 0,
+		"record_count": 0,
+		"next_object_id": 0,
+		"masters": [],
+		"overrides": [],
+		"author": "",
+		"description": "",
+	}
+	with module_path.open("rb") as f:
+		record_header = f.read(HEADER_SIZE)
+		if len(record_header) != HEADER_SIZE or record_header[:4] != Magic.TES4:
+			return header
+		_, data_size, header["flags"] = RECORD_HEADER.unpack_from(record_header)
+		data = f.read(data_size)
+	if len(data) != data_size:
+		header["flags"] = 0
+		return header
+
+	try:
+		fields = list(_iter_subrecords(data))
+	except ValueError:
+		logger.warning("Module Header : Failed to read TES4 record in %s", module_path.name, exc_info=True)
+		header["flags"] = 0
+		return header
+
+	header["tes4"] = True
+	for field_type, offset, size in fields:
+		field_data = data[offset : offset + size]
+		match field_type:
+			case Magic.HEDR if size >= HEDR_DATA.size:
+				version, header["record_count"], header["next_object_id"] = HEDR_DATA.unpack_from(field_data)
+				header["hedr"] = version.hex()
+			case Magic.MAST:
+				header["masters"].append(_decode_zstring(field_data))
+			case Magic.ONAM:
+				header["overrides"].extend(form_id for (form_id,) in struct.iter_unpack("<I", field_data[: size - size % 4]))
+			case Magic.CNAM:
+				header["author"] = _decode_zstring(field_data)
+			case Magic.SNAM:
+				header["description"] = _decode_zstring(field_data)
+			case _:
+				pass
+	return header
+
+
+def _count_group_subrecords(data: bytes, subrecord_type: bytes) -> int:
+	"""Count subrecords in every record of a group's contents. Nested group headers are stepped into."""
+	count = 0
+	offset = 0
+	while offset + HEADER_SIZE <= len(data):
+		record_type, data_size, flags = RECORD_HEADER.unpack_from(data, offset)
+		offset += HEADER_SIZE
+		if record_type == Magic.GRUP:
+			continue
+
+		record_data = data[offset : offset + data_size]
+		offset += data_size
+		if flags & RecordFlag.Compressed:
+			# Compressed records start with the decompressed size.
+			record_data = zlib.decompress(record_data[4:])
+		count += _count_subrecords(record_data, subrecord_type)
+	return count
+
+
+def count_race_subgraphs(module_path: Path, stats: "ScanStats | None" = None) -> int:
+	"""Count SADD subrecords in a module's RACE records.
+
+	Only the top-level RACE group is read. Every other group is skipped using its size.
+	"""
+	count = 0
+	read_size = HEADER_SIZE
+	with module_path.open("rb") as f:
+		header = f.read(HEADER_SIZE)
+		if len(header) != HEADER_SIZE or header[:4] != Magic.TES4:
+			msg = f"Not a module: {module_path.name}"
+			raise ValueError(msg)
+		f.seek(RECORD_HEADER.unpack_from(header)[1], 1)
+
+		while len(header := f.read(HEADER_SIZE)) == HEADER_SIZE:
+			read_size += HEADER_SIZE
+			group_type_magic, group_size, label, group_type = GROUP_HEADER.unpack_from(header)
+			if group_type_magic != Magic.GRUP or group_size < HEADER_SIZE:
+				msg = f"Invalid group in {module_path.name} at {f.tell() - HEADER_SIZE}"
+				raise ValueError(msg)
+
+			if group_type == GROUP_TYPE_TOP and label == Magic.RACE:
+				count += _count_group_subrecords(f.read(group_size - HEADER_SIZE), Magic.SADD)
+				read_size += group_size - HEADER_SIZE
+			else:
+				f.seek(group_size - HEADER_SIZE, 1)
+
+	if stats is not None:
+		stats.add_bytes_read(read_size)
+	return count
+
+
+def _get_master_race_subgraphs(module_path: Path, stats: "ScanStats | None") -> int:
+	# The CRC of the first chunk includes the header's record count, which changes with each game update.
+	key = (module_path.name.lower(), module_path.stat().st_size, get_crc32(module_path, max_chunks=1))
+	with _master_counts_lock:
+		count = _master_counts.get(key)
+	if count is None:
+		count = count_race_subgraphs(module_path, stats)
+		with _master_counts_lock:
+			_master_counts[key] = count
+	return count
+
+
+def get_race_subgraph_count(module_path: Path, stats: "ScanStats | None" = None) -> int | None:
+	"""count_race_subgraphs(), or None if the module can't be read. Base game masters are cached by CRC."""
+	try:
+		if module_path.name.lower() in GAME_MASTERS:
+			return _get_master_race_subgraphs(module_path, stats)
+		return count_race_subgraphs(module_path, stats)
+	except OSError:
+		return None
+	except (ValueError, struct.error, zlib.error):
+		logger.warning("Race Subgraphs : Failed to read records in %s", module_path.name, exc_info=True)
+		return None
@@ -0,0 +1,693 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import logging
+import struct
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from enums import CSIDL, ArchiveVersion, InstallType, Magic, ModuleFlag, ProblemType, SolutionType
+from globals import *
+from header_cache import HeaderCache
+from helpers import ProblemInfo, SimpleProblemInfo
+from master_graph import MasterGraph
+from stage_index import get_root_mod_files, get_stage_paths
+from utils import FileStat, get_crc32, get_environment_path, get_file_version, is_file, stat_paths, ver_to_str
+
+if TYPE_CHECKING:
+	from game_info import GameInfo
+	from mod_manager_info import ModManagerInfo
+	from scan_settings import ModFiles
+
+logger = logging.getLogger(__name__)
+
+type CountName = Literal["GNRL", "DX10", "TotalBA2s", "Full", "Light", "TotalModules"]
+type Section = Literal["binaries", "modules", "archives", "checks"]
+
+SECTIONS: tuple[Section, ...] = ("binaries", "modules", "archives", "checks")
+"""In the order they're gathered. Archives depend on modules, and checks depend on both."""
+
+HEADER_READ_WORKERS = 8
+"""Threads reading module and archive headers. Reads are tiny, so this mostly hides disk and VFS latency."""
+
+
+def get_plugins_path(manager: "ModManagerInfo | None") -> Path:
+	"""The game's plugins.txt, which MO2's VFS redirects to the selected profile's.
+
+	Without the VFS, such as headless scans of an MO2 instance, the profile's own plugins.txt is used instead.
+	"""
+	if (
+		manager
+		and manager.name == "Mod Organizer"
+		and not manager.vfs_active
+		and manager.profiles_path
+		and manager.selected_profile
+	):
+		return manager.profiles_path / manager.selected_profile / "plugins.txt"
+	return get_environment_path(CSIDL.AppDataLocal) / "Fallout4\\plugins.txt"
+
+
+class OverviewInfo:
+	"""Gathers the binary, module, and archive info shown on the Overview tab into GameInfo.
+
+	Nothing here creates widgets, so it's shared by OverviewTab and headless scans.
+	"""
+
+	def __init__(self, game: "GameInfo", problems: list[ProblemInfo | SimpleProblemInfo]) -> None:
+		self.game = game
+		self.problems = problems
+		self.warnings: list[str] = []
+		"""Messages the GUI shows in a warning box on first load."""
+		self.binaries_ok: dict[str, bool | None] = {}
+		"""Whether each binary matches the install type. None if it's missing but optional."""
+		self.header_workers = HEADER_READ_WORKERS
+		self.header_cache = HeaderCache()
+		"""Kept between refreshes, so only modules and archives that changed are read again."""
+		self.inputs: dict[Section, dict[Path, FileStat]] = {}
+		"""Files and folders each section read when it was last gathered."""
+		self.section_problems: dict[Section, list[tuple[ProblemInfo | SimpleProblemInfo, str]]] = {}
+		"""Problems found by each section when it was last gathered, with their original mod."""
+		self.stage_paths: list[Path] = []
+		"""Staging folders of the selected MO2 profile's mods, if Data isn't seen through MO2's VFS."""
+		self.stage_mod_files: ModFiles | None = None
+		"""Modules and archives in the root of those mods. Files only in a mod are found through them."""
+
+	def gather(self) -> None:
+		"""Gather every section from scratch."""
+		self.inputs.clear()
+		self.refresh()
+
+	def refresh(self) -> set[Section]:
+		"""Gather only the sections whose inputs changed since they were last gathered, and return them.
+
+		Problems from the other sections are kept, so refreshing when nothing changed only stats the inputs.
+		"""
+		changed = {section for section in SECTIONS if self.inputs_changed(section)}
+		if "modules" in changed:
+			changed.update(("archives", "checks"))
+		if "archives" in changed:
+			changed.add("checks")
+		logger.debug("Overview : Gathering %s", ", ".join(s for s in SECTIONS if s in changed) or "nothing")
+
+		if changed:
+			self.warnings.clear()
+			self.load_stage_mods()
+		self.problems.clear()
+		for section in SECTIONS:
+			if section not in changed:
+				for problem, mod in self.section_problems[section]:
+					# The Scanner fills in the mod of problems found by Overview.
+					problem.mod = mod
+					self.problems.append(problem)
+				continue
+
+			start = len(self.problems)
+			self.gather_section(section)
+			self.section_problems[section] = [(problem, problem.mod) for problem in self.problems[start:]]
+
+		if changed & {"modules", "archives"}:
+			self.header_cache.save()
+		return changed
+
+	def inputs_changed(self, section: Section) -> bool:
+		inputs = self.inputs.get(section)
+		return inputs is None or stat_paths(inputs) != inputs
+
+	def gather_section(self, section: Section) -> None:
+		game = self.game
+		data_paths = [game.data_path] if game.data_path else []
+		match section:
+			case "binaries":
+				self.get_info_binaries()
+				self.check_binaries()
+				input_paths = [game.game_path / file_name for file_name in BASE_FILES]
+				if game.data_path:
+					input_paths.extend((game.data_path / "F4SE/Plugins", game.data_path / "Fallout4 - Startup.ba2"))
+
+			case "modules":
+				self.get_info_modules()
+				input_paths = [
+					get_plugins_path(game.manager),
+					game.game_path / "Fallout4.ccc",
+					*data_paths,
+					*self.stage_paths,
+					*game.modules_enabled,
+				]
+
+			case "archives":
+				if "archives" in self.inputs:
+					# Already read by GameInfo for the first gather.
+					game.load_game_inis()
+				self.get_info_archives()
+				input_paths = [*game.get_ini_paths(), *data_paths, *game.archives_enabled]
+
+			case "checks":
+				self.check_limits()
+				self.check_masters()
+				input_paths = []
+
+		self.inputs[section] = stat_paths(input_paths)
+
+	def load_stage_mods(self) -> None:
+		"""Index the selected MO2 profile's mods if Data isn't seen through MO2's VFS, such as in headless scans.
+
+		Data then only has what's really in it, so modules and archives from mods are found in their staging folders.
+		"""
+		self.stage_paths = []
+		self.stage_mod_files = None
+		manager = self.game.manager
+		if not manager or manager.name != "Mod Organizer" or manager.vfs_active:
+			return
+
+		try:
+			self.stage_paths = get_stage_paths(manager)
+		except (ValueError, FileNotFoundError):
+			logger.warning("Overview : Staged mods not found. Only files in Data will be found.", exc_info=True)
+			self.warnings.append("MO2's staged mods were not found.\nModules and archives only in mods won't be counted.")
+			return
+		self.stage_mod_files = get_root_mod_files(self.stage_paths, manager.skip_file_suffixes)
+
+	def find_data_file(self, relative_path: str | Path) -> Path | None:
+		"""Full path of a file in Data as the game sees it, or None if it doesn't exist.
+
+		Without MO2's VFS, a copy in the selected profile's mods wins over the one in Data, like in MO2.
+		"""
+		if self.stage_mod_files is not None:
+			staged = self.stage_mod_files.modules.get(relative_path) or self.stage_mod_files.archives.get(relative_path)
+			if staged is not None:
+				return staged[1]
+			if len(Path(relative_path).parts) > 1:
+				for mod_path in reversed(self.stage_paths):
+					if is_file(file_path := mod_path / relative_path):
+						return file_path
+
+		data_path = self.game.data_path
+		if data_path is not None and is_file(file_path := data_path / relative_path):
+			return file_path
+		return None
+
+	def check_binaries(self) -> None:
+		self.binaries_ok.clear()
+		for file_name, file_info in self.game.file_info.items():
+			file_path = file_info["File"] or Path(file_name)
+
+			match file_info["InstallType"]:
+				case self.game.install_type:
+					self.binaries_ok[file_name] = True
+
+				case InstallType.OG if self.game.is_fodg():
+					self.binaries_ok[file_name] = True
+
+				case None:
+					if file_name.lower() in {"creationkit.exe", "archive2.exe"} or (
+						self.game.is_fong() and BASE_FILES[file_name].get("OnlyOG", False)
+					):
+						self.binaries_ok[file_name] = None
+					else:
+						self.binaries_ok[file_name] = False
+						self.problems.append(
+							ProblemInfo(
+								ProblemType.FileNotFound,
+								file_path,
+								file_path.relative_to(file_path.parent, walk_up=True),
+								None,
+								"This file is missing from your game installation.",
+								None,
+							),
+						)
+
+				case _:
+					self.binaries_ok[file_name] = False
+					self.problems.append(
+						ProblemInfo(
+							ProblemType.WrongVersion,
+							file_path,
+							file_path.relative_to(file_path.parent, walk_up=True),
+							None,
+							"The version of this binary does not match your installed game version.",
+							None,
+						),
+					)
+
+	def get_count(self, count: CountName) -> tuple[int, int]:
+		"""Return the enabled count and limit for a module or archive type."""
+		match count:
+			case "GNRL":
+				return self.game.ba2_count_gnrl, MAX_ARCHIVES_GNRL
+			case "DX10":
+				return self.game.ba2_count_dx10, MAX_ARCHIVES_DX10
+			case "Full":
+				return self.game.module_count_full, MAX_MODULES_FULL
+			case "Light":
+				return self.game.module_count_light, MAX_MODULES_LIGHT
+			case "TotalBA2s":
+				return self.game.ba2_count_gnrl + self.game.ba2_count_dx10, MAX_ARCHIVES_GNRL + MAX_ARCHIVES_DX10
+			case "TotalModules":
+				return self.game.module_count_full + self.game.module_count_light, MAX_MODULES_FULL + MAX_MODULES_LIGHT
+
+	def check_limits(self) -> None:
+		counts: tuple[CountName, ...] = ("GNRL", "DX10", "Full", "Light")
+		for count in counts:
+			num, limit = self.get_count(count)
+			if num <= limit:
+				continue
+
+			file_type = "Archive" if count in {"GNRL", "DX10"} else "Module"
+			file_format = "General" if count == "GNRL" else "Texture" if count == "DX10" else count
+			if file_type == "Archive":
+				solution = "Archives can be unpacked or merged to reduce your total.\nNote: Do not mix texture and non-texture archives when merging.\nUnpacking is only suggested for small non-texture archives for performance reasons.\nYou can use Unpackrr to quickly unpack small archives:"
+				extra_data = ["https://www.nexusmods.com/fallout4/mods/82082"]
+
+			# Modules
+			elif count == "Full":
+				solution = "Many Full modules are eligible to be flagged as Light (ESL).\n\nThis guide walks you through the process in xEdit:"
+				extra_data = ["https://themidnightride.moddinglinked.com/esl.html"]
+			else:
+				# Light
+				solution = "Some plugins will need to be removed or manually merged.\nWarning: Do not use old/outdated tools like zMerge with Fallout 4 unless\nyou understand their issues and how to fix the merged plugins afterward."
+				extra_data = None
+
+			self.problems.append(
+				SimpleProblemInfo(
+					f"{num} {file_format} {file_type}s",
+					"Limit Exceeded",
+					f"You have {num} {file_format} {file_type}s enabled. The limit is {limit}.",
+					solution,
+					extra_data=extra_data,
+				),
+			)
+
+	def check_masters(self) -> None:
+		"""Report enabled modules with masters that are missing, load after them, or form a cycle."""
+		data_path = self.game.data_path
+		if data_path is None:
+			return
+
+		graph = MasterGraph(self.game.modules_enabled, self.game.module_headers)
+		load_order = graph.load_order
+		for i, missing in graph.missing.items():
+			module_path = load_order[i]
+			missing_names = [f"{master} (not enabled)" if self.find_data_file(master) else master for master in missing]
+			self.problems.append(
+				ProblemInfo(
+					ProblemType.MissingMaster,
+					module_path,
+					Path(module_path.name),
+					"OVERVIEW",
+					f"Module requires masters that aren't enabled: {', '.join(missing_names)}",
+					SolutionType.EnableMaster,
+				),
+			)
+
+		for i, late in graph.late.items():
+			module_path = load_order[i]
+			self.problems.append(
+				ProblemInfo(
+					ProblemType.MasterOrder,
+					module_path,
+					Path(module_path.name),
+					"OVERVIEW",
+					f"Module loads before its masters: {', '.join(load_order[m].name for m in late)}",
+					SolutionType.SortMasters,
+				),
+			)
+
+		for cycle in graph.cycles:
+			module_path = load_order[cycle[0]]
+			self.problems.append(
+				ProblemInfo(
+					ProblemType.CircularMasters,
+					module_path,
+					Path(module_path.name),
+					"OVERVIEW",
+					f"Modules are masters of each other: {', '.join(load_order[m].name for m in cycle)}",
+					SolutionType.BrokenMasters,
+				),
+			)
+
+	def get_info_binaries(self) -> None:
+		logger.debug("Gathering Info: Binaries")
+		self.game.reset_binaries()
+
+		if not self.game.manager:
+			self.problems.append(
+				SimpleProblemInfo(
+					Path(sys.argv[0]).name,
+					"No Mod Manager",
+					"No Mod Manager Detected",
+					TOOLTIP_NO_MOD_MANAGER,
+				),
+			)
+
+		for file_name in BASE_FILES:
+			file_path = self.game.game_path / file_name
+			if not is_file(file_path):
+				self.game.file_info[file_path.name] = {
+					"File": None,
+					"Version": None,
+					"InstallType": None,
+				}
+				continue
+
+			if BASE_FILES[file_name].get("UseHash", False):
+				version = get_crc32(file_path)
+			else:
+				ver = get_file_version(file_path)
+				if ver is None and BASE_FILES[file_name].get("UseHashFallback", False):
+					version = get_crc32(file_path)
+				else:
+					version = ver_to_str(ver) if ver else "NO VERSION"
+
+			self.game.file_info[file_path.name] = {
+				"File": file_path,
+				"Version": version,
+				"InstallType": BASE_FILES[file_name]["Versions"].get(version, InstallType.Unknown),
+			}
+
+			if file_path.name.lower() == "fallout4.exe":
+				self.game.install_type = self.game.file_info[file_path.name]["InstallType"] or InstallType.Unknown
+				if self.game.install_type == InstallType.Unknown:
+					self.problems.append(
+						SimpleProblemInfo(
+							file_path.name,
+							"Unknown Game Version",
+							f"{version} is an unknown version.\nPossible causes:\n1. The game is an old version and should be updated.\n2. The exe file may be corrupted.\n3. The game is a new version and the Toolkit needs to be updated.",
+							"Either update the game/verify files in Steam, or report this issue.",
+						),
+					)
+
+				if self.game.data_path:
+					address_library_name = f"version-{version.replace('.', '-')}.bin"
+					relative_path = Path("F4SE/Plugins", address_library_name)
+					address_library_path = self.find_data_file(relative_path)
+					if address_library_path is not None:
+						self.game.address_library = address_library_path
+					else:
+						self.problems.append(
+							ProblemInfo(
+								ProblemType.FileNotFound,
+								self.game.data_path / relative_path,
+								relative_path,
+								None,
+								"Address Library is a requirement for many F4SE mods and playing downgraded,\nand likely needs to be installed.",
+								SolutionType.DownloadMod,
+								extra_data=["https://www.nexusmods.com/fallout4/mods/47327"],
+							),
+						)
+
+				if self.game.data_path is not None and self.game.is_foog():
+					startup_name = Path("Fallout4 - Startup.ba2")
+					startup_ba2 = self.find_data_file(startup_name)
+					if startup_ba2 is not None:
+						startup_crc = get_crc32(startup_ba2, skip_ba2_header=True)
+						if startup_crc == NG_STARTUP_BA2_CRC:
+							self.game.install_type = InstallType.DG
+					else:
+						self.problems.append(
+							ProblemInfo(
+								ProblemType.FileNotFound,
+								self.game.data_path / startup_name,
+								startup_name,
+								None,
+								"This is a base game file, and is used by CM Toolkit to differentiate between\nOld-Gen and Down-Grade.",
+								SolutionType.VerifyFiles,
+							),
+						)
+
+	def get_info_archives(self) -> None:
+		logger.debug("Gathering Info: Archives")
+		self.game.reset_archives()
+
+		if self.game.data_path is None:
+			# Reported to Scanner in get_info_modules.
+			return
+
+		settings_archive_lists = (
+			"sresourceindexfilelist",
+			"sresourcestartuparchivelist",
+			"sresourcearchivelist",
+			"sresourcearchivelist2",
+		)
+
+		ini_archive = self.game.game_settings.get("archive")
+		if ini_archive is None:
+			msg = "Archive section missing from INIs"
+			raise ValueError(msg)
+
+		# Load order, so problems are always reported in the same order.
+		archive_paths = dict.fromkeys(
+			archive_path
+			for archive_list in settings_archive_lists
+			for n in ini_archive.get(archive_list, "").split(",")
+			if (archive_path := self.find_data_file(n.strip()))
+		)
+		archive_paths.update(
+			dict.fromkeys(
+				ps
+				for p in self.game.modules_enabled
+				for s in self.game.ba2_suffixes
+				if (ps := self.find_data_file(f"{p.stem} - {s}.ba2"))
+			),
+		)
+
+		if self.game.game_prefs.get("nvflex", {}).get("bnvflexenable", "0") == "1":
+			flex_ba2_path = self.find_data_file("Fallout4 - Nvflex.ba2")
+			if flex_ba2_path is not None:
+				archive_paths[flex_ba2_path] = None
+			else:
+				self.problems.append(
+					SimpleProblemInfo(
+						"Fallout4 - Nvflex.ba2",
+						ProblemType.FileNotFound,
+						"Nvidia Flex is enabled in your game INIs (bNVFlexEnable=1) but the Nvflex BA2 is missing.",
+						SolutionType.VerifyFiles,
+					),
+				)
+
+		self.game.archives_enabled = set(archive_paths)
+		archive_paths_list = list(archive_paths)
+		for ba2_file, header in zip(
+			archive_paths_list,
+			self.header_cache.get_archives(archive_paths_list, self.header_workers),
+			strict=True,
+		):
+			if header is None:
+				self.game.archives_unreadable.add(ba2_file)
+				self.problems.append(
+					ProblemInfo(
+						ProblemType.InvalidArchive,
+						ba2_file,
+						Path(ba2_file.name),
+						"OVERVIEW",
+						"Failed to read archive due to permissions or the file is missing.",
+						None,
+					),
+				)
+				continue
+
+			if not header["btdx"]:
+				self.game.archives_unreadable.add(ba2_file)
+				self.problems.append(
+					ProblemInfo(
+						ProblemType.InvalidArchive,
+						ba2_file,
+						Path(ba2_file.name),
+						"OVERVIEW",
+						"Archive is either corrupt or not in Bethesda Archive 2 format.",
+						None,
+					),
+				)
+				continue
+
+			match header["version"]:
+				case ArchiveVersion.OG:
+					is_ng = False
+
+				case ArchiveVersion.NG7 | ArchiveVersion.NG:
+					is_ng = True
+
+				case _:
+					self.game.archives_unreadable.add(ba2_file)
+					# TODO: Report known wrong versions
+					self.problems.append(
+						ProblemInfo(
+							ProblemType.InvalidArchive,
+							ba2_file,
+							Path(ba2_file.name),
+							"OVERVIEW",
+							f"Archive version ({header['version']}) is not valid for Fallout 4.",
+							None,
+						),
+					)
+					continue
+
+			match header["format"].encode("latin-1"):
+				case Magic.GNRL:
+					self.game.ba2_count_gnrl += 1
+					# self.game.archives_gnrl.add(ba2_file)
+
+				case Magic.DX10:
+					self.game.ba2_count_dx10 += 1
+					# self.game.archives_dx10.add(ba2_file)
+
+				case _:
+					self.game.archives_unreadable.add(ba2_file)
+					self.problems.append(
+						ProblemInfo(
+							ProblemType.InvalidArchive,
+							ba2_file,
+							Path(ba2_file.name),
+							"OVERVIEW",
+							f"Archive format ({header['format']}) is not valid for Fallout 4.",
+							None,
+						),
+					)
+					continue
+
+			if is_ng:
+				self.game.archives_ng.add(ba2_file)
+			else:
+				self.game.archives_og.add(ba2_file)
+
+	def get_info_modules(self) -> None:
+		logger.debug("Gathering Info: Modules")
+		self.game.reset_modules()
+
+		data_path = self.game.data_path
+		if data_path is None:
+			self.problems.append(
+				SimpleProblemInfo(
+					"Data",
+					ProblemType.FileNotFound,
+					"The Data folder was not found in your game install path.",
+					SolutionType.VerifyFiles,
+				),
+			)
+			return
+
+		self.game.modules_enabled = [master_path for master in GAME_MASTERS if (master_path := self.find_data_file(master))]
+
+		ccc_path = self.game.game_path / "Fallout4.ccc"
+		if is_file(ccc_path):
+			self.game.modules_enabled.extend([
+				cc_path for cc in ccc_path.read_text("utf-8").splitlines() if (cc_path := self.find_data_file(cc))
+			])
+		else:
+			self.problems.append(
+				SimpleProblemInfo(
+					"Fallout4.ccc",
+					ProblemType.FileNotFound,
+					"The CC list file was not found in your game install path.\nThis is used to detect which CC modules/archives may be enabled.",
+					SolutionType.VerifyFiles,
+				),
+			)
+			self.warnings.append(
+				f"{ccc_path.name} not found.\nCC files may not be detected. Verifying Steam files or reinstalling should fix this.",
+			)
+
+		plugins_path = get_plugins_path(self.game.manager)
+		try:
+			plugins_content = plugins_path.read_text("utf-8")
+		except (PermissionError, FileNotFoundError):
+			self.problems.append(
+				SimpleProblemInfo(
+					plugins_path.name,
+					ProblemType.FileNotFound,
+					"plugins.txt was not found.\nThis is used to detect which modules/archives are enabled.",
+					"N/A" if self.game.manager else "Launch this app with your mod manager.",
+				),
+			)
+			self.warnings.append(
+				"plugins.txt not found.\nEnable state of plugins can't be detected.\nCounts will reflect all modules/archives in Data, which is likely higher than your actual counts.",
+			)
+			current_plugins = self.game.modules_enabled.copy()
+			self.game.modules_enabled.extend([
+				p for p in data_path.iterdir() if p.suffix.lower() in {".esp", ".esl", ".esm"} and p not in current_plugins
+			])
+		else:
+			self.game.modules_enabled.extend([
+				plugin_path
+				for plugin in plugins_content.splitlines()
+				if plugin.startswith("*") and (plugin_path := self.find_data_file(plugin[1:]))
+			])
+
+		for module_path, header in zip(
+			self.game.modules_enabled,
+			self.header_cache.get_modules(self.game.modules_enabled, self.header_workers),
+			strict=True,
+		):
+			if header is None:
+				self.game.modules_unreadable.add(module_path)
+				self.problems.append(
+					ProblemInfo(
+						ProblemType.InvalidModule,
+						module_path,
+						Path(module_path.name),
+						"OVERVIEW",
+						"Failed to read module due to permissions or the file is missing.",
+						None,
+					),
+				)
+				continue
+
+			self.game.module_headers[module_path] = header
+			if not header["tes4"]:
+				self.game.modules_unreadable.add(module_path)
+				self.problems.append(
+					ProblemInfo(
+						ProblemType.InvalidModule,
+						module_path,
+						Path(module_path.name),
+						"OVERVIEW",
+						"Module is either corrupt or not in TES4 format.",
+						None,
+					),
+				)
+				continue
+
+			if header["hedr"] is None:
+				self.game.modules_unreadable.add(module_path)
+				continue
+
+			hedr_version = bytes.fromhex(header["hedr"])
+			if hedr_version == MODULE_VERSION_95:
+				self.game.modules_hedr_95.add(module_path)
+			elif hedr_version == MODULE_VERSION_1:
+				self.game.module_count_v1 += 1
+			else:
+				hedr = round(struct.unpack("<f", hedr_version)[0], 2)
+				valid_games = [g for g, v in MODULE_VERSION_SUPPORT.items() if str(hedr) in v]
+				valid_games_str = (f"\nGames supporting v{hedr}: " + ", ".join(valid_games)) if valid_games else ""
+				self.game.modules_hedr_unknown[module_path] = hedr
+				self.problems.append(
+					ProblemInfo(
+						ProblemType.InvalidModule,
+						module_path,
+						Path(module_path.name),
+						"OVERVIEW",
+						f"Module version ({hedr}) is not valid for Fallout 4.{valid_games_str}",
+						"It may be possible to open/resave this file with Creation Kit to update its format for Fallout 4.\nYou should compare the original and resaved files with xEdit to verify no undesired changes were made.",
+					),
+				)
+
+			if header["flags"] & ModuleFlag.Light or module_path.suffix.lower() == ".esl":
+				self.game.module_count_light += 1
+			else:
+				self.game.module_count_full += 1
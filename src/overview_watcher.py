@@ -0,0 +1,86 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import logging
+import threading
+from pathlib import Path
+
+from utils import stat_paths
+
+logger = logging.getLogger(__name__)
+
+WATCH_INTERVAL = 2.0
+"""Seconds between polls. Each poll is a stat of a handful of paths."""
+
+
+class OverviewWatcher:
+	"""Polls the files that decide Overview's results on a background thread, and sets changed when they're modified.
+
+	Only the paths given are stat-ed, never read. Changes are reported once the paths stop changing for a poll,
+	so a burst of writes, such as MO2 saving plugins.txt and the INIs together, only causes one refresh.
+	"""
+
+	def __init__(self, paths: list[Path], interval: float = WATCH_INTERVAL) -> None:
+		self.paths = paths
+		self.interval = interval
+		self.changed = threading.Event()
+		"""Set by the watcher thread. The GUI clears it when it refreshes."""
+		self._stop_event: threading.Event | None = None
+		self._thread: threading.Thread | None = None
+
+	@property
+	def running(self) -> bool:
+		return self._thread is not None
+
+	def start(self) -> None:
+		if self._thread is not None:
+			return
+		# A new event for each thread, so a thread that's still waiting after stop() never resumes.
+		self._stop_event = threading.Event()
+		# Daemon so closing the app never waits for a poll.
+		self._thread = threading.Thread(
+			target=self._watch,
+			args=(self._stop_event,),
+			name="overview-watcher",
+			daemon=True,
+		)
+		self._thread.start()
+		logger.info("Overview Watcher : Watching %s paths every %ss", len(self.paths), self.interval)
+
+	def stop(self) -> None:
+		if self._thread is None or self._stop_event is None:
+			return
+		self._stop_event.set()
+		self._stop_event = None
+		self._thread = None
+		logger.info("Overview Watcher : Stopped")
+
+	def _watch(self, stop_event: threading.Event) -> None:
+		snapshot = stat_paths(self.paths)
+		settling = False
+		while not stop_event.wait(self.interval):
+			new_snapshot = stat_paths(self.paths)
+			if new_snapshot != snapshot:
+				# Wait for a poll without changes before reporting.
+				snapshot = new_snapshot
+				settling = True
+			elif settling:
+				settling = False
+				logger.debug("Overview Watcher : Changes detected")
+				self.changed.set()
@@ -0,0 +1,134 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import re
+from bisect import bisect_right
+from itertools import chain
+from operator import attrgetter
+
+from helpers import ProblemInfo, SimpleProblemInfo
+
+type Problem = ProblemInfo | SimpleProblemInfo
+
+get_mod = attrgetter("mod")
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+"""Words and numbers in a path, split at separators, spaces, dots, and underscores."""
+
+
+def get_tokens(text: str) -> list[str]:
+	return TOKEN_PATTERN.findall(text.casefold())
+
+
+class ResultIndex:
+	"""Scan results by problem type, sorted by mod in the order they arrived, by mod, and by path token.
+
+	Each batch is grouped in one pass, sorted, and merged into the existing results of each type in one linear pass
+	over the results after its first insertion point. Batches that sort after everything already added are appended.
+	"""
+
+	def __init__(self) -> None:
+		self.problems: list[Problem] = []
+		"""All results in the order they arrived."""
+		self.by_type: dict[str, list[Problem]] = {}
+		"""Results of each problem type, sorted by mod. Types are in the order they were first found."""
+		self.by_mod: dict[str, list[Problem]] = {}
+		self.by_token: dict[str, list[Problem]] = {}
+		"""Results whose Data-relative path contains each token, casefolded."""
+		self._type_mods: dict[str, list[str]] = {}
+		"""Mod of each result in by_type, for merging new results."""
+
+	def __len__(self) -> int:
+		return len(self.problems)
+
+	def clear(self) -> None:
+		self.problems.clear()
+		self.by_type.clear()
+		self.by_mod.clear()
+		self.by_token.clear()
+		self._type_mods.clear()
+
+	def add(self, problems: list[Problem]) -> dict[str, list[int]]:
+		"""Add a batch of results. Returns the new index of each added result in by_type, in ascending order per type."""
+		self.problems.extend(problems)
+		batches: dict[str, list[Problem]] = {}
+		for problem in problems:
+			batches.setdefault(problem.type, []).append(problem)
+			self.by_mod.setdefault(problem.mod, []).append(problem)
+			for token in dict.fromkeys(get_tokens(str(problem.relative_path))):
+				self.by_token.setdefault(token, []).append(problem)
+
+		added: dict[str, list[int]] = {}
+		for problem_type, batch in batches.items():
+			# Stable, so results from the same mod stay in the order they arrived.
+			batch.sort(key=get_mod)
+			type_problems = self.by_type.setdefault(problem_type, [])
+			type_mods = self._type_mods.setdefault(problem_type, [])
+			indexes = added[problem_type] = []
+			if not type_problems or type_mods[-1] <= batch[0].mod:
+				indexes.extend(range(len(type_problems), len(type_problems) + len(batch)))
+				type_problems.extend(batch)
+				type_mods.extend(map(get_mod, batch))
+				continue
+
+			# Results before the first insertion point don't move. The rest are merged with the batch and written back
+			# in place, as result groups share the lists in by_type.
+			start = bisect_right(type_mods, batch[0].mod)
+			tail_problems = type_problems[start:]
+			tail_mods = type_mods[start:]
+			merged_problems: list[Problem] = []
+			merged_mods: list[str] = []
+			tail_index = 0
+			for problem in batch:
+				# Existing results of the same mod stay ahead of new ones.
+				next_index = bisect_right(tail_mods, problem.mod, tail_index)
+				merged_problems.extend(tail_problems[tail_index:next_index])
+				merged_mods.extend(tail_mods[tail_index:next_index])
+				tail_index = next_index
+				indexes.append(start + len(merged_problems))
+				merged_problems.append(problem)
+				merged_mods.append(problem.mod)
+			merged_problems.extend(tail_problems[tail_index:])
+			merged_mods.extend(tail_mods[tail_index:])
+			type_problems[start:] = merged_problems
+			type_mods[start:] = merged_mods
+		return added
+
+	def search(self, query: str) -> set[Problem] | None:
+		"""Results matching every word of query in their path, mod, or problem type, or None if query has no words.
+
+		Words match anywhere inside a token, so "arm" finds "Armor", and "dds" finds every DDS file.
+		"""
+		terms = dict.fromkeys(get_tokens(query))
+		if not terms:
+			return None
+
+		matches: set[Problem] | None = None
+		for term in terms:
+			term_matches: set[Problem] = set()
+			for token, problems in self.by_token.items():
+				if term in token:
+					term_matches.update(problems)
+			for name, problems in chain(self.by_mod.items(), self.by_type.items()):
+				if term in name.casefold():
+					term_matches.update(problems)
+			matches = term_matches if matches is None else matches & term_matches
+			if not matches:
+				break
+		return matches
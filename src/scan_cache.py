@@ -0,0 +1,346 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, NotRequired, TypedDict
+
+from enums import ProblemType, SolutionType
+from globals import ARCHIVE_NAME_WHITELIST, F4SE_CRC
+from helpers import ProblemInfo, SimpleProblemInfo
+from scan_settings import DATA_WHITELIST, JUNK_FILE_SUFFIXES, JUNK_FILES, PROPER_FORMATS, ScanSetting
+from utils import is_file, list_dir
+
+if TYPE_CHECKING:
+	from game_info import GameInfo
+	from scan_settings import ModFiles, ScanSettings
+
+logger = logging.getLogger(__name__)
+
+SCAN_CACHE_PATH = Path("scan_cache.json")
+SCAN_CACHE_VERSION = 1
+
+VOLATILE_ROOTS = {".", "complex sorter"}
+"""Results for these Data folders depend on more than the folder listing and are never reused.
+"." is Data itself (archive names depend on load order). Complex Sorter results depend on INI contents."""
+
+
+class CachedProblem(TypedDict):
+	type: str
+	path: str
+	relative_path: str
+	mod: str | None
+	summary: str
+	solution: str | None
+	extra_data: list[str] | None
+
+
+class CachedFolder(TypedDict):
+	mtime: int
+	folders: list[str]
+	files: list[str]
+	kept: NotRequired[list[str]]
+	"""Folders that were descended into after checks were run."""
+	signature: NotRequired[str]
+	"""Hash of the mod providing each entry, so results are rerun if any file changes mods."""
+	problems: NotRequired[list[CachedProblem]]
+
+
+class CachedResults(TypedDict):
+	kept: list[str]
+	problems: list[CachedProblem]
+
+
+class ScanCacheDict(TypedDict):
+	version: int
+	key: str
+	data: dict[str, CachedFolder]
+	mods: dict[str, dict[str, CachedFolder]]
+	stage: NotRequired[dict[str, CachedResults]]
+	"""Results of folders built from staged mods, by folder path and a hash of its entries and the mods providing them."""
+
+
+def _problem_to_dict(problem: ProblemInfo) -> CachedProblem:
+	return {
+		"type": problem.type,
+		"path": str(problem.path),
+		"relative_path": str(problem.relative_path),
+		"mod": problem.mod,
+		"summary": problem.summary,
+		"solution": problem.solution,
+		"extra_data": problem.extra_data,
+	}
+
+
+def _problem_from_dict(cached: CachedProblem) -> ProblemInfo:
+	solution = cached["solution"]
+	if solution is not None and solution in SolutionType:
+		solution = SolutionType(solution)
+	return ProblemInfo(
+		ProblemType(cached["type"]),
+		Path(cached["path"]),
+		Path(cached["relative_path"]),
+		cached["mod"],
+		cached["summary"],
+		solution,
+		extra_data=cached["extra_data"],
+	)
+
+
+class ListingCache:
+	"""Serves folder listings from a previous scan for folders whose mtime hasn't changed.
+
+	A folder's mtime changes when entries are added, removed, or renamed in it, but not when
+	entries in its subfolders change, so every folder is still checked individually.
+	"""
+
+	def __init__(self, root: Path, old_entries: dict[str, CachedFolder], *, enabled: bool) -> None:
+		self.root = root
+		self.enabled = enabled
+		self.old_entries = old_entries
+		self.entries: dict[str, CachedFolder] = {}
+		"""Folders visited this scan. Only these are saved, so removed folders are pruned."""
+		self.hits = 0
+
+	def relative_key(self, path: Path) -> str:
+		return path.relative_to(self.root).as_posix()
+
+	def list_dir(self, path: Path) -> tuple[list[str], list[str]] | None:
+		if not self.enabled:
+			return list_dir(path)
+
+		try:
+			mtime = path.stat().st_mtime_ns
+		except OSError:
+			return None
+
+		key = self.relative_key(path)
+		old_entry = self.old_entries.get(key)
+		if old_entry is not None and old_entry["mtime"] == mtime:
+			self.hits += 1
+			entry: CachedFolder = {"mtime": mtime, "folders": old_entry["folders"], "files": old_entry["files"]}
+		else:
+			# mtime is read before listing so a change during the listing is caught next scan.
+			listing = list_dir(path)
+			if listing is None:
+				return None
+			entry = {"mtime": mtime, "folders": listing[0].copy(), "files": listing[1].copy()}
+
+		self.entries[key] = entry
+		return entry["folders"].copy(), entry["files"].copy()
+
+
+class ScanCache:
+	"""On-disk index of Data and staged mod folders from the last scan, saved next to settings.json.
+
+	Listings are reused for any folder whose mtime is unchanged. Problems found in a folder are
+	reused only if the scan settings, rules, and the mods providing the folder's entries also match.
+	Folders built from staged mods are keyed by their entries and the mod folders providing them,
+	so their problems are reused for any profile with the same folder.
+	"""
+
+	def __init__(self, scan_settings: "ScanSettings", game: "GameInfo", data_path: Path) -> None:
+		self.enabled = scan_settings.use_cache
+		self.key = self._get_key(scan_settings, game, data_path)
+		old_data: dict[str, CachedFolder] = {}
+		self.old_mods: dict[str, dict[str, CachedFolder]] = {}
+		self.old_stage: dict[str, CachedResults] = {}
+
+		if self.enabled and is_file(SCAN_CACHE_PATH):
+			try:
+				cache_content: ScanCacheDict = json.loads(SCAN_CACHE_PATH.read_text("utf-8"))
+				if not isinstance(cache_content, dict):  # type: ignore[reportUnnecessaryIsInstance]
+					raise ValueError  # noqa: TRY004
+			except:
+				logger.exception("Scan Cache : Failed to load %s. It will be rebuilt.", SCAN_CACHE_PATH.name)
+			else:
+				if cache_content.get("version") != SCAN_CACHE_VERSION:
+					logger.info("Scan Cache : Version changed. It will be rebuilt.")
+				else:
+					old_data = cache_content.get("data", {})
+					self.old_mods = cache_content.get("mods", {})
+					if cache_content.get("key") != self.key:
+						# Listings are still valid, only results need rerunning.
+						logger.info("Scan Cache : Scan settings changed. Results will be rescanned.")
+						for entry in old_data.values():
+							entry.pop("problems", None)
+					else:
+						self.old_stage = cache_content.get("stage", {})
+
+		self.data = ListingCache(data_path, old_data, enabled=self.enabled)
+		self.mods: dict[str, ListingCache] = {}
+		self.stage: dict[str, CachedResults] = {}
+		"""Staged folder results used this scan. Only these are saved."""
+		self.problem_hits = 0
+
+	@staticmethod
+	def _get_key(scan_settings: "ScanSettings", game: "GameInfo", data_path: Path) -> str:
+		"""Hash of everything besides folder contents that scan results depend on."""
+		key_data = {
+			"data_path": str(data_path),
+			"stage_path": str(scan_settings.manager.stage_path) if scan_settings.manager else None,
+			"settings": sorted(setting.name for setting in ScanSetting if scan_settings[setting]),
+			"skip_directories": sorted(scan_settings.skip_directories),
+			"skip_file_suffixes": sorted(scan_settings.skip_file_suffixes),
+			"data_whitelist": {k: sorted(v) if v else None for k, v in DATA_WHITELIST.items()},
+			"junk_files": sorted(JUNK_FILES),
+			"junk_file_suffixes": sorted(JUNK_FILE_SUFFIXES),
+			"proper_formats": PROPER_FORMATS,
+			"archive_whitelist": ARCHIVE_NAME_WHITELIST,
+			"ba2_suffixes": game.ba2_suffixes,
+			"f4se_scripts": sorted(F4SE_CRC),
+		}
+		return hashlib.sha1(json.dumps(key_data, sort_keys=True).encode(), usedforsecurity=False).hexdigest()
+
+	def mod(self, mod_path: Path) -> ListingCache:
+		"""Listing cache for a single staged mod folder. Each mod is keyed separately."""
+		key = str(mod_path)
+		if key not in self.mods:
+			self.mods[key] = ListingCache(mod_path, self.old_mods.get(key, {}), enabled=self.enabled)
+		return self.mods[key]
+
+	@staticmethod
+	def is_volatile(key: str) -> bool:
+		return key.split("/", 1)[0].lower() in VOLATILE_ROOTS
+
+	@staticmethod
+	def _get_signature(mod_files: "ModFiles", relative_path: Path, folders: list[str], files: list[str]) -> str:
+		if not (mod_files.files or mod_files.folders):
+			return ""
+		mods = [mod_files.folders.get_mod(relative_path)]
+		mods.extend(mod_files.folders.get_mod(relative_path / folder) for folder in folders)
+		mods.extend(mod_files.files.get_mod(relative_path / file) for file in files)
+		return hashlib.sha1("\n".join(mods).encode(), usedforsecurity=False).hexdigest()
+
+	def get_problems(
+		self,
+		current_path: Path,
+		folders: list[str],
+		files: list[str],
+		mod_files: "ModFiles",
+	) -> list[ProblemInfo | SimpleProblemInfo] | None:
+		"""Return the problems from the last scan if still valid, and prune folders as that scan did.
+
+		Returns None if checks must be run. Call set_problems() afterward to store the results.
+		"""
+		if not self.enabled:
+			return None
+
+		key = self.data.relative_key(current_path)
+		entry = self.data.entries.get(key)
+		if entry is None:
+			return None
+
+		relative_path = current_path.relative_to(self.data.root)
+		entry["signature"] = self._get_signature(mod_files, relative_path, folders, files)
+
+		if self.is_volatile(key):
+			return None
+
+		old_entry = self.data.old_entries.get(key)
+		if (
+			old_entry is None
+			or old_entry["mtime"] != entry["mtime"]
+			or old_entry.get("signature") != entry["signature"]
+			or "problems" not in old_entry
+			or "kept" not in old_entry
+		):
+			return None
+
+		self.problem_hits += 1
+		entry["kept"] = old_entry["kept"]
+		entry["problems"] = old_entry["problems"]
+		folders[:] = old_entry["kept"]
+		return [_problem_from_dict(p) for p in old_entry["problems"]]
+
+	def set_problems(self, current_path: Path, kept_folders: list[str], problems: list[ProblemInfo | SimpleProblemInfo]) -> None:
+		if not self.enabled:
+			return
+
+		key = self.data.relative_key(current_path)
+		entry = self.data.entries.get(key)
+		if entry is None or self.is_volatile(key):
+			return
+		entry["kept"] = kept_folders.copy()
+		entry["problems"] = [_problem_to_dict(p) for p in problems if isinstance(p, ProblemInfo)]
+
+	def get_stage_problems(
+		self,
+		folder_key: tuple[Path, bytes],
+		folders: list[str],
+	) -> list[ProblemInfo | SimpleProblemInfo] | None:
+		"""Return the problems from the last scan of a folder built from staged mods, and prune folders as it did.
+
+		folder_key is from DataScanner.get_folder_key(). Returns None if checks must be run.
+		Call set_stage_problems() afterward to store the results.
+		"""
+		if not self.enabled:
+			return None
+
+		key = self._stage_key(folder_key)
+		entry = self.stage.get(key) or self.old_stage.get(key)
+		if entry is None:
+			return None
+
+		self.problem_hits += 1
+		self.stage[key] = entry
+		folders[:] = entry["kept"]
+		return [_problem_from_dict(p) for p in entry["problems"]]
+
+	def set_stage_problems(
+		self,
+		folder_key: tuple[Path, bytes],
+		kept_folders: list[str],
+		problems: list[ProblemInfo | SimpleProblemInfo],
+	) -> None:
+		if not self.enabled or self.is_volatile(folder_key[0].as_posix()):
+			return
+		self.stage[self._stage_key(folder_key)] = {
+			"kept": kept_folders.copy(),
+			"problems": [_problem_to_dict(p) for p in problems if isinstance(p, ProblemInfo)],
+		}
+
+	@staticmethod
+	def _stage_key(folder_key: tuple[Path, bytes]) -> str:
+		return f"{folder_key[0].as_posix()}:{folder_key[1].hex()}"
+
+	def save(self) -> None:
+		if not self.enabled:
+			return
+
+		logger.info(
+			"Scan Cache : %s/%s folder listings reused, %s folder results reused",
+			self.data.hits + sum(m.hits for m in self.mods.values()),
+			len(self.data.entries) + sum(len(m.entries) for m in self.mods.values()),
+			self.problem_hits,
+		)
+		cache_content: ScanCacheDict = {
+			"version": SCAN_CACHE_VERSION,
+			"key": self.key,
+			"data": self.data.entries,
+			"mods": {k: m.entries for k, m in self.mods.items()},
+			"stage": self.stage,
+		}
+		try:
+			with SCAN_CACHE_PATH.open("w", encoding="utf-8") as f:
+				json.dump(cache_content, f, separators=(",", ":"))
+		except:
+			logger.exception("Scan Cache : Failed to save %s", SCAN_CACHE_PATH.name)
@@ -0,0 +1,341 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import logging
+from collections.abc import Callable
+from enum import Enum
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from complex_sorter import uses_outdated_field
+from enums import ProblemType, SolutionType
+from globals import ARCHIVE_NAME_WHITELIST, F4SE_CRC
+from helpers import ProblemInfo
+from scan_settings import DATA_WHITELIST, JUNK_FILE_SUFFIXES, JUNK_FILES, PROPER_FORMATS, ScanSetting
+from scan_stats import RuleStats
+
+if TYPE_CHECKING:
+	from game_info import GameInfo
+	from scan_settings import ScanSettings
+	from scan_stats import ScanStats
+
+logger = logging.getLogger(__name__)
+
+
+class EntryKind(Enum):
+	DataFolder = "Data Folder"
+	"""A folder directly in Data, such as Meshes. Checked before it is descended into."""
+	Folder = "Folder"
+	"""Any subfolder of a DataFolder. Pruned from the walk if a rule matches."""
+	File = "File"
+
+
+class FolderInfo:
+	"""The Data folder being scanned, shared by the rules run on each of its entries."""
+
+	def __init__(
+		self,
+		game: "GameInfo",
+		data_path: Path,
+		current_path: Path,
+		files: list[str],
+		stats: "ScanStats | None" = None,
+	) -> None:
+		self.game = game
+		self.stats = stats
+		self.path = current_path
+		self.relative_path = current_path.relative_to(data_path)
+		self.data_root_lower = self.relative_path.parts[0].lower() if self.relative_path.parts else "Data"
+		self.is_data_root = current_path.parent == data_path
+		"""This folder is directly in Data."""
+		self.files = files
+		self._files_lower: set[str] | None = None
+
+	@property
+	def files_lower(self) -> set[str]:
+		"""Names of files in this folder for sibling checks, built on first use."""
+		if self._files_lower is None:
+			self._files_lower = {f.lower() for f in self.files}
+		return self._files_lower
+
+
+class EntryInfo:
+	"""A folder or file being checked, with the mod providing it."""
+
+	def __init__(self, name: str, name_lower: str, path: Path, relative_path: Path, mod_name: str, mod_path: Path) -> None:
+		self.name = name
+		self.name_lower = name_lower
+		self.path = path
+		self.relative_path = relative_path
+		self.mod_name = mod_name
+		self.mod_path = mod_path
+		"""Full path in the mod's staging folder, or in Data if unmanaged."""
+
+		stem, dot, ext = name_lower.rpartition(".")
+		self.stem_lower = stem if dot else name_lower
+		self.ext = ext if dot else ""
+		"""Lowercase with no dot. Empty if the name has no extension."""
+
+
+type RuleCheck = Callable[[FolderInfo, EntryInfo], ProblemInfo | None]
+
+
+class Rule:
+	"""A single scanner check, run only on entries matching its kind, data roots, and extensions."""
+
+	def __init__(
+		self,
+		name: str,
+		setting: ScanSetting,
+		kind: EntryKind,
+		check: RuleCheck,
+		roots: set[str] | None,
+		extensions: set[str] | None,
+	) -> None:
+		self.name = name
+		self.setting = setting
+		self.kind = kind
+		self.check = check
+		self.roots = roots
+		"""Lowercase data root folders this rule applies to, or None for all."""
+		self.extensions = extensions
+		"""Lowercase extensions with no dot this rule applies to, or None for all."""
+		self.hits = 0
+		self.time = 0.0
+
+	def run(self, folder: FolderInfo, entry: EntryInfo) -> ProblemInfo | None:
+		start = perf_counter()
+		problem = self.check(folder, entry)
+		self.time += perf_counter() - start
+		if problem is not None:
+			self.hits += 1
+		return problem
+
+
+RULES: list[Rule] = []
+"""Every registered rule. For each entry, rules run in this order until one reports a problem."""
+
+
+def rule(
+	name: str,
+	setting: ScanSetting,
+	kind: EntryKind,
+	*,
+	roots: set[str] | None = None,
+	extensions: set[str] | None = None,
+) -> Callable[[RuleCheck], RuleCheck]:
+	"""Register a check function as a rule."""
+
+	def register(check: RuleCheck) -> RuleCheck:
+		RULES.append(Rule(name, setting, kind, check, roots, extensions))
+		return check
+
+	return register
+
+
+class RuleSet:
+	"""Dispatch table of the enabled rules, built once per scan.
+
+	Rules are indexed by kind, data root, and extension so each entry only runs the rules that can match it.
+	"""
+
+	def __init__(self, scan_settings: "ScanSettings") -> None:
+		self.rules = [r for r in RULES if scan_settings[r.setting]]
+		for r in self.rules:
+			r.hits = 0
+			r.time = 0.0
+		self._index: dict[tuple[EntryKind, str | None, str | None], list[Rule]] = {}
+		for r in self.rules:
+			for root in r.roots or (None,):
+				for ext in r.extensions or (None,):
+					self._index.setdefault((r.kind, root, ext), []).append(r)
+		self._dispatch: dict[tuple[EntryKind, str, str], tuple[Rule, ...]] = {}
+
+	def get(self, kind: EntryKind, data_root_lower: str, ext: str = "") -> tuple[Rule, ...]:
+		"""Rules that can match an entry, in registration order."""
+		key = (kind, data_root_lower, ext)
+		rules = self._dispatch.get(key)
+		if rules is None:
+			matched: set[Rule] = set()
+			for root in (None, data_root_lower):
+				for rule_ext in (None, ext):
+					matched.update(self._index.get((kind, root, rule_ext), ()))
+			rules = self._dispatch[key] = tuple(r for r in self.rules if r in matched)
+		return rules
+
+	def get_stats(self) -> list[RuleStats]:
+		"""Hits and time of each rule this scan, slowest first."""
+		return [
+			RuleStats(name=r.name, hits=r.hits, seconds=r.time) for r in sorted(self.rules, key=lambda r: r.time, reverse=True)
+		]
+
+
+@rule("Junk Folder", ScanSetting.JunkFiles, EntryKind.DataFolder, roots={"fomod"})
+def junk_folder(_folder: FolderInfo, entry: EntryInfo) -> ProblemInfo | None:
+	return ProblemInfo(
+		ProblemType.JunkFile,
+		entry.mod_path,
+		entry.relative_path,
+		entry.mod_name,
+		"This is a junk folder not used by the game or mod managers.",
+		SolutionType.DeleteOrIgnoreFolder,
+	)
+
+
+@rule("Loose Previs Folder", ScanSetting.LoosePrevis, EntryKind.DataFolder, roots={"vis"})
+def loose_previs_vis(_folder: FolderInfo, entry: EntryInfo) -> ProblemInfo | None:
+	return ProblemInfo(
+		ProblemType.LoosePrevis,
+		entry.mod_path,
+		entry.relative_path,
+		entry.mod_name,
+		"Loose previs files should be archived so they only win conflicts according to their plugin's load order.\nLoose previs files are also not supported by PJM's Previs Scripts.",
+		SolutionType.ArchiveOrDeleteFolder,
+	)
+
+
+@rule("Loose Precombined Folder", ScanSetting.LoosePrevis, EntryKind.Folder, roots={"meshes"})
+def loose_previs_precombined(_folder: FolderInfo, entry: EntryInfo) -> ProblemInfo | None:
+	if entry.name_lower != "precombined":
+		return None
+	return ProblemInfo(
+		ProblemType.LoosePrevis,
+		entry.mod_path,
+		entry.relative_path,
+		entry.mod_name,
+		"Loose previs files should be archived so they only win conflicts according to their plugin's load order.\nLoose previs files are also not supported by PJM's Previs Scripts.",
+		SolutionType.ArchiveOrDeleteFolder,
+	)
+
+
+@rule("AnimTextData Folder", ScanSetting.ProblemOverrides, EntryKind.Folder, roots={"meshes"})
+def anim_text_data_folder(_folder: FolderInfo, entry: EntryInfo) -> ProblemInfo | None:
+	if entry.name_lower != "animtextdata":
+		return None
+	return ProblemInfo(
+		ProblemType.AnimTextDataFolder,
+		entry.mod_path,
+		entry.relative_path,
+		entry.mod_name,
+		"The existence of unpacked AnimTextData may cause the game to crash.",
+		SolutionType.ArchiveOrDeleteFolder,
+	)
+
+
+@rule("Junk File", ScanSetting.JunkFiles, EntryKind.File)
+def junk_file(_folder: FolderInfo, entry: EntryInfo) -> ProblemInfo | None:
+	if entry.name_lower not in JUNK_FILES and not entry.name_lower.endswith(JUNK_FILE_SUFFIXES):
+		return None
+	return ProblemInfo(
+		ProblemType.JunkFile,
+		entry.mod_path,
+		entry.relative_path,
+		entry.mod_name,
+		"This is a junk file not used by the game or mod managers.",
+		SolutionType.DeleteOrIgnoreFile,
+	)
+
+
+@rule("F4SE Script Override", ScanSetting.ProblemOverrides, EntryKind.File, roots={"scripts"}, extensions={"pex"})
+def f4se_script_override(folder: FolderInfo, entry: EntryInfo) -> ProblemInfo | None:
+	if not (folder.is_data_root and entry.mod_name and entry.name_lower in F4SE_CRC):
+		return None
+	return ProblemInfo(
+		ProblemType.F4SEOverride,
+		entry.mod_path,
+		entry.relative_path,
+		entry.mod_name,
+		"This is an override of an F4SE script. This could break F4SE if they aren't the same version or this mod isn't intended to override F4SE files.",
+		"Check if this mod is supposed to override F4SE Scripts.\nIf this is a script extender/library or requires one, this is likely intentional but it must support your game version explicitly.\nOtherwise, this mod or file may need to be deleted.",
+	)
+
+
+@rule("Complex Sorter INI", ScanSetting.Errors, EntryKind.File, roots={"complex sorter"}, extensions={"ini"})
+def complex_sorter_ini(folder: FolderInfo, entry: EntryInfo) -> ProblemInfo | None:
+	if not uses_outdated_field(entry.mod_path, folder.stats):
+		return None
+	return ProblemInfo(
+		ProblemType.ComplexSorter,
+		entry.mod_path,
+		entry.relative_path,
+		entry.mod_name,
+		"INI uses an outdated field name. xEdit 4.1.5g changed the name of 'Addon Index' to 'Parent Combination Index'. Using outdated INIs with xEdit 4.1.5g+ results in broken output that may crash the game.",
+		SolutionType.ComplexSorterFix,
+	)
+
+
+@rule("Unexpected Format", ScanSetting.WrongFormat, EntryKind.File)
+def unexpected_format(folder: FolderInfo, entry: EntryInfo) -> ProblemInfo | None:
+	file_ext = entry.ext
+	if not file_ext:
+		return None
+	whitelist = DATA_WHITELIST.get(folder.data_root_lower)
+	if not (
+		(whitelist and file_ext not in whitelist) or (file_ext == "dll" and str(folder.relative_path).lower() != "f4se\\plugins")
+	):
+		return None
+
+	data_root_lower = folder.data_root_lower
+	if file_ext in PROPER_FORMATS:
+		proper_found = [
+			name for e in PROPER_FORMATS[file_ext] if (name := entry.path.with_suffix(f".{e}").name).lower() in folder.files_lower
+		]
+		if proper_found:
+			summary = f"Format not in whitelist for {data_root_lower}.\nA file with the expected format was found ({', '.join(proper_found)})."
+			solution = SolutionType.DeleteOrIgnoreFile
+		else:
+			summary = f"Format not in whitelist for {data_root_lower}.\nA file with the expected format was NOT found ({', '.join(PROPER_FORMATS[file_ext])})."
+			solution = SolutionType.ConvertDeleteOrIgnoreFile
+	else:
+		summary = f"Format not in whitelist for {data_root_lower}.\nUnable to determine whether the game will use this file."
+		solution = SolutionType.UnknownFormat
+
+	return ProblemInfo(
+		ProblemType.UnexpectedFormat,
+		entry.mod_path,
+		entry.relative_path,
+		entry.mod_name,
+		summary,
+		solution,
+	)
+
+
+@rule("Invalid Archive Name", ScanSetting.WrongFormat, EntryKind.File, extensions={"ba2"})
+def invalid_archive_name(folder: FolderInfo, entry: EntryInfo) -> ProblemInfo | None:
+	archives_enabled = folder.game.archives_enabled
+	# Overview finds archives in their mod's staging folder when Data isn't seen through MO2's VFS.
+	if entry.name_lower in ARCHIVE_NAME_WHITELIST or entry.path in archives_enabled or entry.mod_path in archives_enabled:
+		return None
+
+	ba2_name_split = entry.stem_lower.rsplit(" - ", 1)
+	if len(ba2_name_split) != 1 and ba2_name_split[1] in folder.game.ba2_suffixes:
+		return None
+	return ProblemInfo(
+		ProblemType.InvalidArchiveName,
+		entry.mod_path,
+		entry.relative_path,
+		entry.mod_name,
+		"This is not a valid archive name and won't be loaded by the game.",
+		SolutionType.RenameArchive,
+		extra_data=[
+			f"\nValid Suffixes: {', '.join(folder.game.ba2_suffixes)}",
+			f"Example: {ba2_name_split[0]} - Main.ba2",
+		],
+	)
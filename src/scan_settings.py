@@ -18,15 +18,18 @@
 
 
 from enum import Enum
+from os.path import normcase
+from pathlib import Path, PurePath
 from tkinter import *
 from typing import TYPE_CHECKING
 
 from globals import *
 
 if TYPE_CHECKING:
-	from pathlib import Path
+	from collections.abc import Iterable
 
-	from tabs._scanner import SidePane
+	from app_settings import AppSettings
+	from mod_manager_info import ModManagerInfo
 
 IGNORE_FOLDERS = {
 	"bodyslide",
@@ -106,16 +109,88 @@ class ScanSetting(Enum):
 	RaceSubgraphs = ("Race Subgraphs", TOOLTIP_SCAN_RACE_SUBGRAPHS)
 
 
+class ModFileIndex:
+	"""Maps paths relative to Data to the staged mod that provides them.
+
+	Paths are stored as normcased strings, so lookups are case-insensitive on Windows
+	like Path keys were, and mods as an index into the ModFiles mod table.
+	Full paths aren't stored and are only built for the entries that are looked up.
+	"""
+
+	__slots__ = ("_entries", "_mod_files")
+
+	def __init__(self, mod_files: "ModFiles") -> None:
+		self._mod_files = mod_files
+		self._entries: dict[str, int] = {}
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def __contains__(self, relative_path: PurePath | str) -> bool:
+		return normcase(relative_path) in self._entries
+
+	def add(self, key: str, mod_index: int) -> None:
+		"""Add or replace an entry. key must already be normcased."""
+		self._entries[key] = mod_index
+
+	def update(self, keys: "Iterable[str]", mod_index: int) -> None:
+		"""Add or replace entries for a mod. keys must already be normcased."""
+		self._entries.update(dict.fromkeys(keys, mod_index))
+
+	def get(self, relative_path: PurePath | str) -> tuple[str, Path] | None:
+		"""Return the name of the mod providing relative_path and the full path to it."""
+		mod_index = self._entries.get(normcase(relative_path))
+		if mod_index is None:
+			return None
+		return self._mod_files.mod_names[mod_index], self._mod_files.mod_paths[mod_index] / relative_path
+
+	def get_mod(self, relative_path: PurePath | str) -> str:
+		"""Return the name of the mod providing relative_path, or an empty string."""
+		mod_index = self._entries.get(normcase(relative_path))
+		if mod_index is None:
+			return ""
+		return self._mod_files.mod_names[mod_index]
+
+
 class ModFiles:
+	"""Which staged mod wins the conflict for each folder and file in Data."""
+
 	def __init__(self) -> None:
-		self.folders: dict[Path, tuple[str, Path]] = {}
-		self.files: dict[Path, tuple[str, Path]] = {}
-		self.modules: dict[str, tuple[str, Path]] = {}
-		self.archives: dict[str, tuple[str, Path]] = {}
+		self.mod_names: list[str] = []
+		self.mod_paths: list[Path] = []
+		self.folders = ModFileIndex(self)
+		self.files = ModFileIndex(self)
+		self.modules = ModFileIndex(self)
+		"""Plugins in the root of each mod, by file name."""
+		self.archives = ModFileIndex(self)
+		"""Archives in the root of each mod, by file name."""
+
+	def add_mod(self, mod_path: Path) -> int:
+		"""Add a mod to the mod table and return its index for ModFileIndex.add()."""
+		self.mod_names.append(mod_path.name)
+		self.mod_paths.append(mod_path)
+		return len(self.mod_paths) - 1
 
 
 class ScanSettings(dict[ScanSetting, bool]):
-	def __init__(self, side_pane: "SidePane") -> None:
+	def __init__(
+		self,
+		settings: "AppSettings",
+		enabled: dict[ScanSetting, bool],
+		manager: "ModManagerInfo | None",
+		*,
+		using_stage: bool,
+		read_stage: bool | None = None,
+		all_profiles: bool = False,
+		remember: bool = True,
+	) -> None:
+		"""If remember is set, enabled settings and read_stage are saved to settings.json for the next launch.
+
+		read_stage builds Data from MO2's staging folder instead of walking it through the VFS.
+		It defaults to scanner_read_stage in settings.json.
+		all_profiles scans every MO2 profile instead of only the selected one, always reading the staging folder.
+		Both require using_stage.
+		"""
 		super().__init__()
 
 		self.skip_data_scan = True
@@ -126,22 +201,35 @@ def __init__(self, side_pane: "SidePane") -> None:
 			ScanSetting.RaceSubgraphs,
 		}
 
-		settings = side_pane.scanner_tab.cmc.settings
 		resave = False
+		if read_stage is None:
+			read_stage = settings.dict["scanner_read_stage"]
+		elif remember and settings.dict["scanner_read_stage"] != read_stage:
+			settings.dict["scanner_read_stage"] = read_stage
+			resave = True
+
 		for setting in ScanSetting:
-			self[setting] = side_pane.bool_vars[setting].get()
+			self[setting] = enabled[setting]
 			if self[setting] and setting not in non_data:
 				self.skip_data_scan = False
 
 			name = str(f"scanner_{setting.name}")
-			if settings.dict[name] != self[setting]:
+			if remember and settings.dict[name] != self[setting]:
 				settings.dict[name] = self[setting]
 				resave = True
 		if resave:
 			settings.save()
 
-		self.manager = side_pane.scanner_tab.cmc.game.manager
-		self.using_stage = side_pane.scanner_tab.using_stage
+		self.walk_workers = max(1, settings.dict["scanner_walk_workers"])
+		"""Threads used to list Data folders and staged mods, and to read modules. 1 runs serially."""
+		self.use_cache: bool = settings.dict["scanner_cache"]
+		"""Reuse folder listings and results from the last scan for unchanged folders."""
+
+		self.manager = manager
+		self.using_stage = using_stage
+		uses_mo2_stage = using_stage and manager is not None and manager.name == "Mod Organizer"
+		self.read_stage = read_stage and uses_mo2_stage
+		self.all_profiles = all_profiles and uses_mo2_stage
 		if self.manager and self.manager.name == "Mod Organizer":
 			self.skip_file_suffixes = (*self.manager.skip_file_suffixes, ".vortex_backup")
 			self.skip_directories = IGNORE_FOLDERS.union(self.manager.skip_directories)
@@ -0,0 +1,94 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import logging
+import threading
+from collections import Counter
+from collections.abc import Generator
+from contextlib import contextmanager
+from time import perf_counter
+from typing import TypedDict
+
+logger = logging.getLogger(__name__)
+
+
+class RuleStats(TypedDict):
+	name: str
+	hits: int
+	seconds: float
+
+
+class ScanStats:
+	"""Timings and counts for each step of a scan, written to the log and shown under the Scanner's results."""
+
+	def __init__(self) -> None:
+		self.phases: dict[str, float] = {}
+		"""Seconds taken by each step, in the order they ran."""
+		self.folders = 0
+		"""Folders visited in Data."""
+		self.folders_reused = 0
+		"""Folders whose results were reused from scan_cache.json, or from another profile when scanning all profiles."""
+		self.files = 0
+		"""Files listed in Data."""
+		self.files_checked = 0
+		"""Files in Data that had at least one rule run on them."""
+		self.mods = 0
+		self.mod_files = 0
+		"""Files in all staged mods, including those that lose conflicts."""
+		self.bytes_read = 0
+		"""Bytes read from INIs and modules. Folder listings aren't counted."""
+		self.rules: list[RuleStats] = []
+		self.problems: Counter[str] = Counter()
+		"""Problems found of each type, including those reused from the cache and from Overview."""
+		self._lock = threading.Lock()
+
+	@contextmanager
+	def phase(self, name: str) -> Generator[None]:
+		start = perf_counter()
+		try:
+			yield
+		finally:
+			self.phases[name] = self.phases.get(name, 0.0) + perf_counter() - start
+
+	def add_bytes_read(self, count: int) -> None:
+		"""Safe to call from worker threads."""
+		with self._lock:
+			self.bytes_read += count
+
+	def get_lines(self) -> list[str]:
+		"""Human-readable summary for the log, the statistics area, and bug reports."""
+		total = sum(self.phases.values())
+		scan_seconds = self.phases.get("Data scan", 0.0)
+		lines = [f"{name}: {seconds:.3f}s" for name, seconds in self.phases.items()]
+		lines.append(f"Total: {total:.3f}s")
+		if self.mods:
+			lines.append(f"Staged mods: {self.mods} mods, {self.mod_files} files")
+		lines.extend([
+			f"Data folders: {self.folders} visited, {self.folders_reused} with results reused",
+			f"Data files: {self.files} listed, {self.files_checked} checked"
+			+ (f" ({self.files / scan_seconds:.0f} files/s)" if scan_seconds else ""),
+			f"Bytes read: {self.bytes_read:,}",
+		])
+		lines.extend(f"Rule {r['name']}: {r['hits']} problems in {r['seconds']:.3f}s" for r in self.rules)
+		lines.extend(f"Problems {problem_type}: {count}" for problem_type, count in self.problems.most_common())
+		return lines
+
+	def log(self) -> None:
+		for line in self.get_lines():
+			logger.info("Scan Stats : %s", line)
@@ -0,0 +1,440 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, repeat
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from complex_sorter import find_outdated_inis
+from enums import ProblemType, SolutionType, Tool
+from globals import INFO_SCAN_RACE_SUBGRAPHS, RACE_SUBGRAPH_THRESHOLD
+from helpers import ProblemInfo, SimpleProblemInfo
+from module_records import get_race_subgraph_count
+from scan_cache import ScanCache
+from scan_rules import EntryInfo, EntryKind, FolderInfo, RuleSet
+from scan_settings import DATA_WHITELIST, ModFiles, ScanSetting, ScanSettings
+from scan_stats import ScanStats
+from stage_index import ProfileView, StageIndex, get_profiles, get_stage_paths
+from utils import rglob, walk_parallel
+
+if TYPE_CHECKING:
+	import queue
+
+	from game_info import GameInfo
+
+logger = logging.getLogger(__name__)
+
+RESULT_BATCH_SIZE = 100
+RESULT_BATCH_SECONDS = 0.25
+
+type ScanUpdate = str | tuple[str, ...] | list[ProblemInfo | SimpleProblemInfo]
+"""The folders in Data when the walk starts, the name of each step or Data folder as it's reached, or a batch of problems."""
+
+
+class DataScanner:
+	"""Scans the game for problems without any GUI. Progress and problems are sent to queue_progress."""
+
+	def __init__(
+		self,
+		game: "GameInfo",
+		overview_problems: list[ProblemInfo | SimpleProblemInfo],
+		scan_settings: ScanSettings,
+		queue_progress: "queue.Queue[ScanUpdate]",
+	) -> None:
+		self.game = game
+		self.overview_problems = overview_problems
+		"""Problems found by the Overview tab, sent along with the scan's own if OverviewIssues is enabled."""
+		self.scan_settings = scan_settings
+		self.queue_progress = queue_progress
+		self.problem_batch: list[ProblemInfo | SimpleProblemInfo] = []
+		self.problem_batch_time = perf_counter()
+		self.stats = ScanStats()
+		self.cancel_event = threading.Event()
+
+	def cancel(self) -> None:
+		"""Stop the scan at the next folder or step. Safe to call from any thread."""
+		self.cancel_event.set()
+
+	@property
+	def cancelled(self) -> bool:
+		return self.cancel_event.is_set()
+
+	def get_stage_paths(self) -> list[Path]:
+		return get_stage_paths(self.scan_settings.manager)
+
+	def build_mod_file_list(self, scan_cache: ScanCache, stage_index: StageIndex | None = None) -> ModFiles:
+		"""Index the selected profile's staged mods. stage_index is used if given, so its listings can be reused."""
+		scan_settings = self.scan_settings
+		mod_files = ModFiles()
+		if not scan_settings.using_stage or not scan_settings.manager or scan_settings.manager.name != "Mod Organizer":
+			return mod_files
+
+		stage_paths = self.get_stage_paths()
+		if stage_index is None:
+			stage_index = StageIndex(scan_settings, scan_cache, self.cancel_event, keep_listings=False)
+		stage_index.add(stage_paths)
+		mod_files = stage_index.get_mod_files(stage_paths)
+
+		self.stats.mods = len(stage_paths)
+		self.stats.mod_files = sum(len(stage_index.mods[mod_path].file_keys) for mod_path in stage_paths)
+		scan_settings.mod_files = mod_files
+		return mod_files
+
+	def run(self) -> None:
+		"""Run each enabled step of the scan. Stops at the next folder or step once cancel() is called."""
+		data_path = self.game.data_path
+		if data_path is None:
+			return
+
+		self.run_steps(data_path)
+		self.put_problems([], flush=True)
+		if self.cancelled:
+			logger.info("Scanner : Cancelled")
+		self.stats.log()
+
+	def run_steps(self, data_path: Path) -> None:
+		scan_settings = self.scan_settings
+		if scan_settings[ScanSetting.Errors]:  # noqa: SIM102
+			if scan_settings.manager and Tool.ComplexSorter in scan_settings.manager.executables:
+				with self.stats.phase("Complex Sorter INIs"):
+					self.put_problems(self.find_complex_sorter_problems(scan_settings.manager.executables[Tool.ComplexSorter]))
+
+		if self.cancelled:
+			return
+
+		if scan_settings[ScanSetting.RaceSubgraphs]:
+			with self.stats.phase("Race Subgraphs"):
+				self.queue_progress.put("Race Subgraph Records")
+				self.put_problems(self.find_race_subgraph_problems())
+
+		if self.cancelled:
+			return
+
+		if scan_settings.skip_data_scan:
+			self.put_overview_problems()
+			return
+
+		with self.stats.phase("Cache load"):
+			scan_cache = ScanCache(scan_settings, self.game, data_path)
+		if scan_settings.all_profiles and scan_settings.manager:
+			self.scan_profiles(data_path, scan_cache, get_profiles(scan_settings.manager))
+		elif scan_settings.read_stage and scan_settings.manager and scan_settings.manager.selected_profile:
+			self.scan_profiles(data_path, scan_cache, [scan_settings.manager.selected_profile])
+		else:
+			self.scan_data(data_path, scan_cache)
+
+		# Only visited folders are saved, so a partial scan would prune the rest of the cache.
+		if not self.cancelled:
+			with self.stats.phase("Cache save"):
+				scan_cache.save()
+
+	def scan_data(self, data_path: Path, scan_cache: ScanCache) -> None:
+		"""Walk Data as the game sees it, through MO2's VFS if launched from MO2."""
+		scan_settings = self.scan_settings
+		with self.stats.phase("Mod file index"):
+			mod_files = self.build_mod_file_list(scan_cache)
+		if self.cancelled:
+			return
+		self.put_overview_problems()
+
+		with self.stats.phase("Data scan"):
+			rules = RuleSet(scan_settings)
+			for current_path, folders, files in walk_parallel(data_path, scan_settings.walk_workers, scan_cache.data.list_dir):
+				if self.cancelled:
+					break
+
+				self.stats.folders += 1
+				self.stats.files += len(files)
+				if current_path is data_path:
+					self.queue_progress.put(tuple(folders))
+				elif current_path.parent == data_path:
+					self.queue_progress.put(current_path.name)
+
+				folder_problems = scan_cache.get_problems(current_path, folders, files, mod_files)
+				if folder_problems is None:
+					folder_problems = self.scan_folder(rules, mod_files, data_path, current_path, folders, files)
+					scan_cache.set_problems(current_path, folders, folder_problems)
+				else:
+					self.stats.folders_reused += 1
+				self.put_problems(folder_problems)
+			self.stats.rules = rules.get_stats()
+
+	def scan_profiles(self, data_path: Path, scan_cache: ScanCache, profiles: list[str]) -> None:
+		"""Walk Data as MO2 profiles see it, built from the staging folder instead of MO2's VFS.
+
+		This also works for profiles other than the selected one, without switching profiles in MO2.
+		Each staged mod is walked once for all profiles, and its listings also provide the mod of each file.
+		With several profiles, rules only run on folders whose entries and the mods providing them differ
+		from those already scanned in another profile. Each problem is reported once per file and mod,
+		and lists every profile it was found in.
+		Results are also reused from scan_cache.json for folders whose entries and the mods providing them
+		are unchanged since the last scan, in any profile.
+		"""
+		scan_settings = self.scan_settings
+		manager = scan_settings.manager
+		if manager is None:
+			return
+
+		with self.stats.phase("Mod file index"):
+			stage_index = StageIndex(scan_settings, scan_cache, self.cancel_event, keep_listings=True)
+			profile_stage_paths = {profile: get_stage_paths(manager, profile) for profile in profiles}
+			stage_index.add(chain.from_iterable(profile_stage_paths.values()))
+			# The selected profile is what the VFS shows in Data and what Overview problems are attributed to.
+			vfs_mod_files = self.build_mod_file_list(scan_cache, stage_index)
+			self.stats.mods = len(stage_index.mods)
+			self.stats.mod_files = sum(len(staged_mod.file_keys) for staged_mod in stage_index.mods.values())
+		if self.cancelled:
+			return
+		self.put_overview_problems()
+		logger.info("Scanner : Scanning staged mods of profiles: %s", ", ".join(profile_stage_paths))
+		share_results = len(profile_stage_paths) > 1
+
+		with self.stats.phase("Data scan"):
+			rules = RuleSet(scan_settings)
+			scanned: dict[tuple[Path, bytes], tuple[list[str], list[ProblemInfo | SimpleProblemInfo]]] = {}
+			"""Kept folders and problems by folder contents, shared by profiles with the same contents."""
+			found: dict[tuple[str, Path, str | None], ProblemInfo | SimpleProblemInfo] = {}
+			"""Problems by type, path, and mod, so a folder that differs between profiles doesn't repeat its other problems."""
+			for profile, stage_paths in profile_stage_paths.items():
+				view = ProfileView(
+					stage_index,
+					profile,
+					stage_paths,
+					data_path,
+					scan_cache.data.list_dir,
+					vfs_mod_files if manager.vfs_active else None,
+				)
+				for current_path, folders, files in walk_parallel(data_path, scan_settings.walk_workers, view.list_dir):
+					if self.cancelled:
+						break
+
+					self.stats.folders += 1
+					self.stats.files += len(files)
+					if current_path is data_path:
+						self.queue_progress.put(tuple(folders))
+					elif current_path.parent == data_path:
+						self.queue_progress.put(current_path.name)
+
+					folder_key = self.get_folder_key(view.mod_files, current_path.relative_to(data_path), folders, files)
+					shared = scanned.get(folder_key)
+					if shared is None:
+						scanned_problems = scan_cache.get_stage_problems(folder_key, folders)
+						if scanned_problems is None:
+							scanned_problems = self.scan_folder(rules, view.mod_files, data_path, current_path, folders, files)
+							scan_cache.set_stage_problems(folder_key, folders, scanned_problems)
+						else:
+							self.stats.folders_reused += 1
+						if not share_results:
+							self.put_problems(scanned_problems)
+							continue
+
+						folder_problems: list[ProblemInfo | SimpleProblemInfo] = []
+						new_problems: list[ProblemInfo | SimpleProblemInfo] = []
+						for problem in scanned_problems:
+							problem_key = (problem.type, problem.relative_path, problem.mod)
+							found_problem = found.get(problem_key)
+							if found_problem is None:
+								problem.profiles = [profile]
+								found[problem_key] = problem
+								new_problems.append(problem)
+								folder_problems.append(problem)
+							else:
+								if found_problem.profiles is not None:
+									found_problem.profiles.append(profile)
+								folder_problems.append(found_problem)
+						scanned[folder_key] = (folders.copy(), folder_problems)
+						self.put_problems(new_problems)
+					else:
+						folders[:] = shared[0]
+						for problem in shared[1]:
+							if problem.profiles is not None:
+								problem.profiles.append(profile)
+						self.stats.folders_reused += 1
+			self.stats.rules = rules.get_stats()
+
+	@staticmethod
+	def get_folder_key(mod_files: ModFiles, relative_path: Path, folders: list[str], files: list[str]) -> tuple[Path, bytes]:
+		"""Identifies a folder's entries and the mods providing them, regardless of listing order."""
+		entries = [mod_files.folders.get_mod(relative_path)]
+		entries.extend(sorted(f"{folder}/{mod_files.folders.get_mod(relative_path / folder)}" for folder in folders))
+		entries.extend(sorted(f"{file}:{mod_files.files.get_mod(relative_path / file)}" for file in files))
+		return relative_path, hashlib.sha1("\n".join(entries).encode(), usedforsecurity=False).digest()
+
+	def find_complex_sorter_problems(self, tool_paths: set[Path]) -> list[ProblemInfo | SimpleProblemInfo]:
+		# Both Complex Sorter batch files are usually registered from the same folder.
+		tool_folders = dict.fromkeys(tool_path.parent for tool_path in tool_paths)
+		ini_folders: dict[Path, Path] = {}
+		for tool_folder in tool_folders:
+			for ini_path in rglob(tool_folder, "ini"):
+				ini_folders.setdefault(ini_path, tool_folder)
+
+		problems: list[ProblemInfo | SimpleProblemInfo] = []
+		for ini_path in find_outdated_inis(ini_folders, self.scan_settings.walk_workers, self.stats):
+			tool_folder = ini_folders[ini_path]
+			problems.append(
+				ProblemInfo(
+					ProblemType.ComplexSorter,
+					ini_path,
+					ini_path.relative_to(tool_folder),
+					tool_folder.name,
+					"INI uses an outdated field name. xEdit 4.1.5g changed the name of 'Addon Index' to 'Parent Combination Index'. Using outdated INIs with xEdit 4.1.5g+ results in broken output that may crash the game.",
+					SolutionType.ComplexSorterFix,
+				),
+			)
+		return problems
+
+	def find_race_subgraph_problems(self) -> list[ProblemInfo | SimpleProblemInfo]:
+		sadd_modules: list[tuple[int, Path]] = []
+		sadd_total = 0
+		modules_enabled = self.game.modules_enabled
+		with ThreadPoolExecutor(self.scan_settings.walk_workers, thread_name_prefix="race") as executor:
+			sadd_counts = executor.map(get_race_subgraph_count, modules_enabled, repeat(self.stats))
+			for module_path, sadd_count in zip(modules_enabled, sadd_counts, strict=True):
+				if self.cancelled:
+					executor.shutdown(wait=False, cancel_futures=True)
+					return []
+				if sadd_count:
+					sadd_modules.append((sadd_count, module_path))
+					sadd_total += sadd_count
+
+		if sadd_total <= RACE_SUBGRAPH_THRESHOLD:
+			return []
+		return [
+			SimpleProblemInfo(
+				f"{sadd_total} SADD Records from {len(sadd_modules)} modules",
+				"Race Subgraph Record Count",
+				INFO_SCAN_RACE_SUBGRAPHS,
+				"IF you are experiencing stutter when moving between cells, removing some of these mods could alleviate performance issues.\nMerging them may also reduce stutter.",
+				file_list=sadd_modules,
+			),
+		]
+
+	def put_problems(self, problems: list[ProblemInfo | SimpleProblemInfo], *, flush: bool = False) -> None:
+		"""Send problems to queue_progress in batches, so results can be shown while the scan is still running."""
+		self.problem_batch.extend(problems)
+		self.stats.problems.update(str(problem.type) for problem in problems)
+		if not self.problem_batch:
+			return
+
+		if (
+			flush
+			or len(self.problem_batch) >= RESULT_BATCH_SIZE
+			or perf_counter() - self.problem_batch_time >= RESULT_BATCH_SECONDS
+		):
+			self.queue_progress.put(self.problem_batch)
+			self.problem_batch = []
+			self.problem_batch_time = perf_counter()
+
+	def put_overview_problems(self) -> None:
+		scan_settings = self.scan_settings
+		if scan_settings[ScanSetting.OverviewIssues] and self.overview_problems and scan_settings.mod_files:
+			for problem in self.overview_problems:
+				if problem.mod == "OVERVIEW":
+					problem.mod = scan_settings.mod_files.files.get_mod(problem.relative_path)
+		else:
+			for problem in self.overview_problems:
+				if problem.mod == "OVERVIEW":
+					problem.mod = ""
+
+		if scan_settings[ScanSetting.OverviewIssues]:
+			self.put_problems(self.overview_problems.copy())
+
+	def scan_folder(
+		self,
+		rules: RuleSet,
+		mod_files: ModFiles,
+		data_path: Path,
+		current_path: Path,
+		folders: list[str],
+		files: list[str],
+	) -> list[ProblemInfo | SimpleProblemInfo]:
+		"""Run rules on a single folder in Data. Folders that shouldn't be descended into are removed from folders."""
+		scan_settings = self.scan_settings
+		problems: list[ProblemInfo | SimpleProblemInfo] = []
+		folder = FolderInfo(self.game, data_path, current_path, files, self.stats)
+		data_root_lower = folder.data_root_lower
+
+		if folder.is_data_root:
+			if data_root_rules := rules.get(EntryKind.DataFolder, data_root_lower):
+				mod_name, mod_path = mod_files.folders.get(folder.relative_path) or ("", current_path)
+				entry = EntryInfo(current_path.name, data_root_lower, current_path, folder.relative_path, mod_name, mod_path)
+				for rule in data_root_rules:
+					if problem := rule.run(folder, entry):
+						problems.append(problem)
+						folders.clear()
+						return problems
+
+			if data_root_lower not in DATA_WHITELIST:
+				folders.clear()
+				return problems
+
+		if folders:
+			folder_rules = rules.get(EntryKind.Folder, data_root_lower)
+			last_index = len(folders) - 1
+			for i, folder_name in enumerate(reversed(folders)):
+				folder_lower = folder_name.lower()
+				if folder_lower in scan_settings.skip_directories:
+					del folders[last_index - i]
+					continue
+
+				if not folder_rules:
+					continue
+
+				folder_path_full = current_path / folder_name
+				folder_path_relative = folder.relative_path / folder_name
+				mod_name_folder, mod_path_folder = mod_files.folders.get(folder_path_relative) or ("", folder_path_full)
+				entry = EntryInfo(
+					folder_name,
+					folder_lower,
+					folder_path_full,
+					folder_path_relative,
+					mod_name_folder,
+					mod_path_folder,
+				)
+				for rule in folder_rules:
+					if problem := rule.run(folder, entry):
+						problems.append(problem)
+						del folders[last_index - i]
+						break
+
+		for file in files:
+			file_lower = file.lower()
+			if scan_settings.skip_file_suffixes and file_lower.endswith(scan_settings.skip_file_suffixes):
+				continue
+
+			file_rules = rules.get(EntryKind.File, data_root_lower, file_lower.rpartition(".")[2] if "." in file_lower else "")
+			if not file_rules:
+				continue
+
+			self.stats.files_checked += 1
+			file_path_full = current_path / file
+			file_path_relative = folder.relative_path / file
+			mod_name_file, mod_path_file = mod_files.files.get(file_path_relative) or ("", file_path_full)
+			entry = EntryInfo(file, file_lower, file_path_full, file_path_relative, mod_name_file, mod_path_file)
+			for rule in file_rules:
+				if problem := rule.run(folder, entry):
+					problems.append(problem)
+					break
+
+		return problems
@@ -0,0 +1,322 @@
+#
+# Collective Modding Toolkit
+# Copyright (C) 2024, 2025  wxMichael
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from scan_settings import ModFiles
+from utils import is_dir, is_file, list_dir, walk_parallel
+
+if TYPE_CHECKING:
+	from mod_manager_info import ModManagerInfo
+	from scan_cache import ScanCache
+	from scan_settings import ScanSettings
+
+logger = logging.getLogger(__name__)
+
+type Listing = tuple[list[str], list[str]]
+"""Folder and file names in a folder."""
+
+
+def get_profiles(manager: "ModManagerInfo") -> list[str]:
+	"""Names of the MO2 profiles that have a modlist.txt, sorted case-insensitively."""
+	if manager.profiles_path is None or not is_dir(manager.profiles_path):
+		return []
+	return sorted(
+		(
+			entry.name
+			for entry in os.scandir(manager.profiles_path)
+			if entry.is_dir() and is_file(Path(entry.path, "modlist.txt"))
+		),
+		key=str.lower,
+	)
+
+
+def get_stage_paths(manager: "ModManagerInfo | None", profile: str | None = None) -> list[Path]:
+	"""Staging folders of the mods enabled in a profile, lowest priority first, then overwrite.
+
+	profile defaults to the profile selected in MO2.
+	"""
+	profile = profile or (manager.selected_profile if manager else None)
+	if not (manager and manager.stage_path and manager.profiles_path and profile and manager.overwrite_path):
+		msg = (
+			(
+				f"Missing MO2 settings\n"
+				f"Manager: {manager}\n"
+				f"mods: {manager.stage_path}\n"
+				f"profiles: {manager.profiles_path}\n"
+				f"profile: {profile}\n"
+				f"overwrite: {manager.overwrite_path}"
+			)
+			if manager
+			else "Manager: None"
+		)
+		raise ValueError(msg)
+
+	modlist_path = manager.profiles_path / profile / "modlist.txt"
+	if not is_file(modlist_path):
+		msg = f"File doesn't exist: {modlist_path}"
+		raise FileNotFoundError(msg)
+
+	stage_paths = [
+		mod_path
+		for mod in reversed(modlist_path.read_text("utf-8").splitlines())
+		if mod[:1] == "+" and is_dir(mod_path := manager.stage_path / mod[1:])
+	]
+	if is_dir(manager.overwrite_path):
+		stage_paths.append(manager.overwrite_path)
+
+	return stage_paths
+
+
+def get_root_mod_files(stage_paths: list[Path], skip_file_suffixes: tuple[str, ...]) -> ModFiles:
+	"""Modules and archives in the root of each mod, overlaid in priority order. Only the root of each mod is listed."""
+	mod_files = ModFiles()
+	for mod_path in stage_paths:
+		listing = list_dir(mod_path)
+		if listing is None:
+			continue
+
+		mod_index = mod_files.add_mod(mod_path)
+		for file in listing[1]:
+			file_lower = file.lower()
+			if file_lower.endswith(skip_file_suffixes):
+				continue
+			if file_lower.endswith((".esp", ".esl", ".esm")):
+				mod_files.modules.add(os.path.normcase(file), mod_index)
+			elif file_lower.endswith(".ba2"):
+				mod_files.archives.add(os.path.normcase(file), mod_index)
+	return mod_files
+
+
+class StagedMod:
+	"""ModFileIndex keys of a single staged mod, from one walk shared by every profile that enables it."""
+
+	__slots__ = ("archive_keys", "file_keys", "folder_keys", "listings", "module_keys", "path")
+
+	def __init__(self, path: Path) -> None:
+		self.path = path
+		self.folder_keys: list[str] = []
+		self.file_keys: list[str] = []
+		self.module_keys: list[str] = []
+		"""Plugins in the root of the mod."""
+		self.archive_keys: list[str] = []
+		"""Archives in the root of the mod."""
+		self.listings: dict[str, Listing] = {}
+		"""Folders and files of each folder by key, with "" for the mod's root. Only kept for ProfileView."""
+
+	def walk(
+		self,
+		scan_settings: "ScanSettings",
+		lister: Callable[[Path], Listing | None],
+		cancel_event: threading.Event,
+		*,
+		keep_listings: bool,
+	) -> "StagedMod":
+		"""Fill in the keys, skipping the folders and files MO2 ignores. Stops early if cancel_event is set."""
+		mod_path = self.path
+		for root, folders, files in walk_parallel(mod_path, 1, lister):
+			if cancel_event.is_set():
+				break
+
+			root_is_mod_path = root is mod_path
+			if folders:
+				last_index = len(folders) - 1
+				for i, folder in enumerate(reversed(folders)):
+					folder_lower = folder.lower()
+					if folder_lower in scan_settings.skip_directories:
+						del folders[last_index - i]
+
+			if root_is_mod_path:
+				root_key = ""
+				key_prefix = ""
+			else:
+				root_key = os.path.normcase(root.relative_to(mod_path))
+				self.folder_keys.append(root_key)
+				key_prefix = f"{root_key}{os.sep}"
+
+			kept_files: list[str] = []
+			for file in files:
+				file_lower = file.lower()
+				if file_lower.endswith(scan_settings.skip_file_suffixes):
+					continue
+
+				kept_files.append(file)
+				file_key = os.path.normcase(file)
+				self.file_keys.append(key_prefix + file_key)
+
+				if root_is_mod_path:
+					if file_lower.endswith((".esp", ".esl", ".esm")):
+						self.module_keys.append(file_key)
+					elif file_lower.endswith(".ba2"):
+						self.archive_keys.append(file_key)
+
+			if keep_listings:
+				self.listings[root_key] = (folders.copy(), kept_files)
+		return self
+
+
+class StageIndex:
+	"""Every staged mod used by the profiles being scanned. Each mod is walked once, however many profiles enable it."""
+
+	def __init__(
+		self,
+		scan_settings: "ScanSettings",
+		scan_cache: "ScanCache",
+		cancel_event: threading.Event,
+		*,
+		keep_listings: bool,
+	) -> None:
+		"""keep_listings is needed to build a ProfileView from this index."""
+		self.scan_settings = scan_settings
+		self.scan_cache = scan_cache
+		self.cancel_event = cancel_event
+		self.keep_listings = keep_listings
+		self.mods: dict[Path, StagedMod] = {}
+
+	def add(self, stage_paths: Iterable[Path]) -> None:
+		"""Walk the mods that aren't indexed yet on a thread pool."""
+		new_paths = [mod_path for mod_path in dict.fromkeys(stage_paths) if mod_path not in self.mods]
+		if not new_paths:
+			return
+
+		def walk(mod_path: Path) -> StagedMod:
+			return StagedMod(mod_path).walk(
+				self.scan_settings,
+				self.scan_cache.mod(mod_path).list_dir,
+				self.cancel_event,
+				keep_listings=self.keep_listings,
+			)
+
+		with ThreadPoolExecutor(self.scan_settings.walk_workers, thread_name_prefix="stage") as executor:
+			for staged_mod in executor.map(walk, new_paths):
+				self.mods[staged_mod.path] = staged_mod
+
+	def get_mod_files(self, stage_paths: list[Path]) -> ModFiles:
+		"""Overlay the indexed mods in priority order, so later mods win conflicts like in MO2. No folders are read."""
+		mod_files = ModFiles()
+		for mod_path in stage_paths:
+			staged_mod = self.mods[mod_path]
+			mod_index = mod_files.add_mod(mod_path)
+			mod_files.folders.update(staged_mod.folder_keys, mod_index)
+			mod_files.files.update(staged_mod.file_keys, mod_index)
+			mod_files.modules.update(staged_mod.module_keys, mod_index)
+			mod_files.archives.update(staged_mod.archive_keys, mod_index)
+		return mod_files
+
+
+class ProfileView:
+	"""Data as an MO2 profile sees it: the real Data folder with the profile's mods overlaid, like MO2's VFS.
+
+	list_dir() serves merged listings to walk_parallel() from the StageIndex, so staged mods aren't read again.
+	Data itself is only listed for folders with real content. Through the VFS, that's content hidden doesn't provide,
+	and each folder hidden provides inside those is listed once to check for it.
+	"""
+
+	def __init__(
+		self,
+		index: StageIndex,
+		profile: str,
+		stage_paths: list[Path],
+		data_path: Path,
+		data_lister: Callable[[Path], Listing | None],
+		hidden: ModFiles | None = None,
+	) -> None:
+		"""hidden is the ModFiles of the profile MO2's VFS is showing in Data, if the app was launched from MO2.
+
+		Files it provides are removed from listings of the real Data folder so they only come from the mods.
+		Folders it provides are only kept if they also have files or folders it doesn't provide.
+		"""
+		self.profile = profile
+		self.data_path = data_path
+		self.data_lister = data_lister
+		self.hidden = hidden
+		self.mod_files = index.get_mod_files(stage_paths)
+		self._folder_mods: dict[str, list[StagedMod]] = {}
+		"""Mods providing each folder, in priority order."""
+		for mod_path in stage_paths:
+			staged_mod = index.mods[mod_path]
+			for key in staged_mod.listings:
+				self._folder_mods.setdefault(key, []).append(staged_mod)
+		self._data_keys = {""}
+		"""Folders found by listing Data that have real content, so the walk lists them through Data."""
+		self._data_listings: dict[str, Listing] = {}
+		"""Listings of folders hidden provides that were checked for real content, until list_dir() reaches them."""
+
+	def list_dir(self, path: Path) -> Listing | None:
+		key = "" if path == self.data_path else os.path.normcase(path.relative_to(self.data_path))
+		key_prefix = f"{key}{os.sep}" if key else ""
+		folders: dict[str, str] = {}
+		files: dict[str, str] = {}
+
+		data_listing = None
+		if key in self._data_keys:
+			data_listing = self._data_listings.pop(key, None)
+			if data_listing is None:
+				data_listing = self.data_lister(path)
+		if data_listing is not None:
+			for folder in data_listing[0]:
+				folder_key = key_prefix + os.path.normcase(folder)
+				# The VFS shows every folder hidden provides, so it's only real if it has something else in it.
+				if (
+					self.hidden is None
+					or folder_key not in self.hidden.folders
+					or self._has_data_entries(path / folder, folder_key)
+				):
+					folders[os.path.normcase(folder)] = folder
+					self._data_keys.add(folder_key)
+			for file in data_listing[1]:
+				if self.hidden is None or key_prefix + os.path.normcase(file) not in self.hidden.files:
+					files[os.path.normcase(file)] = file
+
+		folder_mods = self._folder_mods.get(key)
+		if folder_mods is None and data_listing is None:
+			return None
+
+		for staged_mod in folder_mods or ():
+			mod_folders, mod_files = staged_mod.listings[key]
+			for folder in mod_folders:
+				folders.setdefault(os.path.normcase(folder), folder)
+			for file in mod_files:
+				files.setdefault(os.path.normcase(file), file)
+		return list(folders.values()), list(files.values())
+
+	def _has_data_entries(self, path: Path, key: str) -> bool:
+		"""Whether a folder in Data has files or folders that hidden doesn't provide.
+
+		The listing is kept for list_dir() if so. Folders hidden provides aren't looked into,
+		so real files only in those are missed.
+		"""
+		data_listing = self.data_lister(path)
+		if data_listing is None or self.hidden is None:
+			return False
+		key_prefix = f"{key}{os.sep}"
+		hidden_folders = self.hidden.folders
+		hidden_files = self.hidden.files
+		if any(key_prefix + os.path.normcase(folder) not in hidden_folders for folder in data_listing[0]) or any(
+			key_prefix + os.path.normcase(file) not in hidden_files for file in data_listing[1]
+		):
+			self._data_listings[key] = data_listing
+			return True
+		return False
@@ -22,35 +22,57 @@
 import threading
 import webbrowser
 from pathlib import Path
+from time import perf_counter
 from tkinter import *
 from tkinter import ttk
 
+from packaging.version import Version
 from tktooltip import ToolTip  # type: ignore[reportMissingTypeStubs]
 
 from autofixes import AUTO_FIXES, do_autofix
-from enums import ProblemType, SolutionType, Tab, Tool
+from enums import Tab
 from globals import *
 from helpers import CMCheckerInterface, CMCTabFrame, ProblemInfo, SimpleProblemInfo
 from modal_window import TreeWindow
+from result_index import ResultIndex
 from scan_settings import (
-	DATA_WHITELIST,
-	JUNK_FILE_SUFFIXES,
-	JUNK_FILES,
-	PROPER_FORMATS,
-	ModFiles,
 	ScanSetting,
 	ScanSettings,
 )
+from scan_stats import ScanStats
+from scanner import DataScanner, ScanUpdate
 from utils import (
 	copy_text,
 	copy_text_button,
 	exists,
 	is_dir,
-	is_file,
-	read_text_encoded,
-	rglob,
 )
 
+RESULT_ROWS_PER_CHECK = 250
+RESULT_PAGE_ROWS = 500
+"""Rows added to a group in tree_results at a time. The rest are added once the group's last row is scrolled into view."""
+SCAN_CANCEL_TIMEOUT = 5
+"""Seconds to wait for a cancelled scan to stop when closing the app."""
+
+
+class ResultGroup:
+	"""Rows of one problem type in tree_results.
+
+	Only the first `shown` results have rows, so groups with tens of thousands of results stay fast.
+	"""
+
+	__slots__ = ("item_id", "more_id", "problems", "row_ids", "shown")
+
+	def __init__(self, item_id: str, problems: list[ProblemInfo | SimpleProblemInfo]) -> None:
+		self.item_id = item_id
+		self.problems = problems
+		"""The type's results in ResultIndex.by_type, sorted by mod."""
+		self.shown = 0
+		self.row_ids: list[str] = []
+		"""Item IDs of the rows of the first `shown` results."""
+		self.more_id: str | None = None
+		"""Row at the end of the group standing in for results without rows yet."""
+
 
 class ScannerTab(CMCTabFrame):
 	def __init__(self, cmc: CMCheckerInterface, notebook: ttk.Notebook) -> None:
@@ -62,15 +84,33 @@ def __init__(self, cmc: CMCheckerInterface, notebook: ttk.Notebook) -> None:
 		self.side_pane: SidePane | None = None
 		self.details_pane: ResultDetailsPane | None = None
 
-		self.scan_results: list[ProblemInfo | SimpleProblemInfo] = []
-		self.queue_progress: queue.Queue[str | tuple[str, ...] | list[ProblemInfo | SimpleProblemInfo]] = queue.Queue()
+		self.results = ResultIndex()
+		self.queue_progress: queue.Queue[ScanUpdate] = queue.Queue()
 		self.thread_scan: threading.Thread | None = None
+		self.scanner: DataScanner | None = None
+		"""The running scan, until its results have all been shown."""
+		self.restart_scan = False
+		"""Start a new scan once the running one stops, because scan settings changed."""
 		self.dv_progress = DoubleVar()
 		self.progress_check_delay = 100
 		self.sv_scanning_text = StringVar()
 		self.label_scanning_text: ttk.Label | None = None
 		self.scan_folders: tuple[str, ...] = ("",)
 		self.sv_results_info = StringVar()
+		self.frame_stats: ttk.Frame | None = None
+		self.stats_expanded = False
+		"""Whether the Scan Statistics area is open. Kept between scans."""
+
+		self.pending_results: list[ProblemInfo | SimpleProblemInfo] = []
+		"""Results received from the scan thread but not yet added to tree_results."""
+		self.tree_groups: dict[str, ResultGroup] = {}
+		"""Results of each problem type in tree_results."""
+		self.tree_more_rows: dict[str, ResultGroup] = {}
+		"""Item IDs of the rows standing in for results without rows yet."""
+		self.sv_filter = StringVar()
+		self.result_filter: set[ProblemInfo | SimpleProblemInfo] | None = None
+		"""Results matching the filter box, or None if it's empty."""
+		self.filter_after_id: str | None = None
 
 		self.func_id_focus: str
 		self.func_id_config: str
@@ -93,6 +133,7 @@ def _switch_to(self) -> None:
 
 		if self.side_pane is None:
 			self.side_pane = SidePane(self)
+			self.update_scan_button()
 
 	def switch_from(self) -> None:
 		self.tree_results.selection_remove(self.tree_results.selection())
@@ -116,11 +157,12 @@ def _load(self) -> bool:
 	def set_expanded(self, *, expanded: bool) -> None:
 		for ch in self.tree_results.get_children():
 			self.tree_results.item(ch, open=expanded)
+		self.show_visible_rows()
 
 	def _build_gui(self) -> None:
 		self.grid_columnconfigure(0, weight=1)
 		self.grid_rowconfigure(0, weight=0)
-		self.grid_rowconfigure(1, weight=1)
+		self.grid_rowconfigure(2, weight=1)
 
 		frame_tree_controls = ttk.Frame(self, padding=0)
 		frame_tree_controls.grid(column=0, row=0, columnspan=2, sticky=EW, padx=5, pady=5)
@@ -142,6 +184,23 @@ def _build_gui(self) -> None:
 		button_collapse.pack(side=LEFT, anchor=W, padx=(0, 5))
 		button_expand.pack(side=LEFT, anchor=W, padx=(0, 5))
 
+		ttk.Label(
+			frame_tree_controls,
+			text="Filter:",
+			font=FONT_SMALL,
+			foreground=COLOR_DEFAULT,
+		).pack(side=LEFT, anchor=W, padx=(10, 5))
+		entry_filter = ttk.Entry(frame_tree_controls, textvariable=self.sv_filter, width=30)
+		entry_filter.pack(side=LEFT, anchor=W)
+		ToolTip(entry_filter, TOOLTIP_SCAN_RESULTS_FILTER)
+
+		def on_key_release(_event: "Event[ttk.Entry]") -> None:
+			# Keys typed before the next idle filter once.
+			if self.filter_after_id is None:
+				self.filter_after_id = self.after_idle(self.apply_filter)
+
+		entry_filter.bind("<KeyRelease>", on_key_release)
+
 		label_results_info = ttk.Label(
 			frame_tree_controls,
 			textvariable=self.sv_results_info,
@@ -167,12 +226,19 @@ def _build_gui(self) -> None:
 			orient=VERTICAL,
 			command=self.tree_results.yview,  # pyright: ignore[reportUnknownArgumentType]
 		)
-		self.tree_results.grid(column=0, row=1, rowspan=2, sticky=NSEW)
-		scroll_results_y.grid(column=1, row=1, rowspan=2, sticky=NS)
-		self.tree_results.configure(yscrollcommand=scroll_results_y.set)
+		self.tree_results.grid(column=0, row=2, rowspan=2, sticky=NSEW)
+		scroll_results_y.grid(column=1, row=2, rowspan=2, sticky=NS)
+
+		def on_scroll(first: float, last: float) -> None:
+			scroll_results_y.set(first, last)
+			if self.tree_more_rows:
+				self.after_idle(self.show_visible_rows)
+
+		self.tree_results.configure(yscrollcommand=on_scroll)
+		self.tree_results.bind("<<TreeviewOpen>>", lambda _event: self.after_idle(self.show_visible_rows))
 
 		self.progress_bar = ttk.Progressbar(self, variable=self.dv_progress, maximum=100)
-		self.progress_bar.grid(column=0, row=4, columnspan=2, sticky=EW, ipady=1)
+		self.progress_bar.grid(column=0, row=5, columnspan=2, sticky=EW, ipady=1)
 
 	def start_threaded_scan(self) -> None:
 		if self.side_pane is None:
@@ -183,8 +249,14 @@ def start_threaded_scan(self) -> None:
 		self.tree_results.configure(selectmode=NONE)
 		self.tree_results.delete(*self.tree_results.get_children())
 		self.tree_results_data.clear()
-		self.scan_results.clear()
+		self.results.clear()
+		self.pending_results.clear()
+		self.tree_groups.clear()
+		self.tree_more_rows.clear()
 		self.sv_results_info.set("")
+		if self.frame_stats is not None:
+			self.frame_stats.destroy()
+			self.frame_stats = None
 		if self.details_pane is not None:
 			self.details_pane.destroy()
 			self.details_pane = None
@@ -197,27 +269,70 @@ def start_threaded_scan(self) -> None:
 				foreground=COLOR_NEUTRAL_2,
 				justify=LEFT,
 			)
-			self.label_scanning_text.grid(column=0, row=3, sticky=EW, padx=5, pady=5)
+			self.label_scanning_text.grid(column=0, row=4, sticky=EW, padx=5, pady=5)
 		self.sv_scanning_text.set("Refreshing Overview...")
+		time_overview = perf_counter()
 		self.cmc.refresh_tab(Tab.Overview)
-
-		scan_settings = ScanSettings(self.side_pane)
-		if scan_settings[ScanSetting.OverviewIssues] and self.cmc.overview_problems:
-			self.scan_results.extend(self.cmc.overview_problems)
+		time_overview = perf_counter() - time_overview
+
+		scan_settings = ScanSettings(
+			self.cmc.settings,
+			{setting: bool_var.get() for setting, bool_var in self.side_pane.bool_vars.items()},
+			self.cmc.game.manager,
+			using_stage=self.using_stage,
+			read_stage=self.side_pane.bv_read_stage.get(),
+			all_profiles=self.side_pane.bv_all_profiles.get(),
+		)
+		self.scanner = DataScanner(self.cmc.game, self.cmc.overview_problems, scan_settings, self.queue_progress)
+		self.scanner.stats.phases["Overview refresh"] = time_overview
 		self.dv_progress.set(1)
 		if not scan_settings.skip_data_scan:
 			self.sv_scanning_text.set("Building mod file index...")
-		self.thread_scan = threading.Thread(target=self.scan_data_files, args=(scan_settings,))
+		# Daemon so closing the app never waits on a scan that's slow to reach its next folder.
+		self.thread_scan = threading.Thread(target=self.scan_data_files, args=(self.scanner,), daemon=True)
 		self.thread_scan.start()
-		self.cmc.root.after(self.progress_check_delay, self.check_scan_progress, scan_settings)
+		self.update_scan_button()
+		self.cmc.root.after(self.progress_check_delay, self.check_scan_progress, self.scanner)
+
+	def cancel_scan(self, *, restart: bool = False, wait: bool = False) -> None:
+		"""Stop the running scan at its next folder. With restart, a new scan starts once it stops."""
+		if self.scanner is None:
+			return
+
+		self.restart_scan = restart
+		self.scanner.cancel()
+		self.sv_scanning_text.set("Restarting scan..." if restart else "Cancelling scan...")
+		self.update_scan_button()
+		if wait and self.thread_scan is not None:
+			self.thread_scan.join(SCAN_CANCEL_TIMEOUT)
+
+	def update_scan_button(self) -> None:
+		if self.side_pane is None:
+			return
+
+		button_scan = self.side_pane.button_scan
+		if self.scanner is None:
+			button_scan.configure(
+				text="Scan Game",
+				command=self.start_threaded_scan,
+				state=NORMAL if self.side_pane.any_enabled() else DISABLED,
+			)
+		elif self.scanner.cancelled:
+			button_scan.configure(text="Restarting..." if self.restart_scan else "Cancelling...", state=DISABLED)
+		else:
+			button_scan.configure(text="Cancel", command=self.cancel_scan, state=NORMAL)
 
-	def check_scan_progress(self, scan_settings: ScanSettings) -> None:
+	def check_scan_progress(self, scanner: DataScanner) -> None:
 		while self.queue_progress.qsize():
 			try:
 				update = self.queue_progress.get()
 			except queue.Empty:
 				break
 
+			if scanner.cancelled:
+				# Results still queued from the cancelled scan are discarded.
+				continue
+
 			if isinstance(update, tuple):
 				self.scan_folders = update
 				current_folder = "Data"
@@ -232,69 +347,208 @@ def check_scan_progress(self, scan_settings: ScanSettings) -> None:
 					self.dv_progress.set((current_index / len(self.scan_folders)) * 100)
 			elif update:
 				# list
-				self.scan_results.extend(update)
+				self.pending_results.extend(update)
+
+		if scanner.cancelled:
+			self.pending_results.clear()
+
+		if self.pending_results:
+			# Limit rows added per check so the window stays responsive.
+			self.populate_results(self.pending_results[:RESULT_ROWS_PER_CHECK])
+			del self.pending_results[:RESULT_ROWS_PER_CHECK]
+			self.sv_results_info.set(self.get_results_text())
+
+		if self.thread_scan is None and not self.pending_results and not self.queue_progress.qsize():
+			self.scanner = None
+			if self.restart_scan and self.side_pane is not None and self.side_pane.any_enabled():
+				self.restart_scan = False
+				self.start_threaded_scan()
+				return
+
+			self.restart_scan = False
+			self.dv_progress.set(0 if scanner.cancelled else 100)
+			self.finish_scan(scanner)
+			return
+		self.cmc.root.after(self.progress_check_delay, self.check_scan_progress, scanner)
+
+	def populate_results(self, problems: list[ProblemInfo | SimpleProblemInfo]) -> None:
+		"""Add results to their groups, keeping each group sorted by mod in the order results arrived.
+
+		Rows are only added for results among the first shown in their group. The rest are added by show_visible_rows().
+		"""
+		added = self.results.add(problems)
+		if self.result_filter is not None:
+			# Positions in the index don't apply to filtered groups, so filter again once all results so far are in.
+			if self.filter_after_id is None:
+				self.filter_after_id = self.after_idle(self.apply_filter)
+			return
 
-		if self.thread_scan is None:
-			self.dv_progress.set(100)
-			self.populate_results(scan_settings)
+		for problem_type, indexes in added.items():
+			group = self.get_group(problem_type)
+			for index in indexes:
+				if index >= group.shown:
+					break
+				self.insert_row(group, index, group.problems[index])
+				if group.shown < RESULT_PAGE_ROWS:
+					group.shown += 1
+				else:
+					# Keep the number of rows the same. The last one is added back when scrolled to.
+					last_id = group.row_ids.pop()
+					self.tree_results.delete(last_id)
+					del self.tree_results_data[last_id]
+			self.show_group_rows(group, RESULT_PAGE_ROWS - group.shown)
+		self.show_visible_rows()
+
+	def get_group(self, problem_type: str) -> ResultGroup:
+		group = self.tree_groups.get(problem_type)
+		if group is None:
+			group_id = self.tree_results.insert("", END, text=problem_type, open=True)
+			group = self.tree_groups[problem_type] = ResultGroup(group_id, self.results.by_type[problem_type])
+		return group
+
+	def apply_filter(self) -> None:
+		"""Show only the results matching the filter box. Only the shown rows of each group are replaced."""
+		self.filter_after_id = None
+		self.result_filter = self.results.search(self.sv_filter.get())
+		position = 0
+		for problem_type, type_problems in self.results.by_type.items():
+			group = self.get_group(problem_type)
+			if group.row_ids:
+				self.tree_results.delete(*group.row_ids)
+				for item_id in group.row_ids:
+					del self.tree_results_data[item_id]
+				group.row_ids.clear()
+			group.shown = 0
+			if self.result_filter is None:
+				group.problems = type_problems
+			else:
+				group.problems = [problem for problem in type_problems if problem in self.result_filter]
+			self.show_group_rows(group, RESULT_PAGE_ROWS)
+
+			if group.problems:
+				self.tree_results.move(group.item_id, "", position)
+				position += 1
+			else:
+				self.tree_results.detach(group.item_id)
+
+		if self.scanner is not None:
+			self.sv_results_info.set(self.get_results_text())
+		elif self.results:
+			self.sv_results_info.set(f"{self.get_results_text()} ~ Select an item for details")
+		self.show_visible_rows()
+
+	def get_results_text(self) -> str:
+		if self.result_filter is None:
+			return f"{len(self.results)} Results"
+		shown = sum(len(group.problems) for group in self.tree_groups.values())
+		return f"{shown} of {len(self.results)} Results"
+
+	def insert_row(self, group: ResultGroup, index: int, problem_info: ProblemInfo | SimpleProblemInfo) -> None:
+		item_text = problem_info.path.name if isinstance(problem_info, ProblemInfo) else problem_info.path
+		item_values = [problem_info.mod] if self.using_stage else []
+		item_id = self.tree_results.insert(group.item_id, index, text=item_text, values=item_values)
+		group.row_ids.insert(index, item_id)
+		self.tree_results_data[item_id] = problem_info
+
+	def show_group_rows(self, group: ResultGroup, count: int) -> None:
+		"""Add rows for up to count more results of a group, then update the row standing in for the rest."""
+		end = min(len(group.problems), group.shown + max(0, count))
+		for index in range(group.shown, end):
+			self.insert_row(group, index, group.problems[index])
+		group.shown = end
+
+		remaining = len(group.problems) - group.shown
+		if not remaining:
+			if group.more_id is not None:
+				self.tree_results.delete(group.more_id)
+				del self.tree_more_rows[group.more_id]
+				group.more_id = None
 			return
-		self.cmc.root.after(self.progress_check_delay, self.check_scan_progress, scan_settings)
 
-	def populate_results(self, scan_settings: ScanSettings) -> None:
-		if self.side_pane is None:
-			raise ValueError
+		more_text = f"{remaining} more results..."
+		if group.more_id is None:
+			group.more_id = self.tree_results.insert(group.item_id, END, text=more_text)
+			self.tree_more_rows[group.more_id] = group
+		else:
+			self.tree_results.item(group.more_id, text=more_text)
 
+	def show_visible_rows(self) -> None:
+		"""Add the next page of rows to each open group whose last row has been scrolled into view."""
+		for more_id, group in list(self.tree_more_rows.items()):
+			if self.tree_results.bbox(more_id):
+				self.show_group_rows(group, RESULT_PAGE_ROWS)
+
+	def finish_scan(self, scanner: DataScanner) -> None:
 		if self.label_scanning_text is not None:
 			self.label_scanning_text.grid_forget()
 			self.label_scanning_text.destroy()
 			self.label_scanning_text = None
 		self.sv_scanning_text.set("")
-		self.sv_results_info.set(f"{len(self.scan_results)} Results ~ Select an item for details")
-
-		if scan_settings[ScanSetting.OverviewIssues] and self.cmc.overview_problems and scan_settings.mod_files:
-			for problem in self.cmc.overview_problems:
-				if problem.mod == "OVERVIEW":
-					problem.mod = scan_settings.mod_files.files.get(Path(problem.relative_path), [""])[0]
+		if scanner.cancelled:
+			self.sv_results_info.set(f"Scan cancelled ~ {self.get_results_text()} ~ Select an item for details")
 		else:
-			for problem in self.cmc.overview_problems:
-				if problem.mod == "OVERVIEW":
-					problem.mod = ""
-
-		groups = {p.type for p in self.scan_results}
-
-		for group in groups:
-			group_id = self.tree_results.insert("", END, text=group, open=True)
-			for problem_info in sorted(self.scan_results, key=lambda p: p.type + p.mod):
-				if problem_info.type != group:
-					continue
-				if isinstance(problem_info, ProblemInfo):
-					if self.using_stage:
-						item_text = problem_info.path.name
-						item_values = [problem_info.mod]
-					else:
-						item_text = problem_info.path.name
-						item_values = []
-
-				# SimpleProblemInfo
-				elif self.using_stage:
-					item_text = problem_info.path
-					item_values = [problem_info.mod]
-				else:
-					item_text = problem_info.path
-					item_values = []
-
-				item_id = self.tree_results.insert(group_id, END, text=item_text, values=item_values)
-				self.tree_results_data[item_id] = problem_info
+			self.sv_results_info.set(f"{self.get_results_text()} ~ Select an item for details")
 
-		self.side_pane.button_scan.configure(state=NORMAL, text="Scan Game")
+		self.update_scan_button()
 		self.tree_results.bind("<<TreeviewSelect>>", self.on_row_select)
 		self.tree_results.configure(selectmode=BROWSE)
+		self.show_stats(scanner.stats)
+
+	def show_stats(self, stats: ScanStats) -> None:
+		"""Add the collapsible Scan Statistics area under the results info, above the results."""
+		stats_text = "\n".join(stats.get_lines())
+		self.frame_stats = ttk.Frame(self, padding=0)
+		self.frame_stats.grid(column=0, row=1, columnspan=2, sticky=EW, padx=5, pady=(0, 5))
+		self.frame_stats.grid_columnconfigure(0, weight=1)
+
+		label_toggle = ttk.Label(
+			self.frame_stats,
+			font=FONT_SMALL,
+			foreground=COLOR_NEUTRAL_2,
+			cursor="hand2",
+		)
+		label_toggle.grid(column=0, row=0, sticky=W)
+		button_copy = ttk.Button(
+			self.frame_stats,
+			text="Copy Statistics",
+			padding=0,
+			command=lambda: copy_text_button(button_copy, stats_text),
+		)
+		button_copy.grid(column=1, row=0, sticky=E)
+		label_stats = ttk.Label(
+			self.frame_stats,
+			text=stats_text,
+			font=FONT_SMALL,
+			foreground=COLOR_NEUTRAL_2,
+			justify=LEFT,
+		)
+
+		def update_expanded() -> None:
+			if self.stats_expanded:
+				label_toggle.configure(text="▾ Scan Statistics")
+				label_stats.grid(column=0, row=1, columnspan=2, sticky=W, pady=(5, 0))
+			else:
+				label_toggle.configure(text="▸ Scan Statistics")
+				label_stats.grid_forget()
+
+		def toggle(_event: "Event[Misc]") -> None:
+			self.stats_expanded = not self.stats_expanded
+			update_expanded()
+
+		label_toggle.bind("<Button-1>", toggle)
+		update_expanded()
 
 	def on_row_select(self, _event: "Event[ttk.Treeview]") -> bool:
 		if not _event.widget.selection():
 			return False
 
 		selection = self.tree_results.selection()[0]
+		more_group = self.tree_more_rows.get(selection)
+		if more_group is not None:
+			self.tree_results.selection_remove(selection)
+			self.show_group_rows(more_group, RESULT_PAGE_ROWS)
+			return False
+
 		if selection in self.tree_results_data:
 			if self.details_pane is None:
 				self.details_pane = ResultDetailsPane(self)
@@ -302,358 +556,11 @@ def on_row_select(self, _event: "Event[ttk.Treeview]") -> bool:
 			return True
 		return False
 
-	def get_stage_paths(self, scan_settings: ScanSettings) -> list[Path]:  # noqa: PLR6301
-		manager = scan_settings.manager
-		if not (manager and manager.stage_path and manager.profiles_path and manager.selected_profile and manager.overwrite_path):
-			msg = (
-				(
-					f"Missing MO2 settings\n"
-					f"Manager: {manager}\n"
-					f"mods: {manager.stage_path}\n"
-					f"profiles: {manager.profiles_path}\n"
-					f"profile: {manager.selected_profile}\n"
-					f"overwrite: {manager.overwrite_path}"
-				)
-				if manager
-				else "Manager: None"
-			)
-			raise ValueError(msg)
-
-		modlist_path = manager.profiles_path / manager.selected_profile / "modlist.txt"
-		if not is_file(modlist_path):
-			msg = f"File doesn't exist: {modlist_path}"
-			raise FileNotFoundError(msg)
-
-		stage_paths = [
-			mod_path
-			for mod in reversed(modlist_path.read_text("utf-8").splitlines())
-			if mod[:1] == "+" and is_dir(mod_path := manager.stage_path / mod[1:])
-		]
-		if is_dir(manager.overwrite_path):
-			stage_paths.append(manager.overwrite_path)
-
-		return stage_paths
-
-	def build_mod_file_list(self, scan_settings: ScanSettings) -> ModFiles:
-		mod_files = ModFiles()
-		if not scan_settings.using_stage or not scan_settings.manager or scan_settings.manager.name != "Mod Organizer":
-			return mod_files
-
-		for mod_path in self.get_stage_paths(scan_settings):
-			mod_name = mod_path.name
-			for root, folders, files in mod_path.walk(top_down=True):
-				root_is_mod_path = root is mod_path
-				if folders:
-					last_index = len(folders) - 1
-					for i, folder in enumerate(reversed(folders)):
-						folder_lower = folder.lower()
-						if folder_lower in scan_settings.skip_directories:
-							del folders[last_index - i]
-
-				if root_is_mod_path:
-					root_relative = Path()
-				else:
-					root_relative = root.relative_to(mod_path)
-					mod_files.folders[root_relative] = (mod_name, root)
-
-				for file in files:
-					file_lower = file.lower()
-					if file_lower.endswith(scan_settings.skip_file_suffixes):
-						continue
-
-					full_path = root / file
-
-					mod_files.files[root_relative / file] = (mod_name, full_path)
-
-					if root_is_mod_path:
-						if file_lower.endswith((".esp", ".esl", ".esm")):
-							mod_files.modules[file] = (mod_name, full_path)
-						elif file_lower.endswith(".ba2"):
-							mod_files.archives[file] = (mod_name, full_path)
-					else:
-						pass
-
-		scan_settings.mod_files = mod_files
-		return mod_files
-
-	def scan_data_files(self, scan_settings: ScanSettings) -> None:
-		problems: list[ProblemInfo | SimpleProblemInfo] = []
-
-		data_path = self.cmc.game.data_path
-		if data_path is None:
+	def scan_data_files(self, scanner: DataScanner) -> None:
+		try:
+			scanner.run()
+		finally:
 			self.thread_scan = None
-			return
-
-		if scan_settings[ScanSetting.Errors]:  # noqa: SIM102
-			if scan_settings.manager and Tool.ComplexSorter in scan_settings.manager.executables:
-				for tool_path in scan_settings.manager.executables[Tool.ComplexSorter]:
-					for ini_path in rglob(tool_path.parent, "ini"):
-						ini_text, _ = read_text_encoded(ini_path)
-						ini_lines = ini_text.splitlines(keepends=True)
-						error_found = False
-						for ini_line in ini_lines:
-							if not ini_line.startswith(";") and (
-								'FindNode OBTS(FindNode "Addon Index"' in ini_line
-								or "FindNode OBTS(FindNode 'Addon Index'" in ini_line
-							):
-								error_found = True
-								break
-
-						if error_found:
-							problems.append(
-								ProblemInfo(
-									ProblemType.ComplexSorter,
-									ini_path,
-									ini_path.relative_to(tool_path.parent),
-									tool_path.parent.name,
-									"INI uses an outdated field name. xEdit 4.1.5g changed the name of 'Addon Index' to 'Parent Combination Index'. Using outdated INIs with xEdit 4.1.5g+ results in broken output that may crash the game.",
-									SolutionType.ComplexSorterFix,
-								),
-							)
-							continue
-
-		if scan_settings[ScanSetting.RaceSubgraphs]:
-			self.queue_progress.put("Race Subgraph Records")
-			sadd_modules: list[tuple[int, Path]] = []
-			sadd_total = 0
-			sadd_bytes = b"\x00\x53\x41\x44\x44"
-			for module_path in self.cmc.game.modules_enabled:
-				try:
-					module_bytes = module_path.read_bytes()
-				except OSError:
-					continue
-				sadd_count = module_bytes.count(sadd_bytes)
-				if sadd_count:
-					sadd_modules.append((sadd_count, module_path))
-					sadd_total += sadd_count
-
-			if sadd_total > RACE_SUBGRAPH_THRESHOLD:
-				problems.append(
-					SimpleProblemInfo(
-						f"{sadd_total} SADD Records from {len(sadd_modules)} modules",
-						"Race Subgraph Record Count",
-						INFO_SCAN_RACE_SUBGRAPHS,
-						"IF you are experiencing stutter when moving between cells, removing some of these mods could alleviate performance issues.\nMerging them may also reduce stutter.",
-						file_list=sadd_modules,
-					),
-				)
-
-		if scan_settings.skip_data_scan:
-			self.thread_scan = None
-			self.queue_progress.put(problems)
-			return
-
-		mod_files = self.build_mod_file_list(scan_settings)
-
-		data_root_lower = "Data"
-		for current_path, folders, files in data_path.walk(top_down=True):
-			current_path_relative = current_path.relative_to(data_path)
-			mod_name, mod_path = mod_files.folders.get(current_path_relative) or ("", current_path)
-			if current_path is data_path:
-				self.queue_progress.put(tuple(folders))
-
-			if current_path.parent == data_path:
-				self.queue_progress.put(current_path.name)
-				data_root_lower = current_path.name.lower()
-
-				if scan_settings[ScanSetting.JunkFiles] and data_root_lower == "fomod":
-					problems.append(
-						ProblemInfo(
-							ProblemType.JunkFile,
-							mod_path,
-							current_path_relative,
-							mod_name,
-							"This is a junk folder not used by the game or mod managers.",
-							SolutionType.DeleteOrIgnoreFolder,
-						),
-					)
-					folders.clear()
-					continue
-
-				if data_root_lower not in DATA_WHITELIST:
-					folders.clear()
-					continue
-
-				if scan_settings[ScanSetting.LoosePrevis] and data_root_lower == "vis":
-					problems.append(
-						ProblemInfo(
-							ProblemType.LoosePrevis,
-							mod_path,
-							current_path_relative,
-							mod_name,
-							"Loose previs files should be archived so they only win conflicts according to their plugin's load order.\nLoose previs files are also not supported by PJM's Previs Scripts.",
-							SolutionType.ArchiveOrDeleteFolder,
-						),
-					)
-					folders.clear()
-					continue
-
-			if folders:
-				last_index = len(folders) - 1
-				for i, folder in enumerate(reversed(folders)):
-					folder_lower = folder.lower()
-					if folder_lower in scan_settings.skip_directories:
-						del folders[last_index - i]
-						continue
-
-					folder_path_full = current_path / folder
-					folder_path_relative = current_path_relative / folder
-					mod_name_folder, mod_path_folder = mod_files.folders.get(folder_path_relative) or ("", folder_path_full)
-
-					if data_root_lower == "meshes":
-						if scan_settings[ScanSetting.LoosePrevis] and folder_lower == "precombined":
-							problems.append(
-								ProblemInfo(
-									ProblemType.LoosePrevis,
-									mod_path_folder,
-									folder_path_relative,
-									mod_name_folder,
-									"Loose previs files should be archived so they only win conflicts according to their plugin's load order.\nLoose previs files are also not supported by PJM's Previs Scripts.",
-									SolutionType.ArchiveOrDeleteFolder,
-								),
-							)
-							del folders[last_index - i]
-							continue
-
-						if scan_settings[ScanSetting.ProblemOverrides] and folder_lower == "animtextdata":
-							problems.append(
-								ProblemInfo(
-									ProblemType.AnimTextDataFolder,
-									mod_path_folder,
-									folder_path_relative,
-									mod_name_folder,
-									"The existence of unpacked AnimTextData may cause the game to crash.",
-									SolutionType.ArchiveOrDeleteFolder,
-								),
-							)
-							del folders[last_index - i]
-							continue
-
-			whitelist = DATA_WHITELIST.get(data_root_lower)
-			for file in files:
-				file_lower = file.lower()
-				if scan_settings.skip_file_suffixes and file_lower.endswith(scan_settings.skip_file_suffixes):
-					continue
-
-				file_path_full = current_path / file
-				file_path_relative = current_path_relative / file
-				mod_name_file, mod_path_file = mod_files.files.get(file_path_relative) or ("", file_path_full)
-
-				if scan_settings[ScanSetting.JunkFiles] and (file_lower in JUNK_FILES or file_lower.endswith(JUNK_FILE_SUFFIXES)):
-					problems.append(
-						ProblemInfo(
-							ProblemType.JunkFile,
-							mod_path_file,
-							file_path_relative,
-							mod_name_file,
-							"This is a junk file not used by the game or mod managers.",
-							SolutionType.DeleteOrIgnoreFile,
-						),
-					)
-					continue
-
-				if data_root_lower == "scripts" and current_path.parent == data_path:  # noqa: SIM102
-					if mod_name_file and scan_settings[ScanSetting.ProblemOverrides] and file_lower in F4SE_CRC:
-						problems.append(
-							ProblemInfo(
-								ProblemType.F4SEOverride,
-								mod_path_file,
-								file_path_relative,
-								mod_name_file,
-								"This is an override of an F4SE script. This could break F4SE if they aren't the same version or this mod isn't intended to override F4SE files.",
-								"Check if this mod is supposed to override F4SE Scripts.\nIf this is a script extender/library or requires one, this is likely intentional but it must support your game version explicitly.\nOtherwise, this mod or file may need to be deleted.",
-							),
-						)
-						continue
-
-				file_split = file_lower.rsplit(".", maxsplit=1)
-				if len(file_split) == 1:
-					continue
-
-				file_ext = file_split[1]
-
-				if scan_settings[ScanSetting.Errors]:  # noqa: SIM102
-					if data_root_lower == "complex sorter" and file_ext == "ini":
-						ini_text, _ = read_text_encoded(file_path_full)
-						ini_lines = ini_text.splitlines(keepends=True)
-						error_found = False
-						for ini_line in ini_lines:
-							if not ini_line.startswith(";") and (
-								'FindNode OBTS(FindNode "Addon Index"' in ini_line
-								or "FindNode OBTS(FindNode 'Addon Index'" in ini_line
-							):
-								error_found = True
-								break
-						if error_found:
-							problems.append(
-								ProblemInfo(
-									ProblemType.ComplexSorter,
-									mod_path_file,
-									file_path_relative,
-									mod_name_file,
-									"INI uses an outdated field name. xEdit 4.1.5g changed the name of 'Addon Index' to 'Parent Combination Index'. Using outdated INIs with xEdit 4.1.5g+ results in broken output that may crash the game.",
-									SolutionType.ComplexSorterFix,
-								),
-							)
-							continue
-
-				if scan_settings[ScanSetting.WrongFormat]:
-					if (whitelist and file_ext not in whitelist) or (
-						file_ext == "dll" and str(current_path_relative).lower() != "f4se\\plugins"
-					):
-						solution = None
-						if file_ext in PROPER_FORMATS:
-							proper_found = [
-								p.name for e in PROPER_FORMATS[file_ext] if is_file(p := file_path_full.with_suffix(f".{e}"))
-							]
-							if proper_found:
-								summary = f"Format not in whitelist for {data_root_lower}.\nA file with the expected format was found ({', '.join(proper_found)})."
-								solution = SolutionType.DeleteOrIgnoreFile
-							else:
-								summary = f"Format not in whitelist for {data_root_lower}.\nA file with the expected format was NOT found ({', '.join(PROPER_FORMATS[file_ext])})."
-								solution = SolutionType.ConvertDeleteOrIgnoreFile
-						else:
-							summary = f"Format not in whitelist for {data_root_lower}.\nUnable to determine whether the game will use this file."
-							solution = SolutionType.UnknownFormat
-
-						problems.append(
-							ProblemInfo(
-								ProblemType.UnexpectedFormat,
-								mod_path_file,
-								file_path_relative,
-								mod_name_file,
-								summary,
-								solution,
-							),
-						)
-						continue
-
-					if (
-						file_ext == "ba2"
-						and file_lower not in ARCHIVE_NAME_WHITELIST
-						and file_path_full not in self.cmc.game.archives_enabled
-					):
-						ba2_name_split = file_split[0].rsplit(" - ", 1)
-						no_suffix = len(ba2_name_split) == 1
-						if no_suffix or ba2_name_split[1] not in self.cmc.game.ba2_suffixes:
-							problems.append(
-								ProblemInfo(
-									ProblemType.InvalidArchiveName,
-									mod_path_file,
-									file_path_relative,
-									mod_name_file,
-									"This is not a valid archive name and won't be loaded by the game.",
-									SolutionType.RenameArchive,
-									extra_data=[
-										f"\nValid Suffixes: {', '.join(self.cmc.game.ba2_suffixes)}",
-										f"Example: {ba2_name_split[0]} - Main.ba2",
-									],
-								),
-							)
-							continue
-
-		self.thread_scan = None
-		self.queue_progress.put(problems)
 
 
 class SidePane(Toplevel):
@@ -684,6 +591,34 @@ def __init__(
 			setting_check.pack(anchor=W, side=TOP)
 			ToolTip(setting_check, setting.value[1])
 
+		self.bv_read_stage = BooleanVar(value=scanner_tab.cmc.settings.dict["scanner_read_stage"])
+		self.bv_all_profiles = BooleanVar(value=False)
+		manager = scanner_tab.cmc.game.manager
+		if scanner_tab.using_stage and manager and manager.name == "Mod Organizer":
+			if scanner_tab.cmc.pc.os == "Windows 11 24H2" and manager.version <= Version("2.5.2"):
+				# The VFS is unreliable in this combination. See the warning in Overview.
+				self.bv_read_stage.set(True)
+
+			ttk.Separator(frame_scan_settings, orient=HORIZONTAL).pack(anchor=W, side=TOP, fill=X, pady=5)
+			stage_check = ttk.Checkbutton(
+				frame_scan_settings,
+				text="Read Staging Folders",
+				variable=self.bv_read_stage,
+				state=NORMAL,
+				command=self.on_checkbox_toggle,
+			)
+			stage_check.pack(anchor=W, side=TOP)
+			ToolTip(stage_check, TOOLTIP_SCAN_READ_STAGE)
+			profiles_check = ttk.Checkbutton(
+				frame_scan_settings,
+				text="All MO2 Profiles",
+				variable=self.bv_all_profiles,
+				state=NORMAL,
+				command=self.on_checkbox_toggle,
+			)
+			profiles_check.pack(anchor=W, side=TOP)
+			ToolTip(profiles_check, TOOLTIP_SCAN_ALL_PROFILES)
+
 		self.button_scan = ttk.Button(
 			self,
 			text="Scan Game",
@@ -696,8 +631,15 @@ def __init__(
 		self.grid_rowconfigure(self.grid_size()[1], weight=1)
 		self.bind("<FocusIn>", self.on_focus)
 
+	def any_enabled(self) -> bool:
+		return any(bv.get() for bv in self.bool_vars.values())
+
 	def on_checkbox_toggle(self) -> None:
-		self.button_scan.configure(state=NORMAL if any(bv.get() for bv in self.bool_vars.values()) else DISABLED)
+		if self.scanner_tab.scanner is not None:
+			# Rescan with the new settings, or just stop if nothing is left to scan.
+			self.scanner_tab.cancel_scan(restart=self.any_enabled())
+		else:
+			self.scanner_tab.update_scan_button()
 		self.scanner_tab.cmc.root.update()
 
 	def on_focus(self, _event: "Event[Misc]") -> None:
@@ -838,7 +780,10 @@ def copy_details(self) -> None:
 	def set_info(self, selection: str, *, using_stage: bool) -> None:
 		self.problem_info = self.scanner_tab.tree_results_data[selection]
 		if using_stage:
-			self.sv_mod_name.set(self.problem_info.mod or "N/A")
+			mod_name = self.problem_info.mod or "N/A"
+			if self.problem_info.profiles:
+				mod_name += f"  ~  Profiles: {', '.join(self.problem_info.profiles)}"
+			self.sv_mod_name.set(mod_name)
 
 		self.sv_file_path.set(str(self.problem_info.relative_path))
 
@@ -22,9 +22,11 @@
 import os
 import struct
 import sys
+import threading
 import winreg
 import zlib
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from ctypes import WinDLL, byref, c_int, create_unicode_buffer, sizeof, windll, wintypes
 from pathlib import Path
 from tkinter import *
@@ -57,13 +59,98 @@ def rglob(path: Path, ext: str) -> Generator[Path]:
 		yield from path.rglob(f"*.{ext}")
 		return
 
-	ext = ext.lower()
+	suffix = f".{ext.lower()}"
 	for root, _, files in path.walk():
 		for file in files:
-			if file.lower().endswith(f"*.{ext}"):
+			if file.lower().endswith(suffix):
 				yield root / file
 
 
+def list_dir(path: Path) -> tuple[list[str], list[str]] | None:
+	"""List the folders and files in path, as Path.walk would. Returns None if path can't be read."""
+	try:
+		scandir_it = os.scandir(path)
+	except OSError:
+		return None
+
+	folders: list[str] = []
+	files: list[str] = []
+	with scandir_it:
+		for entry in scandir_it:
+			try:
+				entry_is_dir = entry.is_dir(follow_symlinks=False)
+			except OSError:
+				entry_is_dir = False
+			if entry_is_dir:
+				folders.append(entry.name)
+			else:
+				files.append(entry.name)
+	return folders, files
+
+
+def walk_parallel(
+	top: Path,
+	max_workers: int,
+	lister: Callable[[Path], tuple[list[str], list[str]] | None] = list_dir,
+) -> Generator[tuple[Path, list[str], list[str]]]:
+	"""Equivalent to top.walk(top_down=True), but folders are listed ahead of time on a thread pool.
+
+	Results are yielded in the same order as Path.walk. Folders removed from the yielded list
+	are not descended into, and no listing is requested for them.
+	lister may be replaced to serve listings from elsewhere, such as a cache.
+	"""
+	if max_workers <= 1:
+		pending_paths = [top]
+		while pending_paths:
+			path = pending_paths.pop()
+			listing = lister(path)
+			if listing is None:
+				continue
+
+			folders, files = listing
+			yield path, folders, files
+			pending_paths.extend(path / folder for folder in reversed(folders))
+		return
+
+	executor = ThreadPoolExecutor(max_workers, thread_name_prefix="walk")
+	try:
+		pending: list[tuple[Path, Future[tuple[list[str], list[str]] | None]]] = [(top, executor.submit(lister, top))]
+		while pending:
+			path, future = pending.pop()
+			listing = future.result()
+			if listing is None:
+				continue
+
+			folders, files = listing
+			yield path, folders, files
+
+			# Submit after yielding so folders pruned by the caller are never listed.
+			child_paths = [path / folder for folder in folders]
+			pending.extend((child, executor.submit(lister, child)) for child in reversed(child_paths))
+	finally:
+		executor.shutdown(wait=False, cancel_futures=True)
+
+
+_head_buffers = threading.local()
+
+
+def read_head(path: Path, size: int) -> bytes | None:
+	"""Up to size bytes from the start of a file, or None if it's missing or can't be opened.
+
+	The file is read unbuffered into a buffer reused by each thread, as headers are only a few bytes.
+	"""
+	buffer: bytearray | None = getattr(_head_buffers, "buffer", None)
+	if buffer is None or len(buffer) < size:
+		buffer = _head_buffers.buffer = bytearray(size)
+	view = memoryview(buffer)[:size]
+	try:
+		with path.open("rb", buffering=0) as f:
+			read_size = f.readinto(view)
+	except (PermissionError, FileNotFoundError):
+		return None
+	return bytes(view[:read_size])
+
+
 def is_file(path: Path) -> bool:
 	if not win11_24h2:
 		return path.is_file()
@@ -123,8 +210,31 @@ def exists(path: Path) -> bool:
 	return True
 
 
+type FileStat = tuple[int, int] | None
+"""Size and modified time in nanoseconds, or None if the path can't be found."""
+
+
+def stat_paths(paths: Iterable[Path]) -> dict[Path, FileStat]:
+	"""Stat each path, to tell if any changed since a previous call by comparing the results.
+
+	A folder's modified time changes when entries are added, removed, or renamed in it, but not in its subfolders.
+	"""
+	stats: dict[Path, FileStat] = {}
+	for path in paths:
+		try:
+			stat = path.stat()
+		except OSError:
+			stats[path] = None
+		else:
+			stats[path] = (stat.st_size, stat.st_mtime_ns)
+	return stats
+
+
 def read_text_encoded(file_path: Path) -> tuple[str, str]:
-	file_bytes = file_path.read_bytes()
+	return decode_text(file_path.read_bytes())
+
+
+def decode_text(file_bytes: bytes) -> tuple[str, str]:
 	encoding = chardet.detect(file_bytes)["encoding"] or "utf-8"
 	return file_bytes.decode(encoding), encoding
 
@@ -168,7 +278,9 @@ def find_mod_manager() -> ModManagerInfo | None:
 				manager = "Mod Organizer" if proc.name() == "ModOrganizer.exe" else "Vortex"
 				ver = get_file_version(manager_path)
 				manager_version = Version(".".join(str(n) for n in ver[:3])) if ver else Version("0.0.0")
-				return ModManagerInfo(manager, manager_path, manager_version)
+				manager_info = ModManagerInfo(manager, manager_path, manager_version)
+				manager_info.vfs_active = manager == "Mod Organizer"
+				return manager_info
 			proc = proc.parent()
 	return None
 